@@ -0,0 +1,48 @@
+import sys
+import time
+from folio_index import load_index, read_folio_paragraphs, read_folio_translation, FOLIO_INDEX_FILE
+
+# --- CONFIGURATION ---
+INDEX_FILE = FOLIO_INDEX_FILE  # Written by 01_generate_clean_data.py, updated by 10b
+
+def inspect_folio(folio_id, show_translation=True):
+    """
+    Prints the clean text (and, if indexed, the full-manuscript translation)
+    of a single folio by seeking straight to its bytes.
+    """
+    start_time = time.perf_counter()
+    folio_index = load_index(INDEX_FILE)
+    if folio_index is None:
+        print(f"ERROR: Folio index '{INDEX_FILE}' not found. Run 01_generate_clean_data.py first.")
+        return
+
+    entry = folio_index["folios"].get(folio_id)
+    if entry is None:
+        print(f"ERROR: Folio '{folio_id}' is not in the index.")
+        return
+
+    first, end = entry["paragraphs"]
+    paragraphs = read_folio_paragraphs(folio_index, folio_id)
+    print("=" * 80)
+    print(f"  Folio {folio_id} | Section: {entry['section']} | Paragraphs {first} to {end - 1}")
+    print("=" * 80)
+    for offset, paragraph in enumerate(paragraphs):
+        print(f"[{first + offset}] {paragraph}")
+
+    if show_translation:
+        translation = read_folio_translation(folio_index, folio_id)
+        print("\n" + "-" * 80)
+        if translation is None:
+            print("No indexed translation (run 10b_translate_all_improved.py to add one).")
+        else:
+            print(translation.rstrip())
+
+    elapsed_ms = (time.perf_counter() - start_time) * 1000
+    print(f"\n(Folio read in {elapsed_ms:.1f} ms)")
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Usage: python 12_inspect_folio.py <folio_id> [--no-translation]")
+        print("Example: python 12_inspect_folio.py f57v")
+        sys.exit(1)
+    inspect_folio(sys.argv[1].lower(), show_translation="--no-translation" not in sys.argv)
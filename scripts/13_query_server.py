@@ -0,0 +1,237 @@
+import asyncio
+import json
+import re
+import sys
+import time
+from collections import Counter, defaultdict
+from urllib.parse import urlsplit, parse_qs
+from folio_index import load_index, FOLIO_INDEX_FILE
+from script_loader import load_script
+
+# --- CONFIGURATION ---
+VOYNICH_FILE = "voynich_ready_nlp.txt"   # Clean corpus (one paragraph per line)
+SECTION_MAP_FILE = "section_map.json"    # Paragraph index -> section
+INDEX_FILE = FOLIO_INDEX_FILE            # Folio -> paragraph range (from 01)
+HOST = "127.0.0.1"
+PORT = 8765
+MAX_NGRAM = 3        # Longest n-gram kept in the count index
+DEFAULT_LIMIT = 20   # Default number of rows returned by list endpoints
+
+# --- WARM STATE ---
+class CorpusState:
+    """
+    Everything a query needs, loaded once: corpus, lexicon, parse table,
+    translations and count indexes. A state object is never mutated after
+    construction; reloads build a new one and swap the reference.
+    """
+    def __init__(self, fresh_modules=False):
+        start_time = time.perf_counter()
+        # Lexicon and grammar come straight from the pipeline scripts, so an
+        # edited dictionary is picked up by re-executing them on reload.
+        self.translator = load_script("10b_translate_all_improved", fresh=fresh_modules)
+        self.lift_parser = load_script("02a_thematic_analysis_liftscore", fresh=fresh_modules)
+        self.signatures = dict(load_script("08a_find_process_signatures_v5", fresh=fresh_modules).PROCESS_SIGNATURES)
+        for name, keywords in load_script("09_find_specific_benchmarks", fresh=fresh_modules).BENCHMARK_SIGNATURES.items():
+            self.signatures[name] = [re.escape(kw) for kw in keywords]
+
+        with open(VOYNICH_FILE, "r", encoding="utf-8") as f:
+            self.paragraphs = f.read().splitlines()
+        with open(SECTION_MAP_FILE, "r", encoding="utf-8") as f:
+            section_map = json.load(f)
+        self.sections = [section_map.get(str(i), "Unknown") for i in range(len(self.paragraphs))]
+        folio_index = load_index(INDEX_FILE)
+        self.folios = {} if folio_index is None else {
+            folio_id: tuple(entry["paragraphs"]) for folio_id, entry in folio_index["folios"].items()
+        }
+
+        # Parse table: one ParsedWord per word type
+        self.tokens = [[w for w in re.sub(r'<@[^>]+>', '', p).split() if w] for p in self.paragraphs]
+        self.parse_table = {}
+        for words in self.tokens:
+            for w in words:
+                if w not in self.parse_table:
+                    self.parse_table[w] = self.translator.ParsedWord(w)
+
+        # Translations (rendered exactly as 10b does)
+        self.translations = []
+        for words in self.tokens:
+            if not words:
+                self.translations.append("[Skipped: Line empty after cleaning EVA tags]")
+            else:
+                self.translations.append(self.translator.synthesize_interpretation_v4([self.parse_table[w] for w in words]))
+
+        # Count indexes: n-grams and KWIC positions
+        self.ngram_counts = {n: Counter() for n in range(1, MAX_NGRAM + 1)}
+        self.positions = defaultdict(list)   # word -> [(paragraph, position)]
+        for p_idx, words in enumerate(self.tokens):
+            for n in range(1, MAX_NGRAM + 1):
+                self.ngram_counts[n].update(zip(*(words[k:] for k in range(n))))
+            for pos, w in enumerate(words):
+                self.positions[w].append((p_idx, pos))
+
+        # Section root counts: 02a's own counting over 02a's corpus, so /lift matches its CSV
+        with open(self.lift_parser.VOYNICH_TEXT_FILE, "r", encoding="utf-8") as f:
+            self.lift_counts = self.lift_parser.count_section_roots(f.readlines())
+
+        self.loaded_at = time.time()
+        self.load_seconds = time.perf_counter() - start_time
+
+    # --- Queries (pure functions of the state) ---
+    def translate_folio(self, folio_id):
+        if folio_id not in self.folios:
+            raise KeyError(f"Unknown folio '{folio_id}'")
+        first, end = self.folios[folio_id]
+        return {
+            "folio": folio_id,
+            "section": self.sections[first] if first < end else "Unknown",
+            "paragraphs": [
+                {"index": i, "original": " ".join(self.tokens[i]), "translation": self.translations[i]}
+                for i in range(first, end)
+            ],
+        }
+
+    def lift(self, root):
+        lifts = self.lift_parser.section_lifts(root, self.lift_counts)
+        return {"root": root, "concept": self.lift_parser.CONCEPTUAL_DICTIONARY.get(root, "N/A"),
+                "total_freq": self.lift_counts[3][root],
+                "lift": {section: round(lift, 2) for section, lift in lifts.items()}}
+
+    def ngrams(self, n, prefix=None, limit=DEFAULT_LIMIT):
+        if n not in self.ngram_counts:
+            raise ValueError(f"n must be between 1 and {MAX_NGRAM}")
+        counts = self.ngram_counts[n]
+        if prefix:
+            head = tuple(prefix.split())
+            items = [(g, c) for g, c in counts.items() if g[:len(head)] == head]
+            items.sort(key=lambda item: item[1], reverse=True)
+            items = items[:limit]
+        else:
+            items = counts.most_common(limit)
+        return {"n": n, "prefix": prefix, "total": sum(counts.values()),
+                "ngrams": [{"ngram": " ".join(g), "count": c} for g, c in items]}
+
+    def kwic(self, word, window=3, limit=DEFAULT_LIMIT):
+        hits = self.positions.get(word, [])
+        lines = []
+        for p_idx, pos in hits[:limit]:
+            words = self.tokens[p_idx]
+            lines.append({
+                "paragraph": p_idx, "section": self.sections[p_idx],
+                "left": " ".join(words[max(0, pos - window):pos]),
+                "keyword": word,
+                "right": " ".join(words[pos + 1:pos + 1 + window]),
+            })
+        return {"word": word, "total_hits": len(hits), "lines": lines}
+
+    def signature_search(self, name=None, terms=None, section=None, limit=DEFAULT_LIMIT):
+        if terms:
+            keywords = [re.escape(t.strip()) for t in terms.split(",") if t.strip()]
+        elif name in self.signatures:
+            keywords = self.signatures[name]
+        else:
+            raise KeyError(f"Unknown signature '{name}'. Available: {sorted(self.signatures)}")
+        patterns = [re.compile(kw, re.IGNORECASE) for kw in keywords]
+        matches = []
+        for p_idx, translation in enumerate(self.translations):
+            if section and self.sections[p_idx] != section:
+                continue
+            if all(pattern.search(translation) for pattern in patterns):
+                matches.append(p_idx)
+        return {"signature": name or terms, "section": section, "total_matches": len(matches),
+                "matches": [{"paragraph": i, "section": self.sections[i], "translation": self.translations[i]}
+                            for i in matches[:limit]]}
+
+# --- SERVER ---
+class QueryServer:
+    """Serves JSON queries over a warm CorpusState; reloads swap state atomically."""
+    def __init__(self, state):
+        self.state = state
+        self.reload_lock = asyncio.Lock()
+        self.reload_count = 0
+
+    async def reload(self):
+        # Only one rebuild at a time. Queries keep being answered from the old
+        # state while the new one is built in a worker thread; the swap itself
+        # is a single reference assignment, so no request sees a mixed state.
+        async with self.reload_lock:
+            loop = asyncio.get_running_loop()
+            new_state = await loop.run_in_executor(None, CorpusState, True)
+            self.state = new_state
+            self.reload_count += 1
+            return {"reloaded": True, "reload_count": self.reload_count,
+                    "load_seconds": round(new_state.load_seconds, 3)}
+
+    async def dispatch(self, method, path, query):
+        state = self.state  # Snapshot: one request always sees one state
+        param = lambda key, default=None: query.get(key, [default])[0]
+        if path == "/reload":
+            if method != "POST":
+                return 405, {"error": "Use POST /reload"}
+            return 200, await self.reload()
+        if path == "/status":
+            return 200, {"paragraphs": len(state.paragraphs), "word_types": len(state.parse_table),
+                         "folios": len(state.folios), "load_seconds": round(state.load_seconds, 3),
+                         "loaded_at": state.loaded_at, "reload_count": self.reload_count}
+        if path == "/translate":
+            return 200, state.translate_folio(param("folio", "").lower())
+        if path == "/lift":
+            return 200, state.lift(param("root", ""))
+        if path == "/ngrams":
+            return 200, state.ngrams(int(param("n", 2)), param("prefix"), int(param("limit", DEFAULT_LIMIT)))
+        if path == "/kwic":
+            return 200, state.kwic(param("word", ""), int(param("window", 3)), int(param("limit", DEFAULT_LIMIT)))
+        if path == "/signatures":
+            if param("name") is None and param("terms") is None:
+                return 200, {"signatures": sorted(state.signatures)}
+            return 200, state.signature_search(param("name"), param("terms"), param("section"),
+                                               int(param("limit", DEFAULT_LIMIT)))
+        return 404, {"error": f"Unknown endpoint '{path}'",
+                     "endpoints": ["/status", "/translate", "/lift", "/ngrams", "/kwic", "/signatures", "/reload"]}
+
+    async def handle(self, reader, writer):
+        try:
+            try:
+                request_line = await reader.readline()
+                method, target, _ = request_line.decode("latin-1").split(" ", 2)
+                while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                    pass  # Headers are not needed
+                url = urlsplit(target)
+                try:
+                    status, payload = await self.dispatch(method, url.path, parse_qs(url.query))
+                except KeyError as e:
+                    status, payload = 404, {"error": str(e.args[0])}
+                except ValueError as e:
+                    status, payload = 400, {"error": str(e)}
+            except ValueError:
+                status, payload = 400, {"error": "Malformed request"}
+            except Exception as e:
+                # e.g. a /reload whose input files went missing: answer instead of leaving the client hanging
+                status, payload = 500, {"error": f"{type(e).__name__}: {e}"}
+            body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+            reason = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+                      500: "Internal Server Error"}[status]
+            writer.write(f"HTTP/1.1 {status} {reason}\r\nContent-Type: application/json; charset=utf-8\r\n"
+                         f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode("latin-1") + body)
+            await writer.drain()
+        finally:
+            writer.close()
+
+async def serve(host=HOST, port=PORT):
+    print("Loading corpus, lexicon, parse table and count indexes...")
+    state = CorpusState()
+    print(f" -> Warm state ready in {state.load_seconds:.2f}s "
+          f"({len(state.paragraphs)} paragraphs, {len(state.parse_table)} word types).")
+    query_server = QueryServer(state)
+    server = await asyncio.start_server(query_server.handle, host, port)
+    print(f"✅ Query server listening on http://{host}:{port}/ (Ctrl+C to stop)")
+    print("   Endpoints: /status /translate?folio= /lift?root= /ngrams?n=&prefix= "
+          "/kwic?word=&window= /signatures?name=|terms=&section= POST /reload")
+    async with server:
+        await server.serve_forever()
+
+if __name__ == "__main__":
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else PORT
+    try:
+        asyncio.run(serve(port=port))
+    except KeyboardInterrupt:
+        print("\nQuery server stopped.")
@@ -0,0 +1,298 @@
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import re
+import subprocess
+import sys
+import time
+from script_loader import load_script
+
+# --- CONFIGURATION ---
+VOYNICH_SOURCE_FILE = "voynich.txt"             # Raw IVTFF source (cleaning scenario)
+VOYNICH_FILE = "voynich_ready_nlp.txt"          # Clean corpus (most other scenarios)
+VOYNICH_FORMATTED_FILE = "voynich_final_formatted_complete.txt"   # Folio-tagged corpus (lift scenario, as 02a)
+SECTION_MAP_FILE = "section_map.json"
+ROOTS_FILE = "roots.txt"
+HISTORY_FILE = "benchmark_history.json"         # One entry per run, appended
+DEFAULT_SCALES = [1, 10, 100, 1000]
+REGRESSION_THRESHOLD = 0.10                     # Flag >10% throughput drops vs the previous run
+
+# ==============================================================================
+#    SCENARIOS: each hot path of the pipeline, timed on the real functions
+# ==============================================================================
+# A scenario is (setup, run). setup(base, scale) builds the scaled input and
+# is NOT timed; run(payload) is timed and returns the number of tokens it
+# processed. Scaling repeats the 1x corpus 'scale' times (list references,
+# not copies, so the input itself stays cheap).
+
+def load_base_corpus():
+    """Loads the 1x inputs shared by all scenarios."""
+    with open(VOYNICH_FILE, "r", encoding="utf-8") as f:
+        paragraphs = f.read().splitlines()
+    with open(SECTION_MAP_FILE, "r", encoding="utf-8") as f:
+        section_map = json.load(f)
+    with open(VOYNICH_SOURCE_FILE, "r", encoding="utf-8", errors="ignore") as f:
+        source_lines = [line for line in f if re.match(r"<f\d+[rv]\..*?;H>", line.strip())]
+    with open(VOYNICH_FORMATTED_FILE, "r", encoding="utf-8") as f:
+        formatted_lines = f.readlines()
+    tokens = [[w for w in re.sub(r'<@[^>]+>', '', p).split() if w] for p in paragraphs]
+    sections = [section_map.get(str(i), "Unknown") for i in range(len(paragraphs))]
+    return {"paragraphs": paragraphs, "tokens": tokens, "sections": sections, "source_lines": source_lines,
+            "formatted_lines": formatted_lines}
+
+def flat_words(base, scale):
+    return [w for words in base["tokens"] for w in words] * scale
+
+# --- cleaning (01) ---
+def setup_clean(base, scale):
+    return load_script("01_generate_clean_data"), base["source_lines"] * scale
+
+def run_clean(payload):
+    module, lines = payload
+    token_count = 0
+    for line in lines:
+        token_count += len(module.clean_paragraph_text_from_source(line).split())
+    return token_count
+
+# --- root matching (find_longest_root_in_word, 2/3/4a/5/7) ---
+def setup_root_match(base, scale):
+    module = load_script("5_analyze_prefix_function")
+    roots = sorted(module.load_roots(ROOTS_FILE), key=len, reverse=True)
+    return module, roots, flat_words(base, scale)
+
+def run_root_match(payload):
+    module, roots, words = payload
+    for word in words:
+        module.find_longest_root_in_word(word, roots)
+    return len(words)
+
+# --- role tagging (ParsedWord, 10a/10b) ---
+def setup_role_tag(base, scale):
+    return load_script("10b_translate_all_improved"), flat_words(base, scale)
+
+def run_role_tag(payload):
+    module, words = payload
+    for word in words:
+        module.ParsedWord(word).role
+    return len(words)
+
+# --- lift (02a counting + lift scores) ---
+def setup_lift(base, scale):
+    return load_script("02a_thematic_analysis_liftscore"), base["formatted_lines"] * scale
+
+def run_lift(payload):
+    module, lines = payload
+    counts = module.count_section_roots(lines)
+    for root in counts[3]:
+        module.section_lifts(root, counts)
+    return counts[2]
+
+# --- n-gram counting (06 role bigrams/trigrams) ---
+def setup_ngrams(base, scale):
+    module = load_script("06_analyze_syntax_patterns_v2")
+    return module, [module.get_grammatical_role_v2(w) for w in flat_words(base, scale)]
+
+def run_ngrams(payload):
+    module, roles = payload
+    module.count_role_patterns(roles)
+    return len(roles)
+
+# --- entropy (03) ---
+def setup_entropy(base, scale):
+    return load_script("03_calculate_entropy_comparative"), " ".join(flat_words(base, scale))
+
+def run_entropy(payload):
+    module, text = payload
+    module.calculate_second_order_entropy(text)
+    return text.count(" ") + 1
+
+# --- graph build (7) ---
+def setup_graph(base, scale):
+    module = load_script("7_build_knowledge_graph")
+    module.import_networkx()
+    roots = sorted(module.load_roots(ROOTS_FILE), key=len, reverse=True)
+    sequence = [r for w in flat_words(base, 1) if (r := module.find_longest_root_in_word(w, roots)) is not None]
+    return module, sequence * scale
+
+def run_graph(payload):
+    module, sequence = payload
+    module.build_graph_from_sequence(sequence, module.TARGET_CONNECTORS)
+    return len(sequence)
+
+# --- translation (ParsedWord + synthesize_interpretation_v4, 10b) ---
+def setup_translate(base, scale):
+    return load_script("10b_translate_all_improved"), base["tokens"] * scale
+
+def run_translate(payload):
+    module, paragraphs = payload
+    token_count = 0
+    for words in paragraphs:
+        if words:
+            module.synthesize_interpretation_v4([module.ParsedWord(w) for w in words])
+            token_count += len(words)
+    return token_count
+
+# --- signature search (08a regex signatures over translations) ---
+def setup_signatures(base, scale):
+    translator = load_script("10b_translate_all_improved")
+    finder = load_script("08a_find_process_signatures_v5")
+    translations = [translator.synthesize_interpretation_v4([translator.ParsedWord(w) for w in words]).lower()
+                    for words in base["tokens"] if words]
+    word_counts = [len(words) for words in base["tokens"] if words]
+    return finder, translations * scale, sum(word_counts) * scale
+
+def run_signatures(payload):
+    finder, translations, token_count = payload
+    for text in translations:
+        finder.scan_translation(text)
+    return token_count
+
+SCENARIOS = {
+    "clean": (setup_clean, run_clean),
+    "root_match": (setup_root_match, run_root_match),
+    "role_tag": (setup_role_tag, run_role_tag),
+    "lift": (setup_lift, run_lift),
+    "ngrams": (setup_ngrams, run_ngrams),
+    "entropy": (setup_entropy, run_entropy),
+    "graph": (setup_graph, run_graph),
+    "translate": (setup_translate, run_translate),
+    "signatures": (setup_signatures, run_signatures),
+}
+
+# ==============================================================================
+#                                RUNNER
+# ==============================================================================
+
+def peak_rss_mb():
+    """Peak resident set size of the current process, in MB (None if unavailable)."""
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return round(peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024, 1)
+    except ImportError:
+        try:
+            import psutil
+            return round(psutil.Process().memory_info().peak_wset / (1024 * 1024), 1)
+        except (ImportError, AttributeError):
+            return None
+
+def run_scenario(name, scale, data_dir, result_queue):
+    """Runs one scenario at one scale in a fresh process (so peak RSS is its own)."""
+    os.chdir(data_dir)
+    try:
+        setup, run = SCENARIOS[name]
+        payload = setup(load_base_corpus(), scale)
+        wall_start, cpu_start = time.perf_counter(), time.process_time()
+        token_count = run(payload)
+        wall, cpu = time.perf_counter() - wall_start, time.process_time() - cpu_start
+        result_queue.put({
+            "scenario": name, "scale": scale, "tokens": token_count,
+            "seconds": round(wall, 4), "cpu_seconds": round(cpu, 4),
+            "tokens_per_s": round(token_count / wall) if wall > 0 else None,
+            "peak_rss_mb": peak_rss_mb(),
+        })
+    except (ImportError, SystemExit) as e:
+        result_queue.put({"scenario": name, "scale": scale, "skipped": f"missing dependency ({e})"})
+    except MemoryError:
+        result_queue.put({"scenario": name, "scale": scale, "skipped": "out of memory"})
+
+def current_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except OSError:
+        return None
+
+def load_history(path):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return []
+
+def compare_with_previous(results, history):
+    """Prints throughput changes against the most recent run with the same scenario/scale."""
+    previous = {}
+    for run in history:
+        for r in run["results"]:
+            if r.get("tokens_per_s"):
+                previous[(r["scenario"], r["scale"])] = (r["tokens_per_s"], run.get("commit"))
+    regressions = 0
+    for r in results:
+        key = (r["scenario"], r["scale"])
+        if key not in previous or not r.get("tokens_per_s"):
+            continue
+        old_tps, old_commit = previous[key]
+        change = (r["tokens_per_s"] - old_tps) / old_tps
+        if change < -REGRESSION_THRESHOLD:
+            regressions += 1
+            print(f"  ⚠️  REGRESSION {r['scenario']} @{r['scale']}x: {change:+.1%} vs {old_commit}")
+        elif change > REGRESSION_THRESHOLD:
+            print(f"  🚀 Faster      {r['scenario']} @{r['scale']}x: {change:+.1%} vs {old_commit}")
+    if regressions == 0:
+        print("  No throughput regressions against the previous run.")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the pipeline's hot paths at several corpus scales.")
+    parser.add_argument("--scales", default=",".join(map(str, DEFAULT_SCALES)),
+                        help="Comma-separated corpus multipliers (default: 1,10,100,1000).")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS),
+                        help=f"Comma-separated subset of: {', '.join(SCENARIOS)}.")
+    parser.add_argument("--history", default=HISTORY_FILE, help="JSON history file to append to.")
+    parser.add_argument("--label", default="", help="Free-text label stored with this run.")
+    args = parser.parse_args()
+
+    scales = [int(s) for s in args.scales.split(",") if s]
+    names = [n for n in args.scenarios.split(",") if n]
+    unknown = [n for n in names if n not in SCENARIOS]
+    if unknown:
+        print(f"ERROR: Unknown scenario(s): {', '.join(unknown)}")
+        sys.exit(1)
+    missing = [f for f in (VOYNICH_SOURCE_FILE, VOYNICH_FILE, VOYNICH_FORMATTED_FILE, SECTION_MAP_FILE, ROOTS_FILE)
+               if not os.path.exists(f)]
+    if missing:
+        print(f"ERROR: Missing required file(s): {', '.join(missing)}")
+        sys.exit(1)
+
+    print(f"===== Pipeline Benchmarks ({len(names)} scenarios x scales {scales}) =====\n")
+    print(f"{'Scenario':<12} {'Scale':>6} {'Tokens':>12} {'Seconds':>10} {'Tokens/s':>12} {'Peak RSS MB':>12}")
+    print("-" * 70)
+    results = []
+    context = multiprocessing.get_context("spawn")
+    for name in names:
+        for scale in scales:
+            result_queue = context.Queue()
+            worker = context.Process(target=run_scenario, args=(name, scale, os.getcwd(), result_queue))
+            worker.start()
+            worker.join()
+            if result_queue.empty():
+                result = {"scenario": name, "scale": scale, "skipped": f"worker exited with code {worker.exitcode}"}
+            else:
+                result = result_queue.get()
+            results.append(result)
+            if "skipped" in result:
+                print(f"{name:<12} {scale:>5}x  skipped: {result['skipped']}")
+            else:
+                print(f"{name:<12} {scale:>5}x {result['tokens']:>12,} {result['seconds']:>10.3f} "
+                      f"{result['tokens_per_s']:>12,} {result['peak_rss_mb'] or '-':>12}")
+
+    history = load_history(args.history)
+    print("\n--- Comparison with previous runs ---")
+    compare_with_previous(results, history)
+
+    history.append({
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "commit": current_commit(),
+        "label": args.label,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    })
+    with open(args.history, "w", encoding="utf-8") as f:
+        json.dump(history, f, indent=1)
+    print(f"\n✅ Results appended to '{args.history}' ({len(history)} runs recorded).")
+
+if __name__ == "__main__":
+    main()
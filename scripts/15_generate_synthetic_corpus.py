@@ -0,0 +1,221 @@
+import argparse
+import bisect
+import random
+import re
+import sys
+import time
+from collections import Counter, defaultdict
+from folio_index import load_index, FOLIO_INDEX_FILE
+from eva_glyphs import GlyphTokenizer
+
+# --- CONFIGURATION ---
+VOYNICH_FILE = "voynich_ready_nlp.txt"   # Training corpus (one paragraph per line)
+INDEX_FILE = FOLIO_INDEX_FILE            # Folio order, sections and paragraph counts (from 01)
+OUTPUT_PREFIX = "voynich_synthetic"      # -> _nlp.txt, _formatted.txt, _section_map.json
+WORD_ORDER = 2                           # Words of context for the word-level model
+GLYPH_ORDER = 3                          # Glyphs of context for the glyph-level model
+DEFAULT_SEED = 1409
+
+# EVA glyphs written with more than one character are kept together (see eva_glyphs.GLYPH_INVENTORIES)
+GLYPH_INVENTORY = "basic"
+START, END = "<s>", "</s>"
+
+# ==============================================================================
+#                     MODELS (learned once, sampled many times)
+# ==============================================================================
+
+class MarkovModel:
+    """
+    n-gram model with stupid backoff from 'order' symbols of context down to
+    the unigram distribution. Each context stores its continuations as a list
+    plus cumulative counts, so sampling is one bisect.
+    """
+    def __init__(self, order):
+        self.order = order
+        self.counts = [defaultdict(Counter) for _ in range(order + 1)]  # by context length
+        self.tables = None
+
+    def train(self, sequence):
+        padded = [START] * self.order + list(sequence) + [END]
+        for i in range(self.order, len(padded)):
+            for k in range(self.order + 1):
+                self.counts[k][tuple(padded[i - k:i])][padded[i]] += 1
+
+    def freeze(self):
+        """Turns the counters into sampling tables (done once after training)."""
+        self.tables = []
+        for level in self.counts:
+            table = {}
+            for context, counter in level.items():
+                symbols = list(counter)
+                cumulative, total = [], 0
+                for s in symbols:
+                    total += counter[s]
+                    cumulative.append(total)
+                table[context] = (symbols, cumulative, total)
+            self.tables.append(table)
+        self.counts = None
+
+    def sample_next(self, history, rng):
+        for k in range(self.order, -1, -1):
+            context = tuple(history[-k:]) if k else ()
+            if k and len(context) < k:
+                continue
+            entry = self.tables[k].get(context)
+            if entry:
+                symbols, cumulative, total = entry
+                return symbols[bisect.bisect_right(cumulative, rng.random() * total)]
+        return END
+
+    def generate(self, rng, max_length=200):
+        history = [START] * self.order
+        output = []
+        while len(output) < max_length:
+            symbol = self.sample_next(history, rng)
+            if symbol == END:
+                break
+            output.append(symbol)
+            history.append(symbol)
+        return output
+
+def learn_models(paragraphs, sections, word_order, glyph_order):
+    """Learns one word model per section, one shared glyph model and the set of hapax words."""
+    word_models = {}
+    glyph_model = MarkovModel(glyph_order)
+    token_counts = Counter()
+    for text, section in zip(paragraphs, sections):
+        words = text.split()
+        if not words:
+            continue
+        if section not in word_models:
+            word_models[section] = MarkovModel(word_order)
+        word_models[section].train(words)
+        token_counts.update(words)
+    tokenizer = GlyphTokenizer(GLYPH_INVENTORY)
+    for word in token_counts:
+        glyph_model.train(tokenizer.split(word))
+    for model in word_models.values():
+        model.freeze()
+    glyph_model.freeze()
+    # Hapaxes stand in for the unseen-word mass (Good-Turing): every time one is
+    # sampled it is replaced by a fresh glyph-level word, so the vocabulary keeps
+    # growing with corpus size instead of repeating the same rare words.
+    hapaxes = {w for w, c in token_counts.items() if c == 1}
+    return word_models, glyph_model, hapaxes
+
+# ==============================================================================
+#                               GENERATION
+# ==============================================================================
+
+def parse_size(text):
+    """Parses '500MB', '2GB', '100x' (multiples of the training corpus) or plain bytes."""
+    match = re.fullmatch(r"\s*([\d.]+)\s*(x|kb|mb|gb|b)?\s*", text.lower())
+    if not match:
+        raise ValueError(f"Invalid size '{text}'")
+    value, unit = float(match.group(1)), match.group(2) or "b"
+    return value, unit
+
+def generate_corpus(word_models, glyph_model, hapaxes, folio_plan, target_bytes, seed, prefix):
+    """
+    Streams synthetic folios to disk until target_bytes of clean text are written.
+    Memory use is bounded by one folio of output plus the models.
+    """
+    rng = random.Random(seed)
+    cycles_needed = max(1, -(-target_bytes // max(1, folio_plan["bytes_per_cycle"])))
+    suffix_width = len(str(cycles_needed))
+    nlp_path, formatted_path, map_path = (f"{prefix}_nlp.txt", f"{prefix}_formatted.txt",
+                                          f"{prefix}_section_map.json")
+    written_bytes, paragraph_index, word_count, cycle = 0, 0, 0, 0
+    with open(nlp_path, "w", encoding="utf-8", newline="\n") as nlp_f, \
+         open(formatted_path, "w", encoding="utf-8", newline="\n") as fmt_f, \
+         open(map_path, "w", encoding="utf-8", newline="\n") as map_f:
+        map_f.write("{")
+        while written_bytes < target_bytes:
+            for folio_id, section, n_paragraphs in folio_plan["folios"]:
+                if written_bytes >= target_bytes:
+                    break
+                # Cycle 0 reuses the real folio ids; later cycles append a fixed-width counter
+                synthetic_folio = folio_id if cycle == 0 else f"{folio_id}{cycle:0{suffix_width}d}"
+                model = word_models.get(section) or word_models[folio_plan["fallback_section"]]
+                lines, map_entries = [], []
+                for _ in range(n_paragraphs):
+                    words = model.generate(rng)
+                    for i in range(len(words)):
+                        if words[i] in hapaxes:
+                            words[i] = "".join(glyph_model.generate(rng, max_length=12)) or words[i]
+                    lines.append(" ".join(words))
+                    map_entries.append(f'{"," if paragraph_index else ""}\n  "{paragraph_index}": "{section}"')
+                    paragraph_index += 1
+                    word_count += len(words)
+                text = "\n".join(lines)
+                separator = "\n" if written_bytes else ""
+                nlp_f.write(separator + text)
+                fmt_f.write(f"{separator}<{synthetic_folio}>\n{text}")
+                map_f.write("".join(map_entries))
+                written_bytes += len(text.encode("utf-8")) + 1
+            cycle += 1
+            sys.stdout.write(f"\r -> Written {written_bytes / 1e6:,.1f} MB ({paragraph_index:,} paragraphs)")
+            sys.stdout.flush()
+        map_f.write("\n}\n")
+    print()
+    return paragraph_index, word_count, (nlp_path, formatted_path, map_path)
+
+def build_folio_plan(folio_index, sections):
+    """Real folio order with section and paragraph count, used as the template for every cycle."""
+    folios = []
+    for folio_id, entry in folio_index["folios"].items():
+        first, end = entry["paragraphs"]
+        if end > first:
+            folios.append((folio_id, entry["section"], end - first))
+    fallback = Counter(sections).most_common(1)[0][0]
+    return {"folios": folios, "fallback_section": fallback}
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic Voynich-like corpus of any size.")
+    parser.add_argument("--size", default="10x", help="Target size: e.g. 10x (corpus multiples), 500MB, 2GB.")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED, help="Random seed (same seed, same corpus).")
+    parser.add_argument("--word-order", type=int, default=WORD_ORDER, help="Word-level context length.")
+    parser.add_argument("--glyph-order", type=int, default=GLYPH_ORDER, help="Glyph-level context length.")
+    parser.add_argument("--out-prefix", default=OUTPUT_PREFIX, help="Prefix for the output files.")
+    args = parser.parse_args()
+
+    print(f"Starting synthetic corpus generation (seed {args.seed})...")
+    try:
+        with open(VOYNICH_FILE, "r", encoding="utf-8") as f:
+            paragraphs = f.read().splitlines()
+    except FileNotFoundError:
+        print(f"ERROR: Clean file '{VOYNICH_FILE}' not found.")
+        return
+    folio_index = load_index(INDEX_FILE)
+    if folio_index is None:
+        print(f"ERROR: Folio index '{INDEX_FILE}' not found. Run 01_generate_clean_data.py first.")
+        return
+
+    sections = ["Unknown"] * len(paragraphs)
+    for entry in folio_index["folios"].values():
+        first, end = entry["paragraphs"]
+        sections[first:end] = [entry["section"]] * (end - first)
+
+    start_time = time.perf_counter()
+    print(f"Step 1: Learning word (order {args.word_order}) and glyph (order {args.glyph_order}) models...")
+    word_models, glyph_model, hapaxes = learn_models(paragraphs, sections, args.word_order, args.glyph_order)
+    print(f" -> {len(word_models)} section models, {len(hapaxes)} hapax words regenerated at glyph level.")
+
+    value, unit = parse_size(args.size)
+    corpus_bytes = sum(len(p.encode("utf-8")) + 1 for p in paragraphs)
+    multipliers = {"x": corpus_bytes, "kb": 1e3, "mb": 1e6, "gb": 1e9, "b": 1}
+    target_bytes = int(value * multipliers[unit])
+    folio_plan = build_folio_plan(folio_index, sections)
+    folio_plan["bytes_per_cycle"] = corpus_bytes
+
+    print(f"Step 2: Streaming ~{target_bytes / 1e6:,.1f} MB of synthetic text to '{args.out_prefix}_*'...")
+    n_paragraphs, n_words, paths = generate_corpus(word_models, glyph_model, hapaxes, folio_plan,
+                                                   target_bytes, args.seed, args.out_prefix)
+    elapsed = time.perf_counter() - start_time
+    print(f"✅ Generated {n_paragraphs:,} paragraphs, {n_words:,} words in {elapsed:.1f}s "
+          f"({n_words / max(elapsed, 1e-9):,.0f} words/s).")
+    for path in paths:
+        print(f"💾 {path}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+import argparse
+import csv
+import json
+import math
+import os
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from corpus_metrics import load_encoded, corpus_metrics, CACHE_DIR
+from script_loader import load_script
+
+# --- CONFIGURATION ---
+MANIFEST_FILE = "corpora_manifest.json"   # Reference corpora to compare (created on first run)
+OUTPUT_CSV = "corpus_comparison.csv"
+DEFAULT_SEED = 1409                       # Seed for 'shuffle' control corpora
+
+# Written to MANIFEST_FILE when it does not exist yet: the three corpora of the
+# original comparative tests plus the shuffled Voynich control from 03.
+# Add one entry per corpus; 'language' selects the cleaning alphabet (see
+# corpus_metrics.LANGUAGE_LETTERS, 'any' for non-Latin scripts, or 'raw' for
+# files that are already tokenized: the Voynich rows read voynich_ready_nlp.txt
+# as 03 does, and main() checks that they reproduce 03's entropies) and
+# 'group' is free text used to sort the table (cipher, natural, constructed...).
+DEFAULT_MANIFEST = {
+    "corpora": [
+        {"name": "Voynich (Original)", "file": "voynich_ready_nlp.txt", "language": "raw", "group": "target"},
+        {"name": "Voynich (Random)", "file": "voynich_ready_nlp.txt", "language": "raw", "group": "control",
+         "shuffle": True},
+        {"name": "Copiale (English)", "file": "copiale_english_translation.txt", "language": "english",
+         "group": "cipher (translation)"},
+        {"name": "Sefer Yetzirah (Eng)", "file": "sefer_yetzirah_english.txt", "language": "english",
+         "group": "natural"},
+    ]
+}
+
+COLUMNS = ["name", "group", "language", "tokens", "types", "ttr", "mean_word_len", "h1_word", "h2_word",
+           "h1_char", "h2_char", "zipf_slope", "heaps_k", "heaps_beta", "zlib_ratio", "bz2_ratio", "lzma_ratio",
+           "cached", "seconds"]
+
+# --- WORKER ---
+
+def analyze_corpus(entry, max_tokens=None, cache_dir=CACHE_DIR):
+    """Runs in a worker process: load (or build) the encoded corpus, then compute every metric."""
+    import numpy as np
+    start_time = time.perf_counter()
+    ids, vocab, cached = load_encoded(entry["file"], entry.get("language", "english"), cache_dir)
+    if entry.get("shuffle"):
+        ids = np.random.default_rng(entry.get("seed", DEFAULT_SEED)).permutation(ids)
+    if max_tokens:
+        ids = ids[:max_tokens]  # Size-matched comparison: TTR and Heaps K depend on corpus length
+    row = {"name": entry["name"], "group": entry.get("group", ""), "language": entry.get("language", "english")}
+    row.update(corpus_metrics(ids, vocab))
+    row["cached"] = cached
+    row["seconds"] = time.perf_counter() - start_time
+    return row
+
+# --- CHECK AGAINST 03 ---
+
+def check_against_03(rows, corpora):
+    """
+    Compares the default Voynich rows with 03's numbers for the same file:
+    H1 (of 03's tokens) and 03's own H2 for the original text; tokens and H1
+    for the shuffled control (03 shuffles without a seed, so its H2 varies).
+    Returns (number of rows checked, mismatch messages).
+    """
+    entropy_module = load_script("03_calculate_entropy_comparative")
+    defaults = {e["name"]: e for e in DEFAULT_MANIFEST["corpora"] if e["file"] == entropy_module.VOYNICH_FILE}
+    files = {e["name"]: e["file"] for e in corpora}
+    checked, problems = 0, []
+    for row in rows:
+        default = defaults.get(row["name"])
+        if default is None or os.path.basename(files[row["name"]]) != default["file"]:
+            continue
+        checked += 1
+        with open(files[row["name"]], "r", encoding="utf-8") as f:
+            text = f.read()
+        words = text.split()
+        h1 = -sum(c / len(words) * math.log2(c / len(words)) for c in Counter(words).values()) if words else 0.0
+        expected = {"tokens": len(words), "h1_word": h1}
+        if not default.get("shuffle"):
+            expected["h2_word"] = entropy_module.calculate_second_order_entropy(text)
+        for column, value in expected.items():
+            if abs(row[column] - value) > 1e-9:
+                problems.append(f"{row['name']} {column} = {format_value(row[column])}, 03 gives {format_value(value)} "
+                                f"(language '{row['language']}', default '{default['language']}')")
+    return checked, problems
+
+# --- MAIN ---
+
+def load_manifest(path):
+    if not os.path.exists(path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(DEFAULT_MANIFEST, f, indent=2)
+        print(f" -> No manifest found; wrote the default one to '{path}'. Add corpora there.")
+    with open(path, "r", encoding="utf-8") as f:
+        manifest = json.load(f)
+    # Relative corpus paths are resolved against the manifest's directory
+    base_dir = os.path.dirname(os.path.abspath(path))
+    for entry in manifest["corpora"]:
+        entry["file"] = os.path.join(base_dir, entry["file"])
+    return manifest["corpora"]
+
+def format_value(value):
+    if isinstance(value, float):
+        return f"{value:.4f}"
+    return str(value)
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare entropy, Zipf, Heaps and compression metrics across corpora.")
+    parser.add_argument("--manifest", default=MANIFEST_FILE, help="JSON manifest of corpora.")
+    parser.add_argument("--output", default=OUTPUT_CSV, help="Comparison table (CSV).")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Worker processes.")
+    parser.add_argument("--max-tokens", type=int, help="Truncate every corpus to this many tokens.")
+    parser.add_argument("--cache-dir", default=CACHE_DIR, help="Integer-encoded corpus cache directory.")
+    args = parser.parse_args()
+
+    print("--- Comparative Corpus Engine ---")
+    corpora = load_manifest(args.manifest)
+    missing = [e["file"] for e in corpora if not os.path.exists(e["file"])]
+    if missing:
+        print(f"WARNING: Skipping missing file(s): {', '.join(sorted(set(missing)))}")
+        corpora = [e for e in corpora if os.path.exists(e["file"])]
+    if not corpora:
+        print("ERROR: No corpora to analyze.")
+        return
+
+    print(f"Step 1: Analyzing {len(corpora)} corpora with {args.workers} workers...")
+    start_time = time.perf_counter()
+    rows = []
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        futures = [pool.submit(analyze_corpus, entry, args.max_tokens, args.cache_dir) for entry in corpora]
+        for entry, future in zip(corpora, futures):
+            try:
+                row = future.result()
+            except Exception as e:
+                print(f"  ERROR analyzing '{entry['name']}': {e}")
+                continue
+            rows.append(row)
+            source = "cache" if row["cached"] else "cleaned"
+            print(f"  {row['name']:<28} {row['tokens']:>9,} tokens  H2={row['h2_word']:.4f}  "
+                  f"Zipf={row['zipf_slope']:.2f}  ({source}, {row['seconds']:.2f}s)")
+
+    rows.sort(key=lambda r: (r["group"], r["name"]))
+    print(f"\nStep 2: Saving comparison table to '{args.output}'...")
+    with open(args.output, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(COLUMNS)
+        for row in rows:
+            writer.writerow([format_value(row[c]) for c in COLUMNS])
+
+    print("\n--- Summary ---")
+    print(f"  {'Corpus':<28}{'Tokens':>10}{'Types':>8}{'H1':>8}{'H2':>8}{'H1 chr':>8}{'H2 chr':>8}{'Zipf':>7}"
+          f"{'Heaps b':>9}{'LZMA':>7}")
+    for row in rows:
+        print(f"  {row['name']:<28}{row['tokens']:>10,}{row['types']:>8,}{row['h1_word']:>8.3f}{row['h2_word']:>8.3f}"
+              f"{row['h1_char']:>8.3f}{row['h2_char']:>8.3f}{row['zipf_slope']:>7.2f}{row['heaps_beta']:>9.3f}{row['lzma_ratio']:>7.3f}")
+    print(f"\n✅ Compared {len(rows)} corpora in {time.perf_counter() - start_time:.2f}s.")
+
+    checked, problems = check_against_03(rows, corpora)
+    for problem in problems:
+        print(f"ERROR: {problem}")
+    if checked and not problems:
+        print(" -> The default Voynich rows reproduce 03's tokens, H1 and H2.")
+
+if __name__ == "__main__":
+    main()
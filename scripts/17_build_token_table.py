@@ -0,0 +1,144 @@
+import re
+import time
+from collections import Counter
+from ivtff import iter_ivtff, split_words, LineNumbering
+from script_loader import load_script
+from token_table import import_pyarrow, token_schema, read_tokens, COLUMNS, TOKEN_TABLE_FILE
+from instrumentation import stage
+
+# --- CONFIGURATION ---
+VOYNICH_SOURCE_FILE = "voynich.txt"     # All transcribers, page variables
+OUTPUT_TABLE_FILE = TOKEN_TABLE_FILE    # One row per token, one row group per folio
+COMPRESSION = "snappy"                  # Reads ~2x faster than zstd on per-folio row groups
+
+# Rows that 01_generate_clean_data.py turns into voynich_ready_nlp.txt paragraphs
+CLEAN_LOCUS = re.compile(r"^f\d+[rv]$")
+CLEAN_TRANSCRIBER = "H"
+
+# --- ANNOTATION ---
+
+class TokenAnnotator:
+    """Per-word-type cache of the pipeline's own parse: section map (01), parser/roles (10b), violations (06)."""
+    def __init__(self):
+        self.clean_data = load_script("01_generate_clean_data")
+        self.translator = load_script("10b_translate_all_improved")
+        self.syntax = load_script("06_analyze_syntax_patterns_v2")
+        self.word_cache = {}
+        self.section_cache = {}
+
+    def section(self, folio):
+        if folio not in self.section_cache:
+            self.section_cache[folio] = self.clean_data.get_section_from_folio(folio)
+        return self.section_cache[folio]
+
+    def word(self, word):
+        entry = self.word_cache.get(word)
+        if entry is None:
+            parsed = self.translator.ParsedWord(word)
+            entry = (parsed.prefix, parsed.root, parsed.suffix, parsed.role, self.syntax.check_violation(word))
+            self.word_cache[word] = entry
+        return entry
+
+# --- BUILD ---
+
+def build_token_table(source_file, output_file):
+    pa, pq = import_pyarrow()
+    schema = token_schema()
+    annotator = TokenAnnotator()
+    names = [name for name, _ in COLUMNS]
+
+    page_variables = {}
+    current_folio = None
+    columns = {name: [] for name in names}
+    numbering = LineNumbering()      # Line and paragraph numbers within the current folio
+    clean_paragraph = 0
+    stats = Counter()
+
+    def flush(writer):
+        if columns["word"]:
+            writer.write_table(pa.Table.from_pydict(columns, schema=schema))
+            stats["row_groups"] += 1
+            for values in columns.values():
+                values.clear()
+
+    with pq.ParquetWriter(output_file, schema, compression=COMPRESSION) as writer:
+        for record in iter_ivtff(source_file):
+            if record[0] == "page":
+                _, folio, variables = record
+                page_variables[folio] = variables
+                continue
+
+            locus = record[1]
+            if locus.folio != current_folio:
+                flush(writer)  # One row group per folio
+                current_folio = locus.folio
+                numbering = LineNumbering()
+
+            # All transcriber readings of a locus share its line and paragraph number
+            locus_line_index, locus_paragraph = numbering.number(locus)
+
+            # Same selection and cleaning as 01_generate_clean_data.py
+            row_clean_paragraph = -1
+            if (locus.transcriber == CLEAN_TRANSCRIBER and CLEAN_LOCUS.match(locus.folio)
+                    and re.sub(r"[=!%*]", "", locus.text.replace('.', ' ')).strip()):
+                row_clean_paragraph = clean_paragraph
+                clean_paragraph += 1
+
+            variables = page_variables.get(locus.folio, {})
+            section = annotator.section(locus.folio)
+            for position, word in enumerate(split_words(locus.text)):
+                prefix, root, suffix, role, violation = annotator.word(word)
+                columns["folio"].append(locus.folio)
+                columns["paragraph"].append(locus_paragraph)
+                columns["line"].append(locus.line)
+                columns["line_index"].append(locus_line_index)
+                columns["position"].append(position)
+                columns["section"].append(section)
+                columns["language"].append(variables.get("L"))
+                columns["hand"].append(variables.get("H"))
+                columns["transcriber"].append(locus.transcriber)
+                columns["word"].append(word)
+                columns["prefix"].append(prefix)
+                columns["root"].append(root)
+                columns["suffix"].append(suffix)
+                columns["role"].append(role)
+                columns["violation"].append(violation)
+                columns["clean_paragraph"].append(row_clean_paragraph)
+                stats["tokens"] += 1
+            stats["loci"] += 1
+        flush(writer)
+    stats["clean_paragraphs"] = clean_paragraph
+    stats["word_types"] = len(annotator.word_cache)
+    return stats
+
+def main():
+    print(f"Building the columnar token table from '{VOYNICH_SOURCE_FILE}'...")
+    start_time = time.perf_counter()
+    try:
+        with stage("build") as build_stage:
+            stats = build_token_table(VOYNICH_SOURCE_FILE, OUTPUT_TABLE_FILE)
+            build_stage.add_tokens(stats["tokens"])
+    except FileNotFoundError:
+        print(f"ERROR: Source file '{VOYNICH_SOURCE_FILE}' not found.")
+        return
+    elapsed = time.perf_counter() - start_time
+    print(f"✅ {stats['tokens']:,} tokens from {stats['loci']:,} loci ({stats['word_types']:,} word types) "
+          f"in {stats['row_groups']} folio row groups, {elapsed:.2f}s.")
+    print(f" -> {stats['clean_paragraphs']} rows map to voynich_ready_nlp.txt paragraphs (column 'clean_paragraph').")
+    print(f"💾 Saved token table to '{OUTPUT_TABLE_FILE}'")
+
+    # Quick check: a whole-table read and a single-folio read with predicate pushdown
+    load_start = time.perf_counter()
+    table = read_tokens(path=OUTPUT_TABLE_FILE)
+    load_ms = (time.perf_counter() - load_start) * 1000
+    folio_start = time.perf_counter()
+    folio_table = read_tokens(filters=[("folio", "=", "f57v")], path=OUTPUT_TABLE_FILE)
+    folio_ms = (time.perf_counter() - folio_start) * 1000
+    print(f" -> Full table read: {table.num_rows:,} rows in {load_ms:.1f} ms; "
+          f"folio f57v: {folio_table.num_rows} rows in {folio_ms:.1f} ms.")
+    by_transcriber = table.group_by("transcriber").aggregate([("word", "count")]).sort_by([("word_count", "descending")])
+    print(" -> Tokens per transcriber: " + ", ".join(
+        f"{t}={n:,}" for t, n in zip(by_transcriber["transcriber"].to_pylist(), by_transcriber["word_count"].to_pylist())))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,349 @@
+import csv
+import os
+import re
+import time
+from collections import Counter
+from count_cube import CountCube, CUBE_DIR_TEMPLATE, CORPUS_CUBE_DIR
+from folio_metadata import load_folio_metadata, parse_folio_metadata, FOLIO_METADATA_FILE
+from script_loader import load_script
+from token_table import read_tokens, TOKEN_TABLE_FILE
+from instrumentation import stage
+
+# --- CONFIGURATION ---
+TRANSCRIBER = "H"                                        # One reading per token (Takahashi)
+CUBE_DIR = CUBE_DIR_TEMPLATE.format(transcriber=TRANSCRIBER)
+ROOTS_FILE = "roots.txt"                                 # Root dictionary of 3/5 ('dict_root' kind)
+PREFIXES_FILE = "prefixes.txt"
+ATTRIBUTE_COLUMNS = ["section", "language", "hand"]      # Per-folio columns of the token table
+METADATA_ATTRIBUTES = ["quire", "page", "illustration", "illustration_type", "extra"]  # From folio_metadata.csv
+VOYNICH_SOURCE_FILE = "voynich.txt"                      # Page headers, if folio_metadata.csv is missing
+PARSE_KINDS = ["prefix", "root", "suffix", "role"]       # 10b's parse, stored per token in the table
+FORMATTED_FILE = "voynich_final_formatted_complete.txt"  # 02a's corpus (01_generate_clean_data.py)
+SEGMENTED_FILE = "voynich_super_clean_with_pages.txt"    # 5's corpus; 1 splits it into 3's corpus_A/B.txt
+FOLIO_MARKER = r'<f[0-9a-zA-Zvr]+>'                      # Folio markers as 1, 3 and 5 match them
+LIFT_REPORT_FILE = "thematic_analysis_results.csv"       # 02a's report, checked against the corpus cube
+DIALECT_REPORT_FILE = "dialect_quantification.csv"       # 3's report
+PREFIX_REPORT_FILE = "prefix_analysis.txt"               # 5's report
+
+# --- BUILD ---
+
+def load_morphemes(filename):
+    """Morphemes of a roots.txt/prefixes.txt style file ('morpheme | ...'), or None if it is missing."""
+    try:
+        with open(filename, 'r', encoding='utf-8') as f:
+            lines = f.readlines()
+    except FileNotFoundError:
+        return None
+    morphemes = []
+    for line in lines:
+        if line.startswith('#') or '===' in line or not line.strip():
+            continue
+        morpheme = line.split('|')[0].strip()
+        if morpheme:
+            morphemes.append(morpheme)
+    return morphemes
+
+def longest_substring_parser(morphemes):
+    """
+    word -> longest morpheme contained in it (the root rule of 02a, 3 and 5).
+    Morphemes of equal length keep their file order, as in 3 and 5.
+    """
+    ordered = sorted(dict.fromkeys(morphemes), key=len, reverse=True)
+    def parse(word):
+        for morpheme in ordered:
+            if morpheme in word:
+                return morpheme
+        return None
+    return parse
+
+def build_count_cube(table_file, transcriber):
+    """Counts every word of one transcriber per folio and derives the other kinds from the 'word' columns."""
+    import numpy as np
+    columns = ["folio", "word"] + PARSE_KINDS + ATTRIBUTE_COLUMNS
+    table = read_tokens(columns=columns, filters=[("transcriber", "=", transcriber)], path=table_file)
+
+    # Folios keep file order; words are sorted so the feature lists are stable across rebuilds
+    folio_column = table["folio"].to_numpy(zero_copy_only=False)
+    word_column = table["word"].to_numpy(zero_copy_only=False)
+    _, first_rows, folio_codes = np.unique(folio_column, return_index=True, return_inverse=True)
+    folio_order = np.argsort(first_rows, kind="stable")
+    folio_rank = np.empty_like(folio_order)
+    folio_rank[folio_order] = np.arange(len(folio_order))
+    folio_codes = folio_rank[folio_codes]
+    words, word_codes = np.unique(word_column, return_inverse=True)
+    word_matrix = np.bincount(folio_codes * len(words) + word_codes,
+                              minlength=len(folio_order) * len(words)).reshape(len(folio_order), len(words))
+
+    folio_rows = first_rows[folio_order]
+    folios = [str(folio_column[row]) for row in folio_rows]
+    attributes = {name: [table[name][int(row)].as_py() for row in folio_rows] for name in ATTRIBUTE_COLUMNS}
+    cube = CountCube(folios, attributes, {"word": [str(w) for w in words]},
+                     {"word": word_matrix.astype(np.int32)}, transcriber=transcriber)
+
+    # The parse is a function of the word, so each kind is a re-grouping of the word columns
+    first_word_rows = np.unique(word_codes, return_index=True)[1]
+    for kind in PARSE_KINDS:
+        values = table[kind].to_numpy(zero_copy_only=False)
+        word_to_value = {str(words[code]): values[row] for code, row in enumerate(first_word_rows)}
+        cube.add_kind(kind, word_to_value.get)
+    return cube, table.num_rows
+
+def add_dictionary_kinds(cube):
+    """02a's lift roots and the roots.txt dictionary roots, re-grouped from the 'word' columns."""
+    lift_module = load_script("02a_thematic_analysis_liftscore")
+    cube.add_kind("lift_root", lift_module.parse_word_for_root)
+    roots = load_morphemes(ROOTS_FILE)
+    if roots:
+        cube.add_kind("dict_root", longest_substring_parser(roots))
+    else:
+        print(f" -> '{ROOTS_FILE}' not found; skipping the 'dict_root' kind.")
+
+def add_attribute_and_dictionary_kinds(cube):
+    """Page variables, dialect (1's get_dialect_map), 02a's lift roots and the roots.txt dictionary roots."""
+    try:
+        metadata = load_folio_metadata(FOLIO_METADATA_FILE)
+    except FileNotFoundError:
+        metadata = parse_folio_metadata(VOYNICH_SOURCE_FILE)
+    for name in METADATA_ATTRIBUTES:
+        cube.attributes[name] = [metadata.get(folio, name) for folio in cube.folios]
+
+    dialect_map = load_script("1_segment_by_dialect").get_dialect_map()
+    dialect_of = {folio: dialect for dialect, folios in dialect_map.items() for folio in folios}
+    cube.attributes["dialect"] = [dialect_of.get(folio[1:]) for folio in cube.folios]
+    add_dictionary_kinds(cube)
+
+# ==============================================================================
+#    CORPUS CUBE: the rows and tokenization of 02a, 3 and 5
+# ==============================================================================
+# The token-table cube counts every locus in split_words tokenization, which
+# is none of the scripts' corpora. The corpus cube counts the files the
+# scripts read, split on whitespace as they split them:
+#   - corpus 'formatted': voynich_final_formatted_complete.txt (01's H
+#     paragraphs) in 02a's folio segments, i.e. with 02a's reading of any
+#     '<...>' line as a folio tag; section = 02a's get_section_from_folio.
+#   - corpus 'segmented': voynich_super_clean_with_pages.txt cut at its folio
+#     markers. 5 counts every row; the dialect attribute is 1's map, so the
+#     A and B rows are exactly the folios of 3's corpus_A/B.txt.
+# main() checks the roll-ups against the scripts' reports.
+
+def segmented_pieces(content):
+    """(folio, text) of 0's corpus cut at the folio markers; the text before the first marker has folio ''."""
+    pieces = re.split(f"({FOLIO_MARKER})", content)
+    return [("", pieces[0])] + [(marker.strip("<>"), text) for marker, text in zip(pieces[1::2], pieces[2::2])]
+
+def build_corpus_cube(formatted_file, segmented_file):
+    """Folio x word counts of 02a's and 5's corpora in one cube, rows told apart by the 'corpus' attribute."""
+    import numpy as np
+    lift_module = load_script("02a_thematic_analysis_liftscore")
+    rows = {}                               # (corpus, folio) -> word counts, in reading order
+    with open(formatted_file, "r", encoding="utf-8") as f:
+        for folio, words in lift_module.iter_folio_words(f.readlines()):
+            rows.setdefault(("formatted", folio), Counter()).update(words)
+    with open(segmented_file, "r", encoding="utf-8") as f:
+        for folio, text in segmented_pieces(f.read()):
+            words = text.split()
+            if words:                       # 1 skips empty folios
+                rows.setdefault(("segmented", folio), Counter()).update(words)
+
+    keys = list(rows)
+    words = sorted(set().union(*rows.values()))
+    index = {w: i for i, w in enumerate(words)}
+    word_matrix = np.zeros((len(keys), len(words)), dtype=np.int32)
+    for row, key in enumerate(keys):
+        counts = rows[key]
+        word_matrix[row, [index[w] for w in counts]] = list(counts.values())
+
+    dialect_map = load_script("1_segment_by_dialect").get_dialect_map()
+    dialect_of = {folio: dialect for dialect, folios in dialect_map.items() for folio in folios}
+    folios = [folio for _, folio in keys]
+    attributes = {
+        "corpus": [corpus for corpus, _ in keys],
+        "section": [lift_module.get_section_from_folio(folio) for folio in folios],
+        "dialect": [dialect_of.get(folio.strip("f")) for folio in folios],   # 1 strips '<>f' from the marker
+    }
+    cube = CountCube(folios, attributes, {"word": words}, {"word": word_matrix})
+    add_dictionary_kinds(cube)
+    return cube, int(word_matrix.sum())
+
+# --- QUERIES (corpus cube) ---
+
+def section_lift(cube):
+    """(sections, roots, root totals, lift) of 02a's roots in 02a's sections: per-word lift over the 'formatted' rows."""
+    lift_module = load_script("02a_thematic_analysis_liftscore")
+    section_of = lambda folio: None if (s := lift_module.get_section_from_folio(folio)) == "Unknown" else s
+    sections, counts = cube.roll_up("lift_root", by=section_of, corpus="formatted")
+    _, lift = cube.lift("lift_root", by=section_of, min_total=10, per_kind="word", corpus="formatted")
+    return sections, cube.kinds["lift_root"], counts.sum(axis=0), lift
+
+def dialect_fingerprint(cube, concepts):
+    """(dialects, per-1,000-root frequencies of the concepts) over the 'segmented' rows, as in 3."""
+    import numpy as np
+    groups, counts = cube.roll_up("dict_root", by="dialect", corpus="segmented")
+    _, concept_counts = cube.roll_up("dict_root", by="dialect", features=concepts, corpus="segmented")
+    return groups, concept_counts / np.maximum(counts.sum(axis=1, keepdims=True), 1) * 1000
+
+def prefix_associations(cube, prefixes):
+    """{prefix: [(root, lift, count in context)]} with lift > 1.5, over every 'segmented' row, as in 5."""
+    import numpy as np
+    roots = cube.kinds["dict_root"]
+    parse = longest_substring_parser(load_morphemes(ROOTS_FILE))
+    words = cube.kinds["word"]
+    word_totals = cube.slice("word", corpus="segmented").sum(axis=0)
+    root_codes = np.array([-1 if (r := parse(w)) is None else cube.feature_index("dict_root", r) for w in words])
+    has_root = (root_codes >= 0) & (word_totals > 0)
+    baseline = np.bincount(root_codes[has_root], weights=word_totals[has_root], minlength=len(roots))
+    baseline_freq = baseline / baseline.sum()
+    associations = {}
+    for prefix in prefixes:
+        in_context = has_root & np.array([w.startswith(prefix) for w in words])
+        if not in_context.any():
+            continue
+        context = np.bincount(root_codes[in_context], weights=word_totals[in_context], minlength=len(roots))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            lift = (context / context.sum()) / baseline_freq
+        associations[prefix] = [(roots[c], float(lift[c]), int(context[c]))
+                                for c in np.argsort(-np.nan_to_num(lift), kind="stable") if lift[c] > 1.5]
+    return associations
+
+# --- CHECKS AGAINST THE SCRIPTS' REPORTS ---
+
+def check_section_lift(cube, report_file):
+    """Mismatches between the cube's section lift and 02a's CSV (same roots, totals and 2-decimal lifts)."""
+    sections, roots, totals, lift = section_lift(cube)
+    with open(report_file, "r", encoding="utf-8") as f:
+        report = {row["Root"]: row for row in csv.DictReader(f)}
+    problems = []
+    cube_roots = {roots[c] for c in range(len(roots)) if totals[c] >= 10}
+    if cube_roots != set(report):
+        problems.append(f"roots with >= 10 occurrences differ: {sorted(cube_roots ^ set(report))}")
+    for c, root in enumerate(roots):
+        if root not in report or root not in cube_roots:
+            continue
+        if int(report[root]["Total_Freq"]) != totals[c]:
+            problems.append(f"{root}: total {totals[c]}, 02a {report[root]['Total_Freq']}")
+        for s, section in enumerate(sections):
+            if f"{lift[s, c]:.2f}" != report[root][f"Lift_{section}"]:
+                problems.append(f"{root} / {section}: lift {lift[s, c]:.2f}, 02a {report[root][f'Lift_{section}']}")
+    return problems
+
+def check_dialect_fingerprint(cube, report_file):
+    """Mismatches between the cube's per-1,000 frequencies and 3's CSV."""
+    with open(report_file, "r", encoding="utf-8") as f:
+        report = list(csv.DictReader(f))
+    groups, per_thousand = dialect_fingerprint(cube, [row["concept"] for row in report])
+    problems = []
+    for column, row in enumerate(report):
+        for dialect in ("A", "B"):
+            value = round(float(per_thousand[groups.index(dialect), column]), 2) if dialect in groups else 0
+            if value != float(row[f"freq_{dialect}_per_1000"]):
+                problems.append(f"{row['concept']} / {dialect}: {value:.2f} per 1,000, 3 {row[f'freq_{dialect}_per_1000']}")
+    return problems
+
+def check_prefix_associations(cube, report_file):
+    """Mismatches between the cube's prefix associations and the top-10 tables of 5's report."""
+    associations = prefix_associations(cube, load_morphemes(PREFIXES_FILE) or [])
+    reported, prefix = {}, None
+    with open(report_file, "r", encoding="utf-8") as f:
+        for line in f:
+            if (match := re.match(r"\s*Analysis for Prefix: '(.*)-'", line)):
+                prefix = match.group(1)
+                reported[prefix] = []
+            elif prefix is not None and line.count("|") == 3 and not line.startswith("Lift Score"):
+                lift, root, count, _ = [part.strip() for part in line.split("|")]
+                reported[prefix].append((root, float(lift), int(count)))
+    problems = []
+    for prefix, rows in reported.items():
+        found = {(root, round(lift, 2), count) for root, lift, count in associations.get(prefix, [])}
+        if len(rows) != min(10, len(found)) or not set(rows) <= found:
+            problems.append(f"prefix '{prefix}-': {sorted(set(rows) - found)[:3]} not reproduced")
+    return problems
+
+# --- EXAMPLE QUERIES ---
+
+def print_section_lift(cube):
+    """Lift of 02a's roots in 02a's section ranges (per-word probabilities, min. 10 occurrences)."""
+    sections, roots, _, lift = section_lift(cube)
+    print("\n--- Root lift by section (02a: formatted rows of the corpus cube) ---")
+    print("Root".ljust(8) + "".join(g[:13].rjust(15) for g in sections))
+    for column in sorted(range(len(roots)), key=lambda c: roots[c]):
+        if lift[0, column] == lift[0, column]:  # Skip NaN (rare) roots
+            print(roots[column].ljust(8) + "".join(f"{value:15.2f}" for value in lift[:, column]))
+
+def print_dialect_fingerprint(cube):
+    """3's key concepts per 1,000 dictionary roots in dialect A and B."""
+    if "dict_root" not in cube.kinds:
+        return
+    concepts = load_script("3_quantify_dialects").KEY_CONCEPTS
+    groups, per_thousand = dialect_fingerprint(cube, concepts)
+    print("\n--- Dialect fingerprint (3: segmented rows by dialect): per 1,000 roots ---")
+    print("Concept".ljust(8) + "".join(f"Dialect {g}".rjust(12) for g in groups))
+    for column, concept in enumerate(concepts):
+        print(concept.ljust(8) + "".join(f"{value:12.2f}" for value in per_thousand[:, column]))
+
+def print_prefix_associations(cube, prefixes, top_n=5):
+    """5's test: roots over-represented among words starting with each prefix (lift > 1.5)."""
+    if "dict_root" not in cube.kinds or not prefixes:
+        return
+    print(f"\n--- Prefix associations (5: every segmented row): top {top_n} roots with lift > 1.5 ---")
+    for prefix, found in prefix_associations(cube, prefixes).items():
+        if found:
+            print(f"  {prefix + '-':<8}" + ", ".join(f"{root} ({lift:.2f})" for root, lift, _ in found[:top_n]))
+
+def main():
+    print(f"Building the folio x feature count cube for transcriber '{TRANSCRIBER}'...")
+    start_time = time.perf_counter()
+    try:
+        with stage("build") as build_stage:
+            cube, n_tokens = build_count_cube(TOKEN_TABLE_FILE, TRANSCRIBER)
+            add_attribute_and_dictionary_kinds(cube)
+            build_stage.add_tokens(n_tokens)
+    except FileNotFoundError:
+        print(f"ERROR: Token table '{TOKEN_TABLE_FILE}' not found. Please run 17_build_token_table.py first.")
+        return
+    with stage("write"):
+        cube.save(CUBE_DIR)
+    elapsed = time.perf_counter() - start_time
+    size_mb = sum(os.path.getsize(os.path.join(CUBE_DIR, name)) for name in os.listdir(CUBE_DIR)) / 2**20
+    print(f"✅ {n_tokens:,} tokens over {len(cube.folios)} folios in {elapsed:.2f}s.")
+    print(" -> Kinds: " + ", ".join(f"{kind} ({len(features):,})" for kind, features in cube.kinds.items()))
+    print(f"💾 Saved count cube to '{CUBE_DIR}/' ({size_mb:.1f} MB)")
+
+    print(f"\nBuilding the corpus cube from '{FORMATTED_FILE}' (02a) and '{SEGMENTED_FILE}' (3, 5)...")
+    start_time = time.perf_counter()
+    missing = [path for path in (FORMATTED_FILE, SEGMENTED_FILE) if not os.path.exists(path)]
+    if missing:
+        print(f"ERROR: '{missing[0]}' not found. Please run 0_create_segmented_corpus.py and 01_generate_clean_data.py first.")
+        return
+    with stage("build") as build_stage:
+        corpus_cube, n_tokens = build_corpus_cube(FORMATTED_FILE, SEGMENTED_FILE)
+        build_stage.add_tokens(n_tokens)
+    with stage("write"):
+        corpus_cube.save(CORPUS_CUBE_DIR)
+    size_mb = sum(os.path.getsize(os.path.join(CORPUS_CUBE_DIR, name)) for name in os.listdir(CORPUS_CUBE_DIR)) / 2**20
+    print(f"✅ {n_tokens:,} tokens over {len(corpus_cube.folios)} folio rows in {time.perf_counter() - start_time:.2f}s.")
+    print(f"💾 Saved corpus cube to '{CORPUS_CUBE_DIR}/' ({size_mb:.1f} MB)")
+
+    # Every query below is an array reduction over the memory-mapped cube
+    query_start = time.perf_counter()
+    with stage("query"):
+        corpus_cube = CountCube.load(CORPUS_CUBE_DIR)
+        print_section_lift(corpus_cube)
+        print_dialect_fingerprint(corpus_cube)
+        print_prefix_associations(corpus_cube, load_morphemes(PREFIXES_FILE))
+    print(f"\n -> Example queries answered from the cube in {(time.perf_counter() - query_start) * 1000:.1f} ms.")
+
+    # The roll-ups must be the scripts' own numbers
+    checks = [("02a", LIFT_REPORT_FILE, check_section_lift), ("3", DIALECT_REPORT_FILE, check_dialect_fingerprint),
+              ("5", PREFIX_REPORT_FILE, check_prefix_associations)]
+    for script, report_file, check in checks:
+        if not os.path.exists(report_file):
+            print(f" -> '{report_file}' not found; run {script} to check the cube against it.")
+            continue
+        problems = check(corpus_cube, report_file)
+        for problem in problems[:10]:
+            print(f"ERROR: {report_file}: {problem}")
+        if not problems:
+            print(f" -> The corpus cube reproduces '{report_file}' ({script}).")
+
+if __name__ == "__main__":
+    main()
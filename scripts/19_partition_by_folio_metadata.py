@@ -0,0 +1,103 @@
+import argparse
+import csv
+import time
+from count_cube import CountCube, CUBE_DIR_TEMPLATE
+from instrumentation import stage
+
+# --- CONFIGURATION ---
+TRANSCRIBER = "H"
+DEFAULT_PARTITIONS = ["hand", "quire", "illustration_type"]
+DEFAULT_KIND = "lift_root"
+TOP_N = 5                                   # Top features (by lift) printed per group
+MIN_TOTAL = 10                              # Features rarer than this get no lift, as in 02a
+OUTPUT_CSV_TEMPLATE = "partition_{by}_{kind}.csv"
+
+# ==============================================================================
+#    PARTITIONS: any folio attribute (or combination) as one cube roll-up
+# ==============================================================================
+# Attributes come from the count cube (18_build_count_cube.py): the page
+# variables of folio_metadata.csv (quire, page, illustration, language, hand,
+# extra), 01's section and 1's dialect. 'quire+hand' partitions by both at
+# once. Each partition is a single grouped reduction over the folio rows.
+
+def partition_labels(cube, by):
+    """Folio -> group label for 'attr' or 'attr1+attr2'; folios missing any attribute map to None."""
+    names = by.split("+")
+    unknown = [name for name in names if name not in cube.attributes]
+    if unknown:
+        raise KeyError(f"Unknown folio attribute(s) {unknown}. Available: {sorted(cube.attributes)}")
+    labels = {}
+    for row, folio in enumerate(cube.folios):
+        values = [cube.attributes[name][row] for name in names]
+        labels[folio] = None if any(v is None for v in values) else "+".join(str(v) for v in values)
+    return labels
+
+def summarize_partition(cube, by, kind, top_n=TOP_N, min_total=MIN_TOTAL):
+    """Returns one summary dict per group plus the (group, feature, count, lift) rows for the CSV."""
+    import numpy as np
+    labels = partition_labels(cube, by)
+    groups, counts = cube.roll_up(kind, by=labels)
+    _, lift = cube.lift(kind, by=labels, min_total=min_total)
+    _, word_counts = cube.roll_up("word", by=labels)
+    folio_counts = {g: sum(1 for label in labels.values() if label == g) for g in groups}
+    features = cube.kinds[kind]
+
+    summaries, rows = [], []
+    for i, group in enumerate(groups):
+        ranked = [c for c in np.argsort(-np.nan_to_num(lift[i], nan=-1.0)) if counts[i, c] > 0 and lift[i, c] == lift[i, c]]
+        summaries.append({
+            "group": group,
+            "folios": folio_counts[group],
+            "tokens": int(word_counts[i].sum()),
+            "types": int(np.count_nonzero(word_counts[i])),
+            "top": [(features[c], float(lift[i, c])) for c in ranked[:top_n]],
+        })
+        for c in np.nonzero(counts[i])[0]:
+            rows.append([group, features[c], int(counts[i, c]), "" if lift[i, c] != lift[i, c] else round(float(lift[i, c]), 4)])
+    return summaries, rows
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Partition the corpus by folio metadata (quire, hand, illustration, ...).")
+    parser.add_argument("--by", nargs="+", default=DEFAULT_PARTITIONS,
+                        help="Folio attributes to partition by; join with '+' to combine (e.g. quire+hand).")
+    parser.add_argument("--kind", default=DEFAULT_KIND, help=f"Feature kind of the count cube (default: {DEFAULT_KIND}).")
+    parser.add_argument("--top", type=int, default=TOP_N, help="Top features by lift printed per group.")
+    parser.add_argument("--transcriber", default=TRANSCRIBER)
+    args = parser.parse_args(argv)
+
+    cube_dir = CUBE_DIR_TEMPLATE.format(transcriber=args.transcriber)
+    try:
+        with stage("load"):
+            cube = CountCube.load(cube_dir)
+    except FileNotFoundError:
+        print(f"ERROR: Count cube '{cube_dir}' not found. Please run 18_build_count_cube.py first.")
+        return
+    if args.kind not in cube.kinds:
+        print(f"ERROR: Unknown kind '{args.kind}'. Available: {', '.join(cube.kinds)}")
+        return
+
+    for by in args.by:
+        start_time = time.perf_counter()
+        try:
+            with stage(f"partition:{by}"):
+                summaries, rows = summarize_partition(cube, by, args.kind, top_n=args.top)
+        except KeyError as e:
+            print(f"ERROR: {e.args[0]}")
+            continue
+        elapsed_ms = (time.perf_counter() - start_time) * 1000
+
+        print(f"\n--- Partition by '{by}' ({args.kind}, {len(summaries)} groups, {elapsed_ms:.1f} ms) ---")
+        print(f"{'Group':<16}{'Folios':>7}{'Tokens':>9}{'Types':>8}   Top {args.kind} by lift")
+        for summary in summaries:
+            top = ", ".join(f"{feature} ({value:.2f})" for feature, value in summary["top"])
+            print(f"{summary['group']:<16}{summary['folios']:>7}{summary['tokens']:>9,}{summary['types']:>8,}   {top}")
+
+        output_file = OUTPUT_CSV_TEMPLATE.format(by=by.replace("+", "_"), kind=args.kind)
+        with open(output_file, "w", encoding="utf-8", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["Group", "Feature", "Count", "Lift"])
+            writer.writerows(rows)
+        print(f"💾 Saved {len(rows):,} rows to '{output_file}'")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,285 @@
+import argparse
+import csv
+import os
+import time
+from count_cube import CountCube, CUBE_DIR_TEMPLATE
+from script_loader import load_script
+from eva_glyphs import GlyphTokenizer
+from instrumentation import stage
+
+# --- CONFIGURATION ---
+TRANSCRIBER = "H"
+FEATURE_BLOCKS = {"word": 1.0, "root": 1.0, "glyph": 1.0, "affix": 1.0}   # Block -> weight in the cosine
+GLYPH_NGRAM_RANGE = (1, 3)                  # Glyph n-grams per word, with word-boundary marks
+GLYPH_INVENTORY = "basic"                   # Multi-letter EVA glyphs kept together (eva_glyphs.py)
+MIN_FOLIO_TOKENS = 30                       # Shorter folios (label-only pages) are left out
+REFERENCES = ["language", "dialect", "hand"]  # $L, 1's DIALECT_MAP, $H
+SPECTRAL_RESTARTS = 10
+SEED = 1409
+OUTPUT_CLUSTERS_FILE = "folio_clusters.csv"
+OUTPUT_AGREEMENT_FILE = "folio_cluster_agreement.csv"
+OUTPUT_SIMILARITY_FILE = "folio_similarity.npy"
+
+# ==============================================================================
+#    FOLIO VECTORS: sparse TF-IDF blocks from the count cube
+# ==============================================================================
+# Every block is a folio x feature count matrix: word, root (10b's parse),
+# affix (prefix and suffix columns side by side) straight from the cube, and
+# glyph n-grams as (folio x word) @ (word x n-gram), so no corpus pass is
+# needed for any of them. Each block is TF-IDF weighted (sublinear tf) and
+# L2-normalised, then scaled by sqrt(weight / total weight): the row norm of
+# the stacked matrix is 1 and X @ X.T is the weighted cosine similarity.
+
+def import_scipy():
+    """
+    Imports scipy on first use and provides a helpful error message
+    if it's not installed.
+    """
+    try:
+        import scipy.sparse
+        import scipy.cluster
+    except ImportError:
+        print("Error: The 'scipy' library is not installed.")
+        print("Please install it by running: pip install scipy")
+        raise SystemExit(1)
+    return scipy
+
+def glyph_ngrams(word, tokenizer, ngram_range=GLYPH_NGRAM_RANGE):
+    glyphs = ["<"] + tokenizer.split(word) + [">"]
+    low, high = ngram_range
+    grams = []
+    for n in range(low, high + 1):
+        for i in range(len(glyphs) - n + 1):
+            gram = glyphs[i:i + n]
+            if n == 1 and gram[0] in "<>":
+                continue  # Bare boundary marks carry no information
+            grams.append("".join(gram))
+    return grams
+
+def word_glyph_matrix(words, tokenizer):
+    """Sparse (word types x glyph n-grams) count matrix."""
+    import numpy as np
+    scipy = import_scipy()
+    lookup, rows, cols = {}, [], []
+    for row, word in enumerate(words):
+        for gram in glyph_ngrams(word, tokenizer):
+            rows.append(row)
+            cols.append(lookup.setdefault(gram, len(lookup)))
+    data = np.ones(len(rows), dtype=np.float64)
+    matrix = scipy.sparse.csr_matrix((data, (rows, cols)), shape=(len(words), len(lookup)))
+    matrix.sum_duplicates()
+    return matrix, list(lookup)
+
+def feature_blocks(cube, rows, names, tokenizer):
+    """{block: sparse folio x feature counts} for the selected folio rows."""
+    scipy = import_scipy()
+    sparse = scipy.sparse
+    word_counts = sparse.csr_matrix(cube.slice("word")[rows].astype("float64"))
+    blocks = {}
+    if "word" in names:
+        blocks["word"] = word_counts
+    if "root" in names:
+        blocks["root"] = sparse.csr_matrix(cube.slice("root")[rows].astype("float64"))
+    if "affix" in names:
+        blocks["affix"] = sparse.hstack([sparse.csr_matrix(cube.slice(kind)[rows].astype("float64"))
+                                         for kind in ("prefix", "suffix")], format="csr")
+    if "glyph" in names:
+        glyph_matrix, _ = word_glyph_matrix(cube.kinds["word"], tokenizer)
+        blocks["glyph"] = (word_counts @ glyph_matrix).tocsr()
+    return blocks
+
+def tfidf(counts):
+    """Sublinear TF-IDF with smoothed idf, rows L2-normalised (empty rows stay zero)."""
+    import numpy as np
+    scipy = import_scipy()
+    counts = counts.tocsr().astype(np.float64)
+    counts.eliminate_zeros()
+    n_rows = counts.shape[0]
+    document_frequency = np.bincount(counts.indices, minlength=counts.shape[1])
+    idf = np.log((1 + n_rows) / (1 + document_frequency)) + 1
+    weighted = counts.copy()
+    weighted.data = (1 + np.log(weighted.data)) * idf[weighted.indices]
+    norms = np.sqrt(np.asarray(weighted.multiply(weighted).sum(axis=1)).ravel())
+    norms[norms == 0] = 1.0
+    return scipy.sparse.diags(1 / norms) @ weighted
+
+def folio_vectors(blocks, weights):
+    scipy = import_scipy()
+    total = sum(weights[name] for name in blocks)
+    return scipy.sparse.hstack([tfidf(matrix) * (weights[name] / total) ** 0.5
+                                for name, matrix in blocks.items()], format="csr")
+
+# --- CLUSTERING ---
+
+def hierarchical_clusters(similarity, k):
+    """
+    Ward clustering cut into k clusters. Rows are unit vectors, so the
+    Euclidean distance is sqrt(2 - 2 cos). (Average linkage on cosine
+    distance chains: it peels off one outlier folio per cut.)
+    """
+    import numpy as np
+    import_scipy()
+    from scipy.cluster.hierarchy import linkage, fcluster
+    from scipy.spatial.distance import squareform
+    distance = np.sqrt(np.clip(2.0 - 2.0 * similarity, 0.0, None))
+    np.fill_diagonal(distance, 0.0)
+    tree = linkage(squareform(distance, checks=False), method="ward")
+    return fcluster(tree, k, criterion="maxclust") - 1
+
+def spectral_clusters(similarity, k, restarts=SPECTRAL_RESTARTS, seed=SEED):
+    """Normalised spectral clustering (Ng-Jordan-Weiss) with k-means restarts on the embedding."""
+    import numpy as np
+    import_scipy()
+    from scipy.cluster.vq import kmeans2
+    affinity = np.clip(similarity, 0.0, None)
+    np.fill_diagonal(affinity, 0.0)
+    degree = affinity.sum(axis=1)
+    inv_sqrt = 1 / np.sqrt(np.where(degree > 0, degree, 1.0))
+    normalized = affinity * inv_sqrt[:, None] * inv_sqrt[None, :]
+    _, vectors = np.linalg.eigh(normalized)
+    embedding = vectors[:, -k:]
+    norms = np.linalg.norm(embedding, axis=1, keepdims=True)
+    embedding = embedding / np.where(norms > 0, norms, 1.0)
+    rng = np.random.default_rng(seed)
+    best_labels, best_inertia = None, np.inf
+    for _ in range(restarts):
+        centroids, labels = kmeans2(embedding, k, minit="++", seed=int(rng.integers(2**31)))
+        inertia = ((embedding - centroids[labels]) ** 2).sum()
+        if inertia < best_inertia:
+            best_labels, best_inertia = labels, inertia
+    return best_labels
+
+# --- AGREEMENT ---
+
+def contingency(labels_a, labels_b):
+    import numpy as np
+    _, codes_a = np.unique(labels_a, return_inverse=True)
+    _, codes_b = np.unique(labels_b, return_inverse=True)
+    table = np.zeros((codes_a.max() + 1, codes_b.max() + 1), dtype=np.int64)
+    np.add.at(table, (codes_a, codes_b), 1)
+    return table
+
+def adjusted_rand_index(labels_a, labels_b):
+    table = contingency(labels_a, labels_b)
+    pairs = lambda x: (x * (x - 1) / 2).sum()
+    n = table.sum()
+    index = pairs(table)
+    expected = pairs(table.sum(axis=1)) * pairs(table.sum(axis=0)) / (n * (n - 1) / 2)
+    maximum = (pairs(table.sum(axis=1)) + pairs(table.sum(axis=0))) / 2
+    return float((index - expected) / (maximum - expected)) if maximum != expected else 1.0
+
+def normalized_mutual_info(labels_a, labels_b):
+    """NMI with arithmetic-mean normalisation."""
+    import numpy as np
+    table = contingency(labels_a, labels_b)
+    p = table / table.sum()
+    pa, pb = p.sum(axis=1), p.sum(axis=0)
+    nz = p > 0
+    mutual = (p[nz] * np.log(p[nz] / np.outer(pa, pb)[nz])).sum()
+    entropy = lambda q: -(q[q > 0] * np.log(q[q > 0])).sum()
+    denominator = (entropy(pa) + entropy(pb)) / 2
+    return float(mutual / denominator) if denominator > 0 else 1.0
+
+# --- MAIN ---
+
+def load_or_build_cube(transcriber):
+    cube_dir = CUBE_DIR_TEMPLATE.format(transcriber=transcriber)
+    if os.path.exists(os.path.join(cube_dir, "meta.json")):
+        return CountCube.load(cube_dir)
+    print(f" -> '{cube_dir}' not found; building it from the token table (see 18_build_count_cube.py)...")
+    builder = load_script("18_build_count_cube")
+    cube, _ = builder.build_count_cube(builder.TOKEN_TABLE_FILE, transcriber)
+    builder.add_attribute_and_dictionary_kinds(cube)
+    cube.save(cube_dir)
+    return cube
+
+def main(argv=None):
+    import numpy as np
+    parser = argparse.ArgumentParser(description="Cluster folios on TF-IDF vectors and score agreement with $L, DIALECT_MAP and $H.")
+    parser.add_argument("--transcriber", default=TRANSCRIBER)
+    parser.add_argument("--features", default=",".join(FEATURE_BLOCKS),
+                        help=f"Comma-separated feature blocks from: {', '.join(FEATURE_BLOCKS)}.")
+    parser.add_argument("--min-tokens", type=int, default=MIN_FOLIO_TOKENS)
+    args = parser.parse_args(argv)
+    names = [name.strip() for name in args.features.split(",") if name.strip()]
+    unknown = [name for name in names if name not in FEATURE_BLOCKS]
+    if unknown or not names:
+        print(f"ERROR: Unknown feature block(s) {unknown}. Available: {', '.join(FEATURE_BLOCKS)}")
+        return
+
+    start_time = time.perf_counter()
+    try:
+        with stage("load"):
+            cube = load_or_build_cube(args.transcriber)
+    except FileNotFoundError:
+        print("ERROR: Token table not found. Please run 17_build_token_table.py first.")
+        return
+    tokenizer = GlyphTokenizer(GLYPH_INVENTORY)
+
+    with stage("vectorize") as vectorize_stage:
+        folio_tokens = np.asarray(cube.slice("word")).sum(axis=1)
+        rows = np.nonzero(folio_tokens >= args.min_tokens)[0]
+        folios = [cube.folios[i] for i in rows]
+        blocks = feature_blocks(cube, rows, names, tokenizer)
+        vectors = folio_vectors(blocks, FEATURE_BLOCKS)
+        similarity = (vectors @ vectors.T).toarray()  # One sparse product: full folio x folio cosine
+        vectorize_stage.add_tokens(int(folio_tokens[rows].sum()))
+    vector_time = time.perf_counter() - start_time
+    print(f"Transcriber '{args.transcriber}': {len(folios)} folios with >= {args.min_tokens} tokens, "
+          f"blocks " + ", ".join(f"{name} ({matrix.shape[1]:,})" for name, matrix in blocks.items())
+          + f"; similarity matrix in {vector_time:.2f}s.")
+
+    # Cluster once per reference granularity and score against every reference
+    with stage("cluster"):
+        references = {name: np.array([cube.attributes[name][i] for i in rows], dtype=object) for name in REFERENCES}
+        ks = sorted({len({v for v in labels if v is not None}) for labels in references.values()} - {0, 1})
+        clusterings = {}
+        for k in ks:
+            clusterings[f"hier_k{k}"] = hierarchical_clusters(similarity, k)
+            clusterings[f"spectral_k{k}"] = spectral_clusters(similarity, k)
+
+    results = []
+    for reference, labels in references.items():
+        known = np.array([v is not None for v in labels])
+        if known.sum() < 2:
+            continue
+        k = len(set(labels[known]))
+        for method in ("hier", "spectral"):
+            name = f"{method}_k{k}"
+            if name not in clusterings:
+                continue
+            predicted = clusterings[name][known]
+            results.append({"reference": reference, "clustering": name, "folios": int(known.sum()),
+                            "ari": round(adjusted_rand_index(labels[known].astype(str), predicted), 4),
+                            "nmi": round(normalized_mutual_info(labels[known].astype(str), predicted), 4)})
+    elapsed = time.perf_counter() - start_time
+
+    print("\n--- Agreement of unsupervised folio clusters with the reference splits ---")
+    print(f"{'Reference':<10}{'Clustering':<14}{'Folios':>7}{'ARI':>8}{'NMI':>8}")
+    for row in results:
+        print(f"{row['reference']:<10}{row['clustering']:<14}{row['folios']:>7}{row['ari']:>8.3f}{row['nmi']:>8.3f}")
+    if "hier_k2" in clusterings:
+        language = references["language"]
+        known = np.array([v is not None for v in language])
+        for method in ("hier_k2", "spectral_k2"):
+            table = contingency(language[known].astype(str), clusterings[method][known])
+            groups = sorted(set(language[known]))
+            print(f"\n{method} vs $L:  " + "   ".join(f"{g}: " + "/".join(str(x) for x in table[i]) for i, g in enumerate(groups)))
+
+    with open(OUTPUT_CLUSTERS_FILE, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["folio", "tokens"] + REFERENCES + list(clusterings))
+        for j, folio in enumerate(folios):
+            writer.writerow([folio, int(folio_tokens[rows[j]])] + [references[r][j] or "" for r in REFERENCES]
+                            + [int(labels[j]) for labels in clusterings.values()])
+    with open(OUTPUT_AGREEMENT_FILE, "w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=["reference", "clustering", "folios", "ari", "nmi"])
+        writer.writeheader()
+        writer.writerows(results)
+    np.save(OUTPUT_SIMILARITY_FILE, similarity.astype(np.float32))
+    print(f"\n✅ Done in {elapsed:.2f}s.")
+    print(f"💾 Saved cluster labels to '{OUTPUT_CLUSTERS_FILE}', agreement to '{OUTPUT_AGREEMENT_FILE}' "
+          f"and the similarity matrix to '{OUTPUT_SIMILARITY_FILE}' (rows in '{OUTPUT_CLUSTERS_FILE}' order).")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,413 @@
+import argparse
+import contextlib
+import csv
+import io
+import itertools
+import json
+import os
+import re
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from count_cube import CountCube, CORPUS_CUBE_DIR, group_columns
+from script_loader import load_script
+from instrumentation import stage
+
+# --- CONFIGURATION ---
+PREFIX_CORPUS_FILE = "voynich_super_clean_with_pages.txt"   # 5's corpus (0_create_segmented_corpus.py)
+ROOTS_FILE = "roots.txt"                    # Root dictionary of 3 and 5
+PREFIXES_FILE = "prefixes.txt"
+OUTPUT_STABILITY_FILE = "sensitivity_stability.csv"
+OUTPUT_CONFIGS_FILE = "sensitivity_configs.csv"
+OUTPUT_REPORT_FILE = "sensitivity_report.txt"
+ROBUST_SUPPORT = 0.9                        # A finding is robust if it holds in >= 90% of configurations
+DICTIONARY_DROPOUT = 0.1                    # 'dropN' variants remove 10% of the roots at random
+SEED = 1409
+
+# Every combination of these values is evaluated. 'baseline' is what the
+# scripts use today; override the grid with --grid grid.json.
+SWEEP_GRID = {
+    "section_shift": [-2, -1, 0, 1, 2],     # Folios added to every interior SECTION_MAP boundary (02a)
+    "lift_cutoff": [1.25, 1.5, 2.0],        # 'lift_score > 1.5' of 5 (also 02a lift and 3's A/B ratio)
+    "min_total": [5, 10, 20],               # 02a's 'total_freq < 10' filter
+    "dictionary": ["base", "drop1", "drop2", "drop3"],  # Root dictionary variants
+    "context_window": [1, 2, 3, 4, 5],      # 07b CONTEXT_WINDOW
+    "min_freq": [1, 2, 3],                  # 07b MIN_FREQ
+}
+BASELINE = {"section_shift": 0, "lift_cutoff": 1.5, "min_total": 10, "dictionary": "base",
+            "context_window": 3, "min_freq": 2}
+
+# ==============================================================================
+#    SHARED ARRAYS: everything a configuration needs, computed once
+# ==============================================================================
+# Each analysis keeps its own script's corpus, tokenization and root parse.
+# The counts come from the corpus cube (18_build_count_cube.py), whose rows
+# are the scripts' own folios:
+#   - 02a: folio-number x root counts of the 'formatted' rows
+#   - 5:   prefix-context root frequencies of all 'segmented' rows
+#   - 3:   per-1,000 frequencies of its KEY_CONCEPTS in the dialect A/B rows
+#   - 07b: top-5 context words per target and window (07b's collect_context)
+# one set per dictionary variant or window size. Findings are hashable
+# tuples, e.g. ("lift", "Herbal", "cho") or ("context", "qoky", "after",
+# "chedy"); stability = share of configurations in which a finding appears.
+# Before sweeping, the baseline configuration is checked against the same
+# findings computed by the scripts' own functions.
+
+def longest_substring_codes(words, morphemes):
+    """word index -> index of the longest morpheme it contains (-1 = none); equal lengths keep list order, as in 02a/3/5."""
+    import numpy as np
+    ordered = sorted(range(len(morphemes)), key=lambda i: len(morphemes[i]), reverse=True)
+    codes = np.full(len(words), -1, dtype=np.int64)
+    for w, word in enumerate(words):
+        for i in ordered:
+            if morphemes[i] in word:
+                codes[w] = i
+                break
+    return codes
+
+def dictionary_variants(roots, names, seed=SEED, dropout=DICTIONARY_DROPOUT):
+    """{variant: root list in dictionary order}: 'base' plus seeded random dropouts."""
+    import numpy as np
+    roots = list(dict.fromkeys(roots))
+    variants = {}
+    for name in names:
+        if name == "base":
+            variants[name] = roots
+            continue
+        index = int(name[len("drop"):]) if name.startswith("drop") and name[4:].isdigit() else None
+        if index is None:
+            raise ValueError(f"Unknown dictionary variant '{name}' (use 'base' or 'dropN').")
+        rng = np.random.default_rng(seed + index)
+        keep = rng.random(len(roots)) >= dropout
+        variants[name] = [r for r, k in zip(roots, keep) if k]
+    return variants
+
+def folio_number(folio):
+    """First number of a folio tag, as 02a's get_section_from_folio reads it (-1 = none)."""
+    match = re.search(r'(\d+)', folio)
+    return int(match.group(1)) if match else -1
+
+class SweepData:
+    def __init__(self, cube, inputs, grid):
+        import numpy as np
+        self.section_map = inputs["section_map"]
+        self.prefixes = inputs["prefixes"]
+
+        # 02a: its folio segments x word counts (sections are ranges of folio numbers)
+        vocabulary = cube.kinds["word"]
+        formatted = cube.folio_mask(corpus="formatted")
+        word_matrix = np.asarray(cube.slice("word", corpus="formatted"))
+        self.folio_numbers = np.array([folio_number(f) for f, keep in zip(cube.folios, formatted) if keep], dtype=np.int64)
+        self.folio_words = word_matrix.sum(axis=1).astype(np.float64)
+
+        # 5 and 3: word totals of 0's folios, all of them (5) and by dialect (3)
+        prefix_totals = np.asarray(cube.slice("word", corpus="segmented")).sum(axis=0).astype(np.float64)
+        dialect_totals = {d: np.asarray(cube.slice("word", corpus="segmented", dialect=d)).sum(axis=0).astype(np.float64)
+                          for d in ("A", "B")}
+        prefix_masks = {p: np.array([w.startswith(p) for w in vocabulary]) for p in self.prefixes}
+
+        # Per dictionary variant: 02a lift counts, 5's prefix lifts, 3's dialect frequency ratios
+        self.lift = {}
+        self.prefix_lift = {}
+        self.dialect_ratio = {}
+        lift_variants = dictionary_variants(inputs["lift_roots"], grid["dictionary"])
+        dict_variants = dictionary_variants(inputs["dict_roots"], grid["dictionary"])
+        for variant in grid["dictionary"]:
+            names = lift_variants[variant]
+            codes = longest_substring_codes(vocabulary, names)
+            self.lift[variant] = (names, group_columns(word_matrix, codes, len(names)).astype(np.float64))
+
+            names = dict_variants[variant]
+            codes = longest_substring_codes(vocabulary, names)
+            has_root = codes >= 0
+            baseline = np.bincount(codes[has_root], weights=prefix_totals[has_root], minlength=len(names))
+            baseline_freq = baseline / max(baseline.sum(), 1)
+            lifts = {}
+            for prefix, mask in prefix_masks.items():
+                in_context = has_root & mask
+                context = np.bincount(codes[in_context], weights=prefix_totals[in_context], minlength=len(names))
+                if context.sum() == 0:
+                    continue
+                with np.errstate(divide="ignore", invalid="ignore"):
+                    lifts[prefix] = np.nan_to_num((context / context.sum()) / baseline_freq)
+            self.prefix_lift[variant] = (names, lifts)
+
+            # 3 reports only its key concepts
+            freq = {}
+            for dialect, totals in dialect_totals.items():
+                counts = np.bincount(codes[has_root], weights=totals[has_root], minlength=len(names))
+                freq[dialect] = (counts / max(counts.sum(), 1)) * 1000
+            concepts = [c for c in inputs["key_concepts"] if c in names]
+            columns = [names.index(c) for c in concepts]
+            freq_a, freq_b = freq["A"][columns], freq["B"][columns]
+            with np.errstate(divide="ignore", invalid="ignore"):
+                both = (freq_a > 0) & (freq_b > 0)
+                self.dialect_ratio[variant] = (concepts, np.where(both, freq_a / freq_b, np.nan),
+                                               np.where(both, freq_b / freq_a, np.nan))
+
+        # 07b: top-5 context words per target, side and window, with their counts
+        self.context = {}
+        for window in range(1, max(grid["context_window"]) + 1):
+            context_data = inputs["collect_context"](inputs["context_lines"], {}, window)
+            self.context[window] = [(target, side, word, count)
+                                    for target in inputs["targets"] if target in context_data
+                                    for side in ("before", "after")
+                                    for word, count in context_data[target][side].most_common(5)]
+
+def section_codes(folio_numbers, section_map, shift):
+    """Folio row -> section index (-1 = Unknown) with interior boundaries moved by 'shift' folios."""
+    import numpy as np
+    names = list(section_map)
+    codes = np.full(len(folio_numbers), -1, dtype=np.int64)
+    for i, name in enumerate(names):
+        start, end = section_map[name]
+        start = start + shift if i > 0 else start
+        end = end + shift if i < len(names) - 1 else end
+        codes[(folio_numbers >= start) & (folio_numbers <= end)] = i
+    return names, codes
+
+def evaluate(config, data):
+    """All findings of one configuration, as a set of tuples."""
+    import numpy as np
+    findings = set()
+    cutoff = config["lift_cutoff"]
+
+    # 02a: section lift of dictionary roots, per-word probabilities
+    names, folio_roots = data.lift[config["dictionary"]]
+    sections, codes = section_codes(data.folio_numbers, data.section_map, config["section_shift"])
+    one_hot = np.zeros((len(sections), len(codes)))
+    keep = codes >= 0
+    one_hot[codes[keep], np.nonzero(keep)[0]] = 1.0
+    counts = one_hot @ folio_roots
+    section_words = one_hot @ data.folio_words
+    root_totals = counts.sum(axis=0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        lift = (counts / section_words[:, None]) / (root_totals / section_words.sum())
+    lift[:, root_totals < config["min_total"]] = 0
+    for s, r in zip(*np.nonzero(np.nan_to_num(lift) > cutoff)):
+        findings.add(("lift", sections[s], names[r]))
+
+    # 5: prefix -> root associations
+    names, lifts = data.prefix_lift[config["dictionary"]]
+    for prefix, values in lifts.items():
+        for r in np.nonzero(values > cutoff)[0]:
+            findings.add(("prefix", prefix, names[r]))
+
+    # 3: key concepts over-represented in one dialect (freq A / freq B beyond the cutoff either way)
+    names, a_over_b, b_over_a = data.dialect_ratio[config["dictionary"]]
+    for r in np.nonzero(np.nan_to_num(a_over_b) > cutoff)[0]:
+        findings.add(("dialect", "A>B", names[r]))
+    for r in np.nonzero(np.nan_to_num(b_over_a) > cutoff)[0]:
+        findings.add(("dialect", "B>A", names[r]))
+
+    # 07b: top-5 context words per target with count >= MIN_FREQ
+    for target, side, word, count in data.context[config["context_window"]]:
+        if count >= config["min_freq"]:
+            findings.add(("context", target, side, word))
+    return findings
+
+# --- WORKERS ---
+
+_worker_data = None
+
+def init_worker(data):
+    global _worker_data
+    _worker_data = data
+
+def evaluate_chunk(configs):
+    """Evaluates a list of configurations; returns (support Counter, per-config summaries)."""
+    support = Counter()
+    summaries = []
+    for config in configs:
+        findings = evaluate(config, _worker_data)
+        support.update(findings)
+        per_analysis = Counter(f[0] for f in findings)
+        summaries.append({**config, **{f"n_{a}": per_analysis.get(a, 0) for a in ("lift", "prefix", "dialect", "context")}})
+    return support, summaries
+
+def run_sweep(data, grid, workers):
+    names = list(grid)
+    configs = [dict(zip(names, values)) for values in itertools.product(*(grid[n] for n in names))]
+    n_chunks = max(1, min(len(configs), workers * 4))
+    chunks = [configs[i::n_chunks] for i in range(n_chunks)]
+    support, summaries = Counter(), []
+    if workers <= 1:
+        init_worker(data)
+        results = map(evaluate_chunk, chunks)
+    else:
+        executor = ProcessPoolExecutor(max_workers=workers, initializer=init_worker, initargs=(data,))
+        results = executor.map(evaluate_chunk, chunks)
+    for chunk_support, chunk_summaries in results:
+        support.update(chunk_support)
+        summaries.extend(chunk_summaries)
+    if workers > 1:
+        executor.shutdown()
+    return configs, support, summaries
+
+# --- MAIN ---
+
+def load_inputs():
+    """Every analysis's own corpus, dictionary and parameters, read the way its script reads them."""
+    lift_module = load_script("02a_thematic_analysis_liftscore")
+    dialect_module = load_script("3_quantify_dialects")
+    prefix_module = load_script("5_analyze_prefix_function")
+    context_module = load_script("07b_analyze_compound_root_context")
+    required = [lift_module.VOYNICH_TEXT_FILE, *dialect_module.DIALECT_CORPUS_FILES.values(), PREFIX_CORPUS_FILE,
+                context_module.VOYNICH_FILE, ROOTS_FILE, PREFIXES_FILE]
+    for path in required:
+        if not os.path.exists(path):
+            raise FileNotFoundError(path)   # The scripts' loaders would exit instead
+    with open(lift_module.VOYNICH_TEXT_FILE, "r", encoding="utf-8") as f:
+        lift_lines = f.readlines()
+    with open(context_module.VOYNICH_FILE, "r", encoding="utf-8") as f:
+        context_lines = f.readlines()
+    return {
+        "section_map": dict(lift_module.SECTION_MAP),
+        "lift_lines": lift_lines,
+        "lift_roots": list(lift_module.CONCEPTUAL_DICTIONARY),
+        "dict_roots": prefix_module.load_roots(ROOTS_FILE),
+        "prefixes": prefix_module.load_prefixes(PREFIXES_FILE),
+        "prefix_words": prefix_module.get_all_words(PREFIX_CORPUS_FILE),
+        "dialect_words": {d: dialect_module.get_corpus_text(path).split()
+                          for d, path in dialect_module.DIALECT_CORPUS_FILES.items()},
+        "key_concepts": list(dialect_module.KEY_CONCEPTS),
+        "context_lines": context_lines,
+        "targets": list(context_module.TARGET_ROOTS),
+        "collect_context": context_module.collect_context,
+    }
+
+def reference_findings(inputs):
+    """The baseline findings as 02a, 3, 5 and 07b's own functions compute them."""
+    lift_module = load_script("02a_thematic_analysis_liftscore")
+    dialect_module = load_script("3_quantify_dialects")
+    prefix_module = load_script("5_analyze_prefix_function")
+    context_module = load_script("07b_analyze_compound_root_context")
+    findings = set()
+
+    counts = lift_module.count_section_roots(inputs["lift_lines"])
+    for root, total_freq in counts[3].items():
+        if total_freq < BASELINE["min_total"]:
+            continue
+        for section, lift in lift_module.section_lifts(root, counts).items():
+            if lift > BASELINE["lift_cutoff"]:
+                findings.add(("lift", section, root))
+
+    with contextlib.redirect_stdout(io.StringIO()):    # 5 prints its progress
+        associations = prefix_module.analyze_prefix_associations(inputs["prefix_words"], inputs["dict_roots"],
+                                                                  inputs["prefixes"])
+    findings.update(("prefix", prefix, row["root"]) for prefix, rows in associations.items() for row in rows)
+
+    sorted_roots = sorted(inputs["dict_roots"], key=len, reverse=True)
+    freq = {}
+    for dialect, words in inputs["dialect_words"].items():
+        sequence = dialect_module.get_root_sequence(" ".join(words), sorted_roots)
+        root_counts = Counter(sequence)
+        freq[dialect] = {c: (root_counts.get(c, 0) / len(sequence)) * 1000 if sequence else 0
+                         for c in dialect_module.KEY_CONCEPTS}
+    for concept in dialect_module.KEY_CONCEPTS:
+        freq_a, freq_b = freq["A"][concept], freq["B"][concept]
+        if freq_a > 0 and freq_b > 0:
+            if freq_a / freq_b > BASELINE["lift_cutoff"]:
+                findings.add(("dialect", "A>B", concept))
+            if freq_b / freq_a > BASELINE["lift_cutoff"]:
+                findings.add(("dialect", "B>A", concept))
+
+    context_data = context_module.collect_context(inputs["context_lines"], {}, context_module.CONTEXT_WINDOW)
+    for target in context_module.TARGET_ROOTS:
+        if context_data[target]['count'] == 0:
+            continue
+        for side in ("before", "after"):
+            findings.update(("context", target, side, word) for word, count in context_data[target][side].most_common(5)
+                            if count >= context_module.MIN_FREQ)
+    return findings
+
+def write_report(path, configs, support, baseline_findings, grid):
+    n = len(configs)
+    by_analysis = {}
+    for finding in baseline_findings:
+        by_analysis.setdefault(finding[0], []).append(finding)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("=" * 80 + "\n")
+        f.write("       SENSITIVITY SWEEP - STABILITY OF THE BASELINE FINDINGS\n")
+        f.write("=" * 80 + "\n")
+        f.write(f"{n} configurations: " + ", ".join(f"{k}={v}" for k, v in grid.items()) + "\n")
+        f.write("Baseline: " + ", ".join(f"{k}={v}" for k, v in BASELINE.items()) + "\n")
+        f.write(f"Robust = present in >= {ROBUST_SUPPORT:.0%} of configurations.\n")
+        for analysis in ("lift", "prefix", "dialect", "context"):
+            findings = sorted(by_analysis.get(analysis, []), key=lambda x: (-support[x], x))
+            robust = [x for x in findings if support[x] / n >= ROBUST_SUPPORT]
+            f.write(f"\n--- {analysis}: {len(robust)} of {len(findings)} baseline findings are robust ---\n")
+            for finding in findings:
+                mark = "ROBUST " if support[finding] / n >= ROBUST_SUPPORT else "fragile"
+                f.write(f"  {mark} {support[finding] / n:6.1%}  " + " / ".join(finding[1:]) + "\n")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Evaluate lift/prefix/dialect/context findings over a parameter grid.")
+    parser.add_argument("--grid", help="JSON file overriding SWEEP_GRID entries.")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args(argv)
+
+    grid = dict(SWEEP_GRID)
+    if args.grid:
+        with open(args.grid, "r", encoding="utf-8") as f:
+            grid.update(json.load(f))
+    for name, value in BASELINE.items():
+        if value not in grid[name]:
+            grid[name] = sorted(set(grid[name]) | {value}, key=str)
+
+    print("Step 1: Precomputing shared count arrays...")
+    start_time = time.perf_counter()
+    try:
+        with stage("load"):
+            inputs = load_inputs()
+    except FileNotFoundError as e:
+        print(f"ERROR: '{e.filename or e.args[0]}' not found. Run 0_..., 01_... and 1_segment_by_dialect.py first.")
+        return
+    try:
+        cube = CountCube.load(CORPUS_CUBE_DIR)
+    except FileNotFoundError:
+        print(f"ERROR: Corpus cube '{CORPUS_CUBE_DIR}' not found. Please run 18_build_count_cube.py first.")
+        return
+    with stage("precompute"):
+        data = SweepData(cube, inputs, grid)
+    setup_time = time.perf_counter() - start_time
+
+    # The baseline must be what 02a, 3, 5 and 07b report today, or stability means nothing
+    baseline_findings = evaluate(BASELINE, data)
+    reference = reference_findings(inputs)
+    if baseline_findings != reference:
+        print("ERROR: The baseline configuration does not reproduce the scripts' findings:")
+        for finding in sorted(reference - baseline_findings)[:10]:
+            print("  missing:    " + " / ".join(finding))
+        for finding in sorted(baseline_findings - reference)[:10]:
+            print("  unexpected: " + " / ".join(finding))
+        return
+    print(f" -> Baseline reproduces the {len(reference)} findings of 02a, 3, 5 and 07b.")
+
+    print(f"Step 2: Evaluating every configuration ({args.workers} workers)...")
+    sweep_start = time.perf_counter()
+    with stage("sweep") as sweep_stage:
+        configs, support, summaries = run_sweep(data, grid, args.workers)
+        sweep_stage.add_tokens(len(configs))
+    sweep_time = time.perf_counter() - sweep_start
+
+    n = len(configs)
+    with open(OUTPUT_STABILITY_FILE, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["Analysis", "Finding", "Support", "In_Baseline"])
+        for finding, count in sorted(support.items(), key=lambda x: (x[0][0], -x[1], x[0])):
+            writer.writerow([finding[0], " / ".join(finding[1:]), round(count / n, 4), finding in baseline_findings])
+    with open(OUTPUT_CONFIGS_FILE, "w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=list(summaries[0]))
+        writer.writeheader()
+        writer.writerows(summaries)
+    write_report(OUTPUT_REPORT_FILE, configs, support, baseline_findings, grid)
+
+    robust = sum(1 for x in baseline_findings if support[x] / n >= ROBUST_SUPPORT)
+    print(f"✅ {n:,} configurations in {sweep_time:.2f}s ({sweep_time / n * 1000:.2f} ms each) "
+          f"after {setup_time:.2f}s of shared precomputation.")
+    print(f" -> {robust} of {len(baseline_findings)} baseline findings hold in >= {ROBUST_SUPPORT:.0%} of configurations.")
+    print(f"💾 Saved '{OUTPUT_REPORT_FILE}', '{OUTPUT_STABILITY_FILE}' and '{OUTPUT_CONFIGS_FILE}'")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+import argparse
+import csv
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from count_cube import CountCube, CORPUS_CUBE_DIR
+from script_loader import load_script
+from instrumentation import stage
+
+# --- CONFIGURATION ---
+KIND = "dict_root"                          # roots.txt roots, longest substring (as in 3)
+COMBINED_GROUPS = {"et/yk (Root)": ["et", "yk"]}   # Summed columns, as plotted by 9
+N_BOOTSTRAP = 10000
+N_PERMUTATIONS = 10000
+CONFIDENCE = 0.95
+CHUNK_SIZE = 1000                           # Resamples per vectorized batch
+SEED = 1409
+OUTPUT_FILE = "dialect_fingerprint_bootstrap.csv"
+
+# ==============================================================================
+#    FOLIO BOOTSTRAP: uncertainty of per-1,000-root frequencies by dialect
+# ==============================================================================
+# 3 pools every root of a dialect, so a few long folios dominate its
+# frequencies. Here the folio is the sampling unit: the dialect A/B rows of
+# the corpus cube are the folios of 3's corpus_A/B.txt in 3's tokenization
+# (18 checks the cube against dialect_quantification.csv), so the observed
+# frequencies are exactly 3's. A bootstrap replicate
+# draws each dialect's folios with replacement, i.e. a multinomial weight per
+# folio, and the replicate's root counts are weights @ (folio x root counts).
+# A batch of replicates is one matrix product. The permutation test shuffles
+# the A/B labels over folios the same way: a batch of label masks @ counts.
+# Each batch gets its own seed from SeedSequence.spawn, so results do not
+# depend on the number of workers.
+
+def per_thousand(counts, n_roots):
+    """Per-1,000 frequencies; totals come from the first n_roots columns (later ones are combined groups)."""
+    import numpy as np
+    totals = counts[..., :n_roots].sum(axis=-1, keepdims=True)
+    return counts / np.where(totals > 0, totals, 1) * 1000
+
+def bootstrap_batch(task):
+    """Per-1,000 frequencies of n resamples of each dialect's folios: returns (freq_A, freq_B)."""
+    import numpy as np
+    seed, n, counts_a, counts_b, n_roots = task
+    rng = np.random.default_rng(seed)
+    weights_a = rng.multinomial(len(counts_a), np.full(len(counts_a), 1 / len(counts_a)), size=n)
+    weights_b = rng.multinomial(len(counts_b), np.full(len(counts_b), 1 / len(counts_b)), size=n)
+    return per_thousand(weights_a @ counts_a, n_roots), per_thousand(weights_b @ counts_b, n_roots)
+
+def permutation_batch(task):
+    """A-minus-B per-1,000 differences for n random relabellings of the folios."""
+    import numpy as np
+    seed, n, counts, n_a, n_roots = task
+    rng = np.random.default_rng(seed)
+    order = rng.random((n, len(counts))).argsort(axis=1)
+    mask_a = (order < n_a).astype(np.float64)  # First n_a positions of a random permutation
+    total = counts.sum(axis=0)
+    totals_a = mask_a @ counts
+    return per_thousand(totals_a, n_roots) - per_thousand(total - totals_a, n_roots)
+
+def run_batches(function, tasks, workers):
+    if workers <= 1:
+        return [function(task) for task in tasks]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(function, tasks))
+
+def batch_sizes(total, chunk_size):
+    return [min(chunk_size, total - start) for start in range(0, total, chunk_size)]
+
+def benjamini_hochberg(p_values):
+    import numpy as np
+    p = np.asarray(p_values, dtype=np.float64)
+    order = np.argsort(p)
+    ranked = p[order] * len(p) / np.arange(1, len(p) + 1)
+    q = np.minimum.accumulate(ranked[::-1])[::-1]
+    out = np.empty_like(q)
+    out[order] = np.minimum(q, 1.0)
+    return out
+
+def fingerprint_bootstrap(counts_a, counts_b, n_roots, n_bootstrap, n_permutations, workers, seed=SEED):
+    """Observed frequencies, bootstrap percentile intervals and permutation p-values for every column."""
+    import numpy as np
+    seeds = iter(np.random.SeedSequence(seed).spawn(len(batch_sizes(n_bootstrap, CHUNK_SIZE))
+                                                    + len(batch_sizes(n_permutations, CHUNK_SIZE))))
+    boot_tasks = [(next(seeds), n, counts_a, counts_b, n_roots) for n in batch_sizes(n_bootstrap, CHUNK_SIZE)]
+    counts = np.vstack([counts_a, counts_b])
+    perm_tasks = [(next(seeds), n, counts, len(counts_a), n_roots) for n in batch_sizes(n_permutations, CHUNK_SIZE)]
+
+    boot = run_batches(bootstrap_batch, boot_tasks, workers)
+    freq_a = np.vstack([a for a, _ in boot])
+    freq_b = np.vstack([b for _, b in boot])
+    null = np.vstack(run_batches(permutation_batch, perm_tasks, workers))
+
+    observed_a = per_thousand(counts_a.sum(axis=0), n_roots)
+    observed_b = per_thousand(counts_b.sum(axis=0), n_roots)
+    observed_diff = observed_a - observed_b
+    alpha = (1 - CONFIDENCE) / 2
+    quantiles = lambda x: np.quantile(x, [alpha, 1 - alpha], axis=0)
+    extreme = (np.abs(null) >= np.abs(observed_diff) - 1e-12).sum(axis=0)
+    return {
+        "freq_A": observed_a, "ci_A": quantiles(freq_a),
+        "freq_B": observed_b, "ci_B": quantiles(freq_b),
+        "diff": observed_diff, "ci_diff": quantiles(freq_a - freq_b),
+        "p_perm": (extreme + 1) / (len(null) + 1),
+    }
+
+def main(argv=None):
+    import numpy as np
+    parser = argparse.ArgumentParser(description="Folio-level bootstrap and permutation test of the dialect fingerprint.")
+    parser.add_argument("--bootstrap", type=int, default=N_BOOTSTRAP)
+    parser.add_argument("--permutations", type=int, default=N_PERMUTATIONS)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args(argv)
+
+    try:
+        with stage("load"):
+            cube = CountCube.load(CORPUS_CUBE_DIR)
+    except FileNotFoundError:
+        print(f"ERROR: Corpus cube '{CORPUS_CUBE_DIR}' not found. Please run 18_build_count_cube.py first.")
+        return
+    if KIND not in cube.kinds:
+        print(f"ERROR: The corpus cube has no '{KIND}' kind ('roots.txt' was missing when it was built).")
+        return
+
+    key_concepts = load_script("3_quantify_dialects").KEY_CONCEPTS
+    roots = cube.kinds[KIND]
+    root_columns = len(roots)
+    matrix = np.asarray(cube.slice(KIND), dtype=np.float64)
+    # Combined groups are extra columns holding the sum of their members
+    labels = list(roots) + list(COMBINED_GROUPS)
+    for members in COMBINED_GROUPS.values():
+        columns = cube.feature_columns(KIND, members)
+        matrix = np.column_stack([matrix, matrix[:, columns[columns >= 0]].sum(axis=1)])
+    counts_a = matrix[cube.folio_mask(corpus="segmented", dialect="A")]
+    counts_b = matrix[cube.folio_mask(corpus="segmented", dialect="B")]
+    print(f"Dialect A: {len(counts_a)} folios, {int(counts_a[:, :root_columns].sum()):,} roots; "
+          f"Dialect B: {len(counts_b)} folios, {int(counts_b[:, :root_columns].sum()):,} roots; {root_columns} roots in '{KIND}'.")
+
+    start_time = time.perf_counter()
+    with stage("bootstrap") as bootstrap_stage:
+        result = fingerprint_bootstrap(counts_a, counts_b, root_columns, args.bootstrap, args.permutations, args.workers)
+        bootstrap_stage.add_tokens(args.bootstrap + args.permutations)
+    elapsed = time.perf_counter() - start_time
+    q_values = benjamini_hochberg(result["p_perm"][:root_columns])
+
+    rows = []
+    for i, label in enumerate(labels):
+        rows.append({
+            "concept": label,
+            "freq_A_per_1000": round(float(result["freq_A"][i]), 2),
+            "ci_A_low": round(float(result["ci_A"][0, i]), 2), "ci_A_high": round(float(result["ci_A"][1, i]), 2),
+            "freq_B_per_1000": round(float(result["freq_B"][i]), 2),
+            "ci_B_low": round(float(result["ci_B"][0, i]), 2), "ci_B_high": round(float(result["ci_B"][1, i]), 2),
+            "diff_A_minus_B": round(float(result["diff"][i]), 2),
+            "ci_diff_low": round(float(result["ci_diff"][0, i]), 2), "ci_diff_high": round(float(result["ci_diff"][1, i]), 2),
+            "p_permutation": round(float(result["p_perm"][i]), 5),
+            "q_bh": round(float(q_values[i]), 5) if i < root_columns else "",
+            "key_concept": label in key_concepts,
+        })
+    with open(OUTPUT_FILE, "w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+        writer.writeheader()
+        writer.writerows(rows)
+
+    print(f"\n--- Key concepts: per 1,000 roots, {CONFIDENCE:.0%} folio-bootstrap intervals ---")
+    print(f"{'Concept':<14}{'Dialect A':>24}{'Dialect B':>24}{'A - B':>10}{'p':>9}")
+    for row in rows:
+        if row["key_concept"] or row["concept"] in COMBINED_GROUPS:
+            print(f"{row['concept']:<14}"
+                  f"{row['freq_A_per_1000']:>8.2f} [{row['ci_A_low']:6.2f},{row['ci_A_high']:7.2f}]"
+                  f"{row['freq_B_per_1000']:>8.2f} [{row['ci_B_low']:6.2f},{row['ci_B_high']:7.2f}]"
+                  f"{row['diff_A_minus_B']:>10.2f}{row['p_permutation']:>9.4f}")
+    significant = sum(1 for row in rows[:root_columns] if row["q_bh"] != "" and row["q_bh"] < 0.05)
+    print(f"\n✅ {args.bootstrap:,} bootstrap resamples and {args.permutations:,} permutations in {elapsed:.2f}s "
+          f"({args.workers} workers); {significant} of {root_columns} roots differ at FDR 5%.")
+    print(f"💾 Saved fingerprint with intervals to '{OUTPUT_FILE}'")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+import argparse
+import os
+import time
+from chart_renderer import render_charts, report, FIGURE_CACHE_FILE
+from script_loader import load_script
+
+# --- CONFIGURATION ---
+# Plotting scripts that expose chart_jobs() (see chart_renderer.py)
+CHART_SCRIPTS = [
+    "02b_plot_thematic_heatmap",
+    "04_plot_zipf_comparative",
+    "08b_plot_process_signatures_summary",
+    "9_generate_appendix_chart",
+]
+
+# ==============================================================================
+#        RENDER FIGURES: every chart of the pipeline in one headless batch
+# ==============================================================================
+# Collects the chart jobs of CHART_SCRIPTS and renders only those whose input
+# data, style or plotting code changed since the last run (figure_cache.json),
+# in parallel worker processes on the Agg backend.
+
+def collect_jobs(svg=False, dpi=None, only=None):
+    """Chart jobs of every script; svg adds an .svg output next to each .png, dpi overrides the style."""
+    jobs = []
+    for script in CHART_SCRIPTS:
+        for job in load_script(script).chart_jobs():
+            if only and job.name not in only:
+                continue
+            outputs = list(job.outputs)
+            if svg:
+                outputs += [os.path.splitext(path)[0] + ".svg" for path in outputs if path.lower().endswith(".png")]
+            style = dict(job.style, dpi=dpi) if dpi else job.style
+            jobs.append(job._replace(outputs=outputs, style=style))
+    return jobs
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render every pipeline chart, skipping the ones that are up to date.")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--force", action="store_true", help="Re-render even if the cache says a chart is fresh.")
+    parser.add_argument("--svg", action="store_true", help="Also write an SVG next to every PNG.")
+    parser.add_argument("--dpi", type=int, help="Override the DPI of every chart.")
+    parser.add_argument("--only", nargs="+", help="Render only these chart names.")
+    parser.add_argument("--cache", default=FIGURE_CACHE_FILE)
+    args = parser.parse_args(argv)
+
+    jobs = collect_jobs(args.svg, args.dpi, args.only)
+    print(f"Rendering {len(jobs)} charts ({args.workers} workers)...")
+    start_time = time.perf_counter()
+    summary = render_charts(jobs, workers=args.workers, force=args.force, cache_file=args.cache)
+    report(summary)
+    print(f"\n✅ {len(summary['rendered'])} rendered, {len(summary['skipped'])} up to date, "
+          f"{len(summary['failed'])} failed in {time.perf_counter() - start_time:.2f}s.")
+
+if __name__ == "__main__":
+    main()
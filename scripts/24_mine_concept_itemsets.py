@@ -0,0 +1,180 @@
+import argparse
+import csv
+import re
+import time
+from concept_bitset import BitsetMatrix, apriori, popcount, BITSET_DIR_TEMPLATE
+from script_loader import load_script
+from token_table import read_tokens, TOKEN_TABLE_FILE
+from instrumentation import stage
+
+# --- CONFIGURATION ---
+TRANSCRIBER = "H"
+ITEM_KIND = "concept"          # "concept": 10b dictionary meanings (what 08a/09 match); "root": every parsed root
+ROW_UNIT = "clean_paragraph"   # Rows of 08a/09 and the translations; "paragraph" = IVTFF paragraphs (any transcriber)
+MIN_SUPPORT = 0.02             # Share of a section's paragraphs
+MIN_COUNT = 5                  # ... and never fewer paragraphs than this
+MIN_LIFT = 1.5                 # Co-occurrence over independence, as the lift cutoff of 5_...
+MAX_SIZE = 4
+TOP_CANDIDATES = 10            # Candidate signatures listed per section in the report
+OUTPUT_FILE = "concept_itemsets.csv"
+REPORT_FILE = "concept_itemsets_report.txt"
+
+# ==============================================================================
+#    CONCEPT ITEMSETS: data-driven process signatures from co-occurrence
+# ==============================================================================
+# PROCESS_SIGNATURES (08a) and BENCHMARK_SIGNATURES (09) are hand-written
+# concept combinations. Here every paragraph becomes the set of dictionary
+# concepts its words parse to (10b's parser, via the token table), stored as
+# packed bitsets (concept_bitset.py). Apriori then finds, per section, every
+# combination of up to MAX_SIZE concepts present together in at least
+# MIN_SUPPORT of the paragraphs and more often than independence predicts
+# (lift >= MIN_LIFT). Support counting is a popcount over ANDed bit rows, a
+# batch of candidates at a time. The hand-written 08a signatures are scored
+# on the same matrix for comparison.
+
+def paragraph_items(transcriber, kind, unit):
+    """(row ids, item sets, attributes) from the token table."""
+    translator = load_script("10b_translate_all_improved")
+    skipped_roots = set(translator.CONNECTORS) | set(translator.IGNORE_ROOTS)
+    table = read_tokens(columns=["folio", "paragraph", "clean_paragraph", "section", "language", "hand", "root"],
+                        filters=[("transcriber", "=", transcriber)]).to_pydict()
+    rows, item_sets, attributes = {}, [], {"section": [], "language": [], "hand": [], "folio": []}
+    for i, root in enumerate(table["root"]):
+        if unit == "clean_paragraph":
+            if table["clean_paragraph"][i] < 0:
+                continue
+            row_id = table["clean_paragraph"][i]
+        else:
+            row_id = f"{table['folio'][i]}.{table['paragraph'][i]}"
+        if row_id not in rows:
+            rows[row_id] = len(item_sets)
+            item_sets.append(set())
+            for name in attributes:
+                attributes[name].append(table[name][i])
+        if root is None or root in skipped_roots:
+            continue
+        if kind == "concept":
+            item = translator.CONCEPTUAL_DICTIONARY.get(root)
+        else:
+            item = root
+        if item:
+            item_sets[rows[row_id]].add(item)
+    return list(rows), item_sets, attributes
+
+def load_or_build_bitsets(transcriber, kind, unit, rebuild=False):
+    bitset_dir = BITSET_DIR_TEMPLATE.format(transcriber=transcriber, kind=kind)
+    if not rebuild:
+        try:
+            bitsets = BitsetMatrix.load(bitset_dir)
+            if bitsets.unit == unit:
+                return bitsets, bitset_dir, False
+        except (FileNotFoundError, ValueError):
+            pass
+    rows, item_sets, attributes = paragraph_items(transcriber, kind, unit)
+    if not rows:
+        raise ValueError(f"no '{unit}' rows for transcriber '{transcriber}'")
+    bitsets = BitsetMatrix.from_row_sets(rows, item_sets, attributes, transcriber=transcriber, kind=kind, unit=unit)
+    bitsets.save(bitset_dir)
+    return bitsets, bitset_dir, True
+
+def signature_support(bitsets, keywords, mask=None):
+    """
+    Count and lift of a 08a-style signature: every keyword group (regex
+    alternatives joined by '|') must match at least one concept of the
+    paragraph. Returns None if a group matches no concept at all.
+    """
+    import numpy as np
+    groups = []
+    for group in keywords:
+        ids = [i for i, item in enumerate(bitsets.items)
+               if any(re.search(keyword.lower(), item.lower()) for keyword in group.split("|"))]
+        if not ids:
+            return None
+        groups.append(np.bitwise_or.reduce(bitsets.bits[ids], axis=0))
+    n_rows = bitsets.n_rows(mask)
+    if n_rows == 0:
+        return None
+    all_groups = np.bitwise_and.reduce(groups, axis=0)
+    if mask is not None:
+        all_groups = all_groups & mask
+        groups = [group & mask for group in groups]
+    count = int(popcount(all_groups))
+    expected = np.prod([popcount(group) / n_rows for group in groups])
+    return count, count / expected / n_rows if expected > 0 else float("nan")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Mine co-occurring concept sets per section from packed paragraph bitsets.")
+    parser.add_argument("--kind", choices=["concept", "root"], default=ITEM_KIND)
+    parser.add_argument("--unit", choices=["clean_paragraph", "paragraph"], default=ROW_UNIT)
+    parser.add_argument("--min-support", type=float, default=MIN_SUPPORT)
+    parser.add_argument("--min-count", type=int, default=MIN_COUNT)
+    parser.add_argument("--min-lift", type=float, default=MIN_LIFT)
+    parser.add_argument("--max-size", type=int, default=MAX_SIZE)
+    parser.add_argument("--transcriber", default=TRANSCRIBER)
+    parser.add_argument("--rebuild", action="store_true", help="Rebuild the bitsets from the token table.")
+    args = parser.parse_args(argv)
+
+    print("Step 1: Loading paragraph bitsets...")
+    try:
+        with stage("bitsets"):
+            bitsets, bitset_dir, built = load_or_build_bitsets(args.transcriber, args.kind, args.unit, args.rebuild)
+    except FileNotFoundError:
+        print(f"ERROR: Token table '{TOKEN_TABLE_FILE}' not found. Please run 17_build_token_table.py first.")
+        return
+    except ValueError as e:
+        print(f"ERROR: {e}. Transcriber '{args.transcriber}' has no clean paragraphs; try --unit paragraph.")
+        return
+    print(f" -> {len(bitsets.rows):,} rows x {len(bitsets.items):,} {args.kind}s "
+          f"({bitsets.bits.nbytes / 1024:.0f} KB packed, {'built and saved to' if built else 'loaded from'} '{bitset_dir}/')")
+
+    print(f"Step 2: Mining sets of up to {args.max_size} {args.kind}s (support >= {args.min_support:.1%}, lift >= {args.min_lift})...")
+    sections = ["All"] + sorted(set(bitsets.attributes["section"]) - {None})
+    results = {}
+    start_time = time.perf_counter()
+    with stage("mine"):
+        for section in sections:
+            mask = None if section == "All" else bitsets.row_mask(section=section)
+            results[section] = (bitsets.n_rows(mask), apriori(
+                bitsets, min_support=args.min_support, min_count=args.min_count,
+                min_lift=args.min_lift, max_size=args.max_size, mask=mask))
+    elapsed = time.perf_counter() - start_time
+
+    with open(OUTPUT_FILE, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["Section", "Size", "Itemset", "Paragraphs", "Support", "Lift"])
+        for section, (_, itemsets) in results.items():
+            for items, count, support, lift in itemsets:
+                writer.writerow([section, len(items), " + ".join(items), count, round(support, 5), round(lift, 4)])
+
+    signatures = load_script("08a_find_process_signatures_v5").PROCESS_SIGNATURES if args.kind == "concept" else {}
+    with open(REPORT_FILE, "w", encoding="utf-8") as f:
+        f.write("=" * 80 + "\n")
+        f.write(f"  CONCEPT ITEMSETS: candidate signatures by section ({args.kind}, transcriber {args.transcriber})\n")
+        f.write("=" * 80 + "\n")
+        f.write(f"Support >= {args.min_support:.1%} of a section's rows (and >= {args.min_count}), "
+                f"lift >= {args.min_lift}, up to {args.max_size} items.\n")
+        for section, (n_rows, itemsets) in results.items():
+            f.write(f"\n--- {section}: {n_rows} rows, {len(itemsets)} itemsets ---\n")
+            for rank, (items, count, support, lift) in enumerate(itemsets[:TOP_CANDIDATES], 1):
+                f.write(f"  \"CANDIDATE {section.upper()} {rank}\": {list(items)},"
+                        f"  # {count} rows ({support:.1%}), lift {lift:.2f}\n")
+        if signatures:
+            f.write("\n--- Hand-written 08a signatures on the same rows (count / lift) ---\n")
+            f.write(f"{'Signature':<36}" + "".join(f"{s[:13]:>22}" for s in sections) + "\n")
+            for name, keywords in signatures.items():
+                cells = []
+                for section in sections:
+                    mask = None if section == "All" else bitsets.row_mask(section=section)
+                    score = signature_support(bitsets, keywords, mask)
+                    cells.append("no concept" if score is None else f"{score[0]} / {score[1]:.2f}")
+                f.write(f"{name[:35]:<36}" + "".join(f"{cell:>22}" for cell in cells) + "\n")
+
+    print(f"\n{'Section':<18}{'Rows':>7}{'Itemsets':>10}   Strongest set (lift)")
+    for section, (n_rows, itemsets) in results.items():
+        top = f"{' + '.join(itemsets[0][0])} ({itemsets[0][3]:.2f})" if itemsets else "-"
+        print(f"{section:<18}{n_rows:>7}{len(itemsets):>10}   {top}")
+    print(f"\n✅ Mined {len(sections)} partitions in {elapsed * 1000:.0f} ms.")
+    print(f"💾 Saved itemsets to '{OUTPUT_FILE}' and candidate signatures to '{REPORT_FILE}'")
+
+if __name__ == "__main__":
+    main()
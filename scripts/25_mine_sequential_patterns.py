@@ -0,0 +1,151 @@
+import argparse
+import csv
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from sequential_patterns import SequenceDatabase, prefixspan
+from script_loader import load_script
+from token_table import read_tokens, TOKEN_TABLE_FILE
+from instrumentation import stage
+
+# --- CONFIGURATION ---
+TRANSCRIBER = "H"
+SEQUENCE_KINDS = ["role", "root"]     # Token table columns mined as per-paragraph sequences
+MIN_SUPPORT = {"role": 0.05, "root": 0.01}   # Share of all paragraphs
+MIN_COUNT = 10
+MAX_GAP = 1                           # Tokens allowed between consecutive pattern elements (0 = contiguous, as 06)
+MIN_LENGTH = 2
+MAX_LENGTH = 5
+TOP_N = 10                            # Patterns printed per kind
+OUTPUT_TEMPLATE = "sequential_patterns_{kind}.csv"
+
+# ==============================================================================
+#    SEQUENTIAL PATTERNS: gapped role and root regularities by section/dialect
+# ==============================================================================
+# 06 counts contiguous role bigrams/trigrams and 4a only '[X] -> connector
+# -> [Y]'. Here every clean paragraph (voynich_ready_nlp.txt line) is the
+# sequence of its roles or roots from the token table, and PrefixSpan
+# (sequential_patterns.py) finds every ordered pattern of MIN_LENGTH to
+# MAX_LENGTH elements with at most MAX_GAP tokens between consecutive
+# elements, in at least MIN_SUPPORT of the paragraphs. Each pattern's
+# support is then broken down by section and dialect (1's DIALECT_MAP).
+# The first symbols are dealt out to worker processes, most frequent first.
+
+def load_sequences(transcriber, kind):
+    """(sequences, section per sequence, dialect per sequence) of the clean paragraphs."""
+    table = read_tokens(columns=["folio", "clean_paragraph", "section", kind],
+                        filters=[("transcriber", "=", transcriber)]).to_pydict()
+    dialect_map = load_script("1_segment_by_dialect").get_dialect_map()
+    dialect_of = {f"f{folio}": dialect for dialect, folios in dialect_map.items() for folio in folios}
+    sequences, sections, dialects = [], [], []
+    last = None
+    for folio, paragraph, section, symbol in zip(table["folio"], table["clean_paragraph"], table["section"], table[kind]):
+        if paragraph < 0:
+            continue
+        if paragraph != last:
+            last = paragraph
+            sequences.append([])
+            sections.append(section)
+            dialects.append(dialect_of.get(folio))
+        if symbol is not None:
+            sequences[-1].append(symbol)
+    return sequences, sections, dialects
+
+# --- WORKERS ---
+
+_worker_state = None
+
+def init_worker(state):
+    global _worker_state
+    _worker_state = state
+
+def mine_first_symbols(first_symbols):
+    """Patterns starting with the given symbols, with their support per group."""
+    import numpy as np
+    db, group_codes, n_groups, settings = _worker_state
+    found = []
+    for pattern, sequences in prefixspan(db, first_symbols=first_symbols, **settings):
+        # group_codes has one row per grouping (section, dialect); code n_groups = no group
+        counts = np.bincount(group_codes[:, sequences].ravel(), minlength=n_groups + 1)[:n_groups]
+        found.append((pattern, len(sequences), counts))
+    return found
+
+def mine_patterns(db, group_codes, n_groups, settings, workers):
+    """Runs PrefixSpan with the first symbols spread over worker processes (balanced by frequency)."""
+    import numpy as np
+    support = db.symbol_support()
+    first_symbols = [int(s) for s in np.argsort(-support, kind="stable") if support[s] >= settings["min_count"]]
+    n_tasks = max(1, min(len(first_symbols), workers * 4))
+    tasks = [first_symbols[i::n_tasks] for i in range(n_tasks)]
+    state = (db, group_codes, n_groups, settings)
+    if workers <= 1:
+        init_worker(state)
+        results = list(map(mine_first_symbols, tasks))
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=init_worker, initargs=(state,)) as executor:
+            results = list(executor.map(mine_first_symbols, tasks))
+    return [pattern for result in results for pattern in result]
+
+def main(argv=None):
+    import numpy as np
+    parser = argparse.ArgumentParser(description="PrefixSpan over per-paragraph role and root sequences.")
+    parser.add_argument("--kinds", nargs="+", default=SEQUENCE_KINDS, choices=["role", "root", "prefix", "suffix", "word"])
+    parser.add_argument("--min-support", type=float, help="Share of paragraphs (default per kind, see MIN_SUPPORT).")
+    parser.add_argument("--max-gap", type=int, default=MAX_GAP)
+    parser.add_argument("--min-length", type=int, default=MIN_LENGTH)
+    parser.add_argument("--max-length", type=int, default=MAX_LENGTH)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--transcriber", default=TRANSCRIBER)
+    args = parser.parse_args(argv)
+
+    for kind in args.kinds:
+        print(f"\n--- {kind} sequences (max gap {args.max_gap}, length {args.min_length}-{args.max_length}) ---")
+        try:
+            with stage(f"load:{kind}"):
+                sequences, sections, dialects = load_sequences(args.transcriber, kind)
+        except FileNotFoundError:
+            print(f"ERROR: Token table '{TOKEN_TABLE_FILE}' not found. Please run 17_build_token_table.py first.")
+            return
+        if not sequences:
+            print(f"ERROR: Transcriber '{args.transcriber}' has no clean paragraphs in the token table.")
+            return
+
+        # Output columns: every section, then dialects A and B; one row of codes per grouping
+        section_names = sorted({s for s in sections if s})
+        groups = [f"section:{s}" for s in section_names] + ["dialect:A", "dialect:B"]
+        code = {name: i for i, name in enumerate(groups)}
+        group_codes = np.array([[code.get(f"section:{s}", len(groups)) for s in sections],
+                                [code.get(f"dialect:{d}", len(groups)) for d in dialects]])
+        group_sizes = np.bincount(group_codes.ravel(), minlength=len(groups) + 1)[:len(groups)]
+
+        db = SequenceDatabase.from_sequences(sequences)
+        min_support = args.min_support if args.min_support is not None else MIN_SUPPORT.get(kind, 0.01)
+        settings = {"min_count": max(MIN_COUNT, int(np.ceil(min_support * len(db)))), "max_gap": args.max_gap,
+                    "min_length": args.min_length, "max_length": args.max_length}
+        start_time = time.perf_counter()
+        with stage(f"mine:{kind}") as mine_stage:
+            found = mine_patterns(db, group_codes, len(groups), settings, args.workers)
+            mine_stage.add_tokens(len(db.symbols))
+        elapsed = time.perf_counter() - start_time
+        found.sort(key=lambda row: (-row[1], db.decode(row[0])))
+
+        output_file = OUTPUT_TEMPLATE.format(kind=kind)
+        with open(output_file, "w", encoding="utf-8", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["Pattern", "Length", "Paragraphs", "Share"] + [f"{group} share" for group in groups])
+            for pattern, support, counts in found:
+                writer.writerow([" .. ".join(db.decode(pattern)), len(pattern), support, round(support / len(db), 5)]
+                                + [round(counts[i] / group_sizes[i], 5) if group_sizes[i] else "" for i in range(len(groups))])
+
+        print(f"{len(db):,} paragraphs, {len(db.symbols):,} tokens, {len(db.alphabet):,} symbols: "
+              f"{len(found):,} patterns in >= {settings['min_count']} paragraphs ({elapsed:.2f}s, {args.workers} workers)")
+        a, b = code["dialect:A"], code["dialect:B"]
+        print(f"{'Pattern (by support)':<48}{'All':>8}{'A':>8}{'B':>8}")
+        for pattern, support, counts in found[:TOP_N]:
+            share_a = counts[a] / group_sizes[a] if group_sizes[a] else 0
+            share_b = counts[b] / group_sizes[b] if group_sizes[b] else 0
+            print(f"{' .. '.join(db.decode(pattern))[:47]:<48}{support / len(db):>8.1%}{share_a:>8.1%}{share_b:>8.1%}")
+        print(f"💾 Saved patterns with section/dialect support to '{output_file}'")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,210 @@
+import argparse
+import csv
+import os
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from hmm import length_batches, baum_welch, viterbi
+from script_loader import load_script
+from token_table import read_tokens, TOKEN_TABLE_FILE
+from instrumentation import stage
+
+# --- CONFIGURATION ---
+TRANSCRIBER = "H"
+STATE_COUNTS = [5, 10, 20]
+RESTARTS = 4                     # Random restarts per state count; the best log-likelihood is kept
+ITERATIONS = 100
+TOLERANCE = 1e-4                 # Relative log-likelihood gain that ends EM
+MIN_WORD_COUNT = 2               # Rarer words share one '<rare>' symbol
+TOP_WORDS = 8                    # Emissions listed per state in the report
+SEED = 1409
+OUTPUT_REPORT_FILE = "hmm_grammar_report.txt"
+OUTPUT_AGREEMENT_FILE = "hmm_role_agreement.csv"
+OUTPUT_WORDS_FILE = "hmm_word_states.csv"
+
+# ==============================================================================
+#    HMM GRAMMAR INDUCTION: do unsupervised word classes match the roles?
+# ==============================================================================
+# The roles of 05/06/10b (SUBJECT, OBJECT, CONNECTOR, CONCEPT, plus 06's
+# VIOLATION) come from fixed suffix rules. Here an HMM is trained on the
+# bare word sequences of the clean paragraphs (hmm.py: log-space
+# Baum-Welch, one batch per paragraph length), with random restarts run
+# in worker processes. The Viterbi states of every token are then compared
+# with its rule-based role: ARI, NMI and many-to-one accuracy (each state
+# labelled with its majority role).
+
+def load_paragraphs(transcriber):
+    """(paragraphs as word lists, paragraphs as role lists) of the clean paragraphs."""
+    table = read_tokens(columns=["clean_paragraph", "word", "role", "violation"],
+                        filters=[("transcriber", "=", transcriber)]).to_pydict()
+    words, roles = [], []
+    last = None
+    for paragraph, word, role, violation in zip(table["clean_paragraph"], table["word"], table["role"], table["violation"]):
+        if paragraph < 0:
+            continue
+        if paragraph != last:
+            last = paragraph
+            words.append([])
+            roles.append([])
+        words[-1].append(word)
+        roles[-1].append("VIOLATION" if violation else role)
+    return words, roles
+
+def encode(paragraphs, min_count):
+    """Integer paragraphs and the vocabulary (index 0 = '<rare>')."""
+    counts = Counter(word for paragraph in paragraphs for word in paragraph)
+    vocabulary = ["<rare>"] + sorted(word for word, count in counts.items() if count >= min_count)
+    code = {word: i for i, word in enumerate(vocabulary)}
+    return [[code.get(word, 0) for word in paragraph] for paragraph in paragraphs], vocabulary
+
+# --- WORKERS ---
+
+_worker_batches = None
+
+def init_worker(batches):
+    global _worker_batches
+    _worker_batches = batches
+
+def train_restart(task):
+    """One restart: (n_states, seed, iterations, tolerance) -> (states, seed, model, history, paths, seconds)."""
+    n_states, seed, iterations, tolerance = task
+    start_time = time.perf_counter()
+    n_symbols = 1 + max(int(obs.max()) for obs in _worker_batches.values())
+    model, history = baum_welch(_worker_batches, n_states, n_symbols, iterations, tolerance, seed=seed)
+    paths = viterbi(model, _worker_batches)
+    return n_states, seed, model, history, paths, time.perf_counter() - start_time
+
+def run_restarts(batches, tasks, workers):
+    if workers <= 1:
+        init_worker(batches)
+        return list(map(train_restart, tasks))
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker, initargs=(batches,)) as executor:
+        return list(executor.map(train_restart, tasks))
+
+# --- AGREEMENT ---
+
+def flatten(paths, batch_rows):
+    """Viterbi paths back in corpus token order."""
+    import numpy as np
+    return np.concatenate([paths[length][row] for length, row in batch_rows])
+
+def majority_roles(states, roles, n_states):
+    """{state: (majority role, share of the state's tokens, token count)}."""
+    labels = {}
+    for state in range(n_states):
+        counts = Counter(role for s, role in zip(states, roles) if s == state)
+        total = sum(counts.values())
+        if total:
+            role, count = counts.most_common(1)[0]
+            labels[state] = (role, count / total, total)
+    return labels
+
+def main(argv=None):
+    import numpy as np
+    parser = argparse.ArgumentParser(description="Unsupervised HMM word classes vs the rule-based roles.")
+    parser.add_argument("--states", type=int, nargs="+", default=STATE_COUNTS)
+    parser.add_argument("--restarts", type=int, default=RESTARTS)
+    parser.add_argument("--iterations", type=int, default=ITERATIONS)
+    parser.add_argument("--min-count", type=int, default=MIN_WORD_COUNT)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--transcriber", default=TRANSCRIBER)
+    args = parser.parse_args(argv)
+
+    print("Step 1: Loading paragraphs from the token table...")
+    try:
+        with stage("load"):
+            paragraphs, role_paragraphs = load_paragraphs(args.transcriber)
+    except FileNotFoundError:
+        print(f"ERROR: Token table '{TOKEN_TABLE_FILE}' not found. Please run 17_build_token_table.py first.")
+        return
+    if not paragraphs:
+        print(f"ERROR: Transcriber '{args.transcriber}' has no clean paragraphs in the token table.")
+        return
+    encoded, vocabulary = encode(paragraphs, args.min_count)
+    batches = length_batches(encoded)
+    # (length, row) of every paragraph in corpus order, to put Viterbi paths back in place
+    seen = Counter()
+    batch_rows = []
+    for paragraph in encoded:
+        batch_rows.append((len(paragraph), seen[len(paragraph)]))
+        seen[len(paragraph)] += 1
+    words = [word for paragraph in paragraphs for word in paragraph]
+    roles = [role for paragraph in role_paragraphs for role in paragraph]
+    print(f" -> {len(paragraphs):,} paragraphs, {len(words):,} tokens, {len(vocabulary):,} symbols, {len(batches)} length batches")
+
+    print(f"Step 2: Baum-Welch for {args.states} states, {args.restarts} restarts each ({args.workers} workers)...")
+    tasks = [(n_states, SEED + 1000 * n_states + restart, args.iterations, TOLERANCE)
+             for n_states in args.states for restart in range(args.restarts)]
+    start_time = time.perf_counter()
+    with stage("train") as train_stage:
+        results = run_restarts(batches, tasks, args.workers)
+        train_stage.add_tokens(len(words) * len(tasks))
+    elapsed = time.perf_counter() - start_time
+
+    cluster_metrics = load_script("20_cluster_folios")
+    role_names = sorted(set(roles))
+    role_codes = np.array([role_names.index(role) for role in roles])
+    rows, best = [], {}
+    for n_states, seed, model, history, paths, seconds in results:
+        states = flatten(paths, batch_rows)
+        labels = majority_roles(states, roles, n_states)
+        accuracy = sum(labels[s][1] * labels[s][2] for s in labels) / len(states)
+        row = {"states": n_states, "seed": seed, "log_likelihood": round(history[-1], 2), "iterations": len(history),
+               "seconds": round(seconds, 2),
+               "ari": round(cluster_metrics.adjusted_rand_index(states, role_codes), 4),
+               "nmi": round(cluster_metrics.normalized_mutual_info(states, role_codes), 4),
+               "many_to_one": round(accuracy, 4)}
+        rows.append(row)
+        if n_states not in best or row["log_likelihood"] > best[n_states][0]["log_likelihood"]:
+            best[n_states] = (row, model, states, labels)
+
+    with open(OUTPUT_AGREEMENT_FILE, "w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+        writer.writeheader()
+        writer.writerows(rows)
+
+    with open(OUTPUT_REPORT_FILE, "w", encoding="utf-8") as f:
+        f.write("=" * 80 + "\n")
+        f.write("  HMM GRAMMAR INDUCTION: unsupervised states vs rule-based roles\n")
+        f.write("=" * 80 + "\n")
+        f.write(f"{len(paragraphs):,} paragraphs, {len(words):,} tokens, {len(vocabulary):,} word symbols "
+                f"(words seen < {args.min_count} times = '<rare>'). Roles: {dict(Counter(roles))}\n")
+        for n_states, (row, model, states, labels) in sorted(best.items()):
+            f.write(f"\n--- {n_states} states (best of {args.restarts}: log-likelihood {row['log_likelihood']:,.1f}, "
+                    f"ARI {row['ari']:.3f}, NMI {row['nmi']:.3f}, many-to-one {row['many_to_one']:.1%}) ---\n")
+            emissions = np.exp(model.log_emit)
+            for state in range(n_states):
+                if state not in labels:
+                    f.write(f"State {state:>2}: (no tokens)\n")
+                    continue
+                role, purity, total = labels[state]
+                top = ", ".join(vocabulary[i] for i in np.argsort(-emissions[state])[:TOP_WORDS])
+                next_state = int(np.argmax(model.log_trans[state]))
+                f.write(f"State {state:>2}: {total:>6,} tokens, {role:<9} {purity:>6.1%}  -> {next_state:<3}| {top}\n")
+
+    # Most frequent Viterbi state of every word, per state count
+    with open(OUTPUT_WORDS_FILE, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        state_counts = sorted(best)
+        writer.writerow(["Word", "Count", "Role"] + [f"State_{k}" for k in state_counts])
+        word_roles = {}
+        for word, role in zip(words, roles):
+            word_roles.setdefault(word, Counter())[role] += 1
+        word_states = {k: {} for k in state_counts}
+        for k in state_counts:
+            for word, state in zip(words, best[k][2]):
+                word_states[k].setdefault(word, Counter())[int(state)] += 1
+        for word, role_counts in sorted(word_roles.items(), key=lambda item: -sum(item[1].values())):
+            writer.writerow([word, sum(role_counts.values()), role_counts.most_common(1)[0][0]]
+                            + [word_states[k][word].most_common(1)[0][0] for k in state_counts])
+
+    print(f"\n{'States':>6}{'Log-likelihood':>18}{'Iter':>6}{'ARI':>8}{'NMI':>8}{'M-to-1':>9}")
+    for n_states, (row, _, _, _) in sorted(best.items()):
+        print(f"{n_states:>6}{row['log_likelihood']:>18,.1f}{row['iterations']:>6}{row['ari']:>8.3f}"
+              f"{row['nmi']:>8.3f}{row['many_to_one']:>9.1%}")
+    per_restart = sum(row["seconds"] for row in rows) / len(rows)
+    print(f"\n✅ {len(tasks)} restarts in {elapsed:.1f}s ({per_restart:.1f}s per restart of CPU time).")
+    print(f"💾 Saved '{OUTPUT_REPORT_FILE}', '{OUTPUT_AGREEMENT_FILE}' and '{OUTPUT_WORDS_FILE}'")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,204 @@
+import argparse
+import csv
+import time
+from ngram_lm import build_vocabulary, ngram_events, KneserNeyLM, perplexity
+from script_loader import load_script
+from token_table import read_tokens, TOKEN_TABLE_FILE
+from instrumentation import stage
+
+# --- CONFIGURATION ---
+TRANSCRIBER = "H"
+SEQUENCE_KINDS = ["word", "root"]   # Token table columns modelled as per-paragraph sequences
+ORDER = 3                           # Highest n-gram order; orders 1..ORDER are all cross-validated
+FOLDS = 5                           # Folios are dealt into folds, so no page is in its own training data
+MIN_COUNT = 2                       # Rarer symbols share '<unk>'
+SEED = 1409
+TOP_N = 5                           # Most surprising paragraphs printed per kind
+OUTPUT_PERPLEXITY_FILE = "ngram_perplexity.csv"
+OUTPUT_FOLIO_FILE = "ngram_folio_scores.csv"
+OUTPUT_SURPRISAL_FILE = "ngram_paragraph_surprisal.csv"
+
+# ==============================================================================
+#    N-GRAM PERPLEXITY: which section (or dialect) does this page look like?
+# ==============================================================================
+# 03 gives one H2 number per text. Here interpolated modified Kneser-Ney
+# models (ngram_lm.py) are trained on the clean paragraphs' word or root
+# sequences. Folios are split into FOLDS folds; for every fold one model is
+# trained on the other folds' text for the whole corpus, each section and
+# each dialect (1's DIALECT_MAP), and the held-out text is scored against
+# all of them. That gives:
+#   - cross-validated perplexity per order, overall and per section/dialect;
+#   - for every folio, its perplexity under each section and dialect model
+#     and the best match (compared with its real section and dialect);
+#   - every paragraph's surprisal (bits per token) under the corpus model.
+
+def load_paragraphs(transcriber, kind):
+    """(sequences, folio per sequence, section per sequence, dialect per sequence) of the clean paragraphs."""
+    table = read_tokens(columns=["folio", "clean_paragraph", "section", kind],
+                        filters=[("transcriber", "=", transcriber)]).to_pydict()
+    dialect_map = load_script("1_segment_by_dialect").get_dialect_map()
+    dialect_of = {f"f{folio}": dialect for dialect, folios in dialect_map.items() for folio in folios}
+    sequences, folios, sections, dialects = [], [], [], []
+    last = None
+    for folio, paragraph, section, symbol in zip(table["folio"], table["clean_paragraph"], table["section"], table[kind]):
+        if paragraph < 0:
+            continue
+        if paragraph != last:
+            last = paragraph
+            sequences.append([])
+            folios.append(folio)
+            sections.append(section)
+            dialects.append(dialect_of.get(folio))
+        if symbol is not None:
+            sequences[-1].append(symbol)
+    return sequences, folios, sections, dialects
+
+def score_models(models, events):
+    """(n_models x n_events) natural-log probabilities; NaN rows for missing models."""
+    import numpy as np
+    scores = np.full((len(models), len(events)), np.nan)
+    for i, model in enumerate(models):
+        if model is not None:
+            scores[i] = model.log_prob(events)
+    return scores
+
+def cross_validate(events, event_groups, event_fold, base, group_names, folds):
+    """
+    Held-out log-probabilities of every event: (one row per order under
+    the corpus model, one row per group model at the highest order).
+    """
+    import numpy as np
+    order = events.shape[1]
+    by_order = np.full((order, len(events)), np.nan)
+    by_group = np.full((len(group_names), len(events)), np.nan)
+    for fold in range(folds):
+        test = event_fold == fold
+        if not test.any():
+            continue
+        train = events[~test]
+        by_order[:, test] = score_models([KneserNeyLM.fit(train, base, k) for k in range(1, order + 1)], events[test])
+        group_models = []
+        for g in range(len(group_names)):
+            in_group = ~test & (event_groups == g).any(axis=0)
+            group_models.append(KneserNeyLM.fit(events[in_group], base) if in_group.any() else None)
+        by_group[:, test] = score_models(group_models, events[test])
+    return by_order, by_group
+
+def grouped_perplexity(log_probs, codes, n_codes):
+    """Perplexity of every code's events (codes < 0 are ignored)."""
+    import numpy as np
+    valid = codes >= 0
+    sums = np.bincount(codes[valid], weights=log_probs[valid], minlength=n_codes)
+    counts = np.bincount(codes[valid], minlength=n_codes)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.exp(-sums / counts), counts
+
+def main(argv=None):
+    import numpy as np
+    parser = argparse.ArgumentParser(description="Cross-validated Kneser-Ney perplexity by section, dialect and folio.")
+    parser.add_argument("--kinds", nargs="+", default=SEQUENCE_KINDS, choices=["word", "root", "prefix", "suffix", "role"])
+    parser.add_argument("--order", type=int, default=ORDER)
+    parser.add_argument("--folds", type=int, default=FOLDS)
+    parser.add_argument("--min-count", type=int, default=MIN_COUNT)
+    parser.add_argument("--transcriber", default=TRANSCRIBER)
+    args = parser.parse_args(argv)
+
+    perplexity_rows, folio_rows, surprisal_rows = [], [], []
+    for kind in args.kinds:
+        print(f"\n--- {kind} sequences (order {args.order}, {args.folds} folio folds) ---")
+        try:
+            with stage(f"load:{kind}"):
+                sequences, folios, sections, dialects = load_paragraphs(args.transcriber, kind)
+        except FileNotFoundError:
+            print(f"ERROR: Token table '{TOKEN_TABLE_FILE}' not found. Please run 17_build_token_table.py first.")
+            return
+        if not sequences:
+            print(f"ERROR: Transcriber '{args.transcriber}' has no clean paragraphs in the token table.")
+            return
+
+        vocabulary = build_vocabulary(sequences, args.min_count)
+        events, owner = ngram_events(sequences, vocabulary, args.order)
+        folio_names = sorted(set(folios))
+        section_names = sorted({s for s in sections if s})
+        group_names = [f"section:{s}" for s in section_names] + ["dialect:A", "dialect:B"]
+        code = {name: i for i, name in enumerate(group_names)}
+        # One row of group codes per grouping, per paragraph (-1 = none), then per event
+        paragraph_groups = np.array([[code.get(f"section:{s}", -1) for s in sections],
+                                     [code.get(f"dialect:{d}", -1) for d in dialects]])
+        event_groups = paragraph_groups[:, owner]
+        folio_fold = {folio: i % args.folds for i, folio in enumerate(np.random.default_rng(SEED).permutation(folio_names))}
+        folio_code = {folio: i for i, folio in enumerate(folio_names)}
+        event_folio = np.array([folio_code[folios[p]] for p in owner])
+        event_fold = np.array([folio_fold[folios[p]] for p in range(len(sequences))])[owner]
+
+        start_time = time.perf_counter()
+        with stage(f"cross-validate:{kind}") as cv_stage:
+            by_order, by_group = cross_validate(events, event_groups, event_fold, len(vocabulary),
+                                                group_names, args.folds)
+            cv_stage.add_tokens(len(events) * (args.order + len(group_names)))
+        elapsed = time.perf_counter() - start_time
+
+        # Held-out perplexity per order, of all text and of each group's text
+        for k in range(args.order):
+            perplexity_rows.append([kind, k + 1, "All", len(events), round(perplexity(by_order[k]), 3)])
+            for row in event_groups:
+                values, counts = grouped_perplexity(by_order[k], row, len(group_names))
+                for g in np.flatnonzero(counts):
+                    perplexity_rows.append([kind, k + 1, group_names[g], int(counts[g]), round(float(values[g]), 3)])
+
+        # Every folio against every section and dialect model
+        n_sections = len(section_names)
+        folio_ppl = np.array([grouped_perplexity(scores, event_folio, len(folio_names))[0] for scores in by_group])
+        token_counts = np.bincount(event_folio, minlength=len(folio_names))
+        folio_section = {folio: section for folio, section in zip(folios, sections)}
+        folio_dialect = {folio: dialect for folio, dialect in zip(folios, dialects)}
+        matched = {"section": [0, 0], "dialect": [0, 0]}
+        for f, folio in enumerate(folio_names):
+            section_scores = np.where(np.isnan(folio_ppl[:n_sections, f]), np.inf, folio_ppl[:n_sections, f])
+            dialect_scores = np.where(np.isnan(folio_ppl[n_sections:, f]), np.inf, folio_ppl[n_sections:, f])
+            best_section = section_names[int(np.argmin(section_scores))]
+            best_dialect = "AB"[int(np.argmin(dialect_scores))]
+            for name, truth, best in (("section", folio_section[folio], best_section),
+                                      ("dialect", folio_dialect[folio], best_dialect)):
+                if truth:
+                    matched[name][0] += truth == best
+                    matched[name][1] += 1
+            folio_rows.append([kind, folio, folio_section[folio], folio_dialect[folio] or "", int(token_counts[f])]
+                              + [round(float(value), 3) for value in folio_ppl[:, f]] + [best_section, best_dialect])
+
+        # Surprisal of every paragraph under the held-out corpus model
+        bits = -np.bincount(owner, weights=by_order[-1], minlength=len(sequences)) / np.log(2)
+        lengths = np.bincount(owner, minlength=len(sequences))
+        ranked = np.argsort(-bits / lengths, kind="stable")
+        for p in ranked:
+            surprisal_rows.append([kind, int(p), folios[p], sections[p], int(lengths[p]),
+                                   round(float(bits[p] / lengths[p]), 4), " ".join(sequences[p])])
+
+        print(f"{len(sequences):,} paragraphs, {len(events):,} predicted tokens, {len(vocabulary):,} symbols "
+              f"({elapsed:.2f}s for {args.folds} folds x {args.order + len(group_names)} models)")
+        print("Held-out perplexity by order: " + ", ".join(
+            f"{k + 1}-gram {perplexity(by_order[k]):.1f}" for k in range(args.order)))
+        for name, (hits, total) in matched.items():
+            if total:
+                print(f"Folios whose best-matching {name} model is their own {name}: {hits}/{total} ({hits / total:.1%})")
+        print("Most surprising paragraphs (bits/token):")
+        for p in ranked[:TOP_N]:
+            print(f"  {bits[p] / lengths[p]:>6.2f}  {folios[p]:<7}{sections[p] or '':<16}{' '.join(sequences[p])[:50]}")
+
+    with open(OUTPUT_PERPLEXITY_FILE, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["Kind", "Order", "Text", "Tokens", "Perplexity"])
+        writer.writerows(perplexity_rows)
+    with open(OUTPUT_FOLIO_FILE, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["Kind", "Folio", "Section", "Dialect", "Tokens"]
+                        + [f"Perplexity {name}" for name in group_names] + ["Best section", "Best dialect"])
+        writer.writerows(folio_rows)
+    with open(OUTPUT_SURPRISAL_FILE, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["Kind", "Paragraph", "Folio", "Section", "Tokens", "Bits per token", "Text"])
+        writer.writerows(surprisal_rows)
+    print(f"\n💾 Saved '{OUTPUT_PERPLEXITY_FILE}', '{OUTPUT_FOLIO_FILE}' and '{OUTPUT_SURPRISAL_FILE}'")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+import argparse
+import csv
+import time
+from eva_glyphs import (GlyphTokenizer, GLYPH_INVENTORIES, POSITIONS, glyph_histograms,
+                        entropy_bits, conditional_entropy_bits)
+from token_table import read_tokens, TOKEN_TABLE_FILE
+from instrumentation import stage
+
+# --- CONFIGURATION ---
+TRANSCRIBER = "H"                 # Transcriber whose text is broken down by section
+INVENTORY = "basic"               # Glyph inventory of the positional table (see eva_glyphs.GLYPH_INVENTORIES)
+COMPARED_INVENTORIES = ["characters", "basic", "extended"]
+MIN_GROUP_TOKENS = 500            # Transcribers with fewer tokens are left out
+DROP_UNREADABLE = True            # Skip words containing '?' (an unreadable glyph)
+OUTPUT_ENTROPY_FILE = "glyph_entropy.csv"
+OUTPUT_POSITIONS_FILE = "glyph_positions.csv"
+
+# ==============================================================================
+#    GLYPH STATISTICS: entropy and word position at the glyph level
+# ==============================================================================
+# Character statistics count 'ch' as two letters and 'cth' as three. Here
+# every word type is split once into glyph ids (eva_glyphs.py) and counted
+# with one weight column per group: every transcriber (all its text) and
+# every section of TRANSCRIBER's text. For each glyph inventory the script
+# reports glyph unigram entropy and the conditional entropy of a glyph given
+# the previous one (word boundaries included), and for INVENTORY how often
+# each glyph is word-initial, medial, final or a whole word.
+
+def load_groups(transcriber, min_tokens, drop_unreadable):
+    """(word types, weight matrix word types x groups, group names, tokens per group)."""
+    import numpy as np
+    import pyarrow.compute as pc
+    table = read_tokens(columns=["transcriber", "section", "word"])
+    if drop_unreadable:
+        table = table.filter(pc.invert(pc.match_substring(table["word"], "?")))
+    words = table["word"].combine_chunks().dictionary_encode()
+    word_codes = words.indices.to_numpy()
+    transcribers = np.array(table["transcriber"].to_pylist(), dtype=object)
+    sections = np.array(table["section"].to_pylist(), dtype=object)
+    names, columns = [], []
+    for name in sorted(set(transcribers), key=lambda t: -np.count_nonzero(transcribers == t)):
+        rows = transcribers == name
+        if rows.sum() >= min_tokens:
+            names.append(f"transcriber:{name}")
+            columns.append(rows)
+    for section in sorted({s for s in sections[transcribers == transcriber] if s}):
+        names.append(f"{transcriber} section:{section}")
+        columns.append((transcribers == transcriber) & (sections == section))
+    n_types = len(words.dictionary)
+    weights = np.stack([np.bincount(word_codes[rows], minlength=n_types) for rows in columns], axis=1).astype(np.float64)
+    return words.dictionary.to_pylist(), weights, names, weights.sum(axis=0)
+
+def main(argv=None):
+    import numpy as np
+    parser = argparse.ArgumentParser(description="Glyph-level entropy and positional distributions per section and transcriber.")
+    parser.add_argument("--inventory", choices=list(GLYPH_INVENTORIES), default=INVENTORY)
+    parser.add_argument("--transcriber", default=TRANSCRIBER)
+    parser.add_argument("--min-tokens", type=int, default=MIN_GROUP_TOKENS)
+    parser.add_argument("--keep-unreadable", action="store_true", help="Keep words containing '?'.")
+    args = parser.parse_args(argv)
+
+    print("Step 1: Counting word types per transcriber and section...")
+    try:
+        with stage("load"):
+            word_types, weights, group_names, group_tokens = load_groups(
+                args.transcriber, args.min_tokens, DROP_UNREADABLE and not args.keep_unreadable)
+    except FileNotFoundError:
+        print(f"ERROR: Token table '{TOKEN_TABLE_FILE}' not found. Please run 17_build_token_table.py first.")
+        return
+    print(f" -> {len(word_types):,} word types, {len(group_names)} groups")
+
+    print("Step 2: Glyph histograms per inventory...")
+    inventories = list(dict.fromkeys(COMPARED_INVENTORIES + [args.inventory]))
+    entropy_rows, summary, positional = [], {}, None
+    start_time = time.perf_counter()
+    with stage("histograms") as histogram_stage:
+        for inventory in inventories:
+            tokenizer = GlyphTokenizer(inventory)
+            ids, offsets = tokenizer.encode_words(word_types)
+            unigrams, by_position, transitions = glyph_histograms(ids, offsets, weights, len(tokenizer.glyphs))
+            unigram_h = entropy_bits(unigrams)
+            conditional_h = conditional_entropy_bits(transitions)
+            glyph_totals = unigrams.sum(axis=1)
+            for g, name in enumerate(group_names):
+                entropy_rows.append([inventory, name, int(group_tokens[g]), int(glyph_totals[g]),
+                                     int(np.count_nonzero(unigrams[g])), round(glyph_totals[g] / group_tokens[g], 4),
+                                     round(float(unigram_h[g]), 4), round(float(conditional_h[g]), 4)])
+            summary[inventory] = (glyph_totals, unigram_h, conditional_h)
+            if inventory == args.inventory:
+                positional = (tokenizer.glyphs, unigrams, by_position)
+            histogram_stage.add_tokens(int(group_tokens.sum()))
+    elapsed = time.perf_counter() - start_time
+
+    with open(OUTPUT_ENTROPY_FILE, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["Inventory", "Group", "Tokens", "Glyphs", "Glyph types", "Glyphs per word",
+                         "Unigram entropy", "Conditional entropy"])
+        writer.writerows(entropy_rows)
+
+    glyphs, unigrams, by_position = positional
+    with open(OUTPUT_POSITIONS_FILE, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["Inventory", "Group", "Glyph", "Count", "Share"] + [f"{p.capitalize()} share" for p in POSITIONS])
+        for g, name in enumerate(group_names):
+            total = unigrams[g].sum()
+            for glyph_id in np.argsort(-unigrams[g], kind="stable"):
+                count = unigrams[g, glyph_id]
+                if count == 0:
+                    break
+                writer.writerow([args.inventory, name, glyphs[glyph_id], int(count), round(count / total, 5)]
+                                + [round(by_position[g, p, glyph_id] / count, 4) for p in range(len(POSITIONS))])
+
+    print(f"\n{'Group':<34}{'Tokens':>8}" + "".join(f"{inventory[:10] + ' H1/H2':>20}" for inventory in inventories))
+    for g, name in enumerate(group_names):
+        cells = "".join(f"{summary[i][1][g]:>11.3f}/{summary[i][2][g]:.3f}" for i in inventories)
+        print(f"{name[:33]:<34}{int(group_tokens[g]):>8,}{cells}")
+    main_group = next((g for g, name in enumerate(group_names) if name == f"transcriber:{args.transcriber}"), 0)
+    print(f"\nPositional profile of the most frequent '{args.inventory}' glyphs ({group_names[main_group]}):")
+    print(f"{'Glyph':<7}{'Share':>8}" + "".join(f"{p:>9}" for p in POSITIONS))
+    for glyph_id in np.argsort(-unigrams[main_group], kind="stable")[:12]:
+        count = unigrams[main_group, glyph_id]
+        print(f"{glyphs[glyph_id]:<7}{count / unigrams[main_group].sum():>8.1%}"
+              + "".join(f"{by_position[main_group, p, glyph_id] / count:>9.1%}" for p in range(len(POSITIONS))))
+    print(f"\n✅ {len(inventories)} inventories x {len(group_names)} groups in {elapsed * 1000:.0f} ms.")
+    print(f"💾 Saved '{OUTPUT_ENTROPY_FILE}' and '{OUTPUT_POSITIONS_FILE}'")
+
+if __name__ == "__main__":
+    main()
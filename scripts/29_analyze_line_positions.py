@@ -0,0 +1,120 @@
+import argparse
+import csv
+import time
+from eva_glyphs import GlyphTokenizer
+from line_positions import (POSITION_CLASSES, position_classes, position_counts, chi_square_rows,
+                            chi_square_table, benjamini_hochberg)
+from token_table import read_tokens, TOKEN_TABLE_FILE
+from instrumentation import stage
+
+# --- CONFIGURATION ---
+TRANSCRIBER = "H"
+ITEM_KINDS = ["word", "root", "role", "first_glyph", "last_glyph"]   # Glyph kinds: a word's first/last EVA glyph
+GLYPH_INVENTORY = "basic"
+MIN_PARAGRAPH_LINES = 2      # Labels and other one-line units have no line structure to speak of
+MIN_COUNT = 20               # Items seen fewer times are counted but not tested
+SIGNIFICANCE = 0.01          # False-discovery rate for the printed items
+TOP_N = 5                    # Items printed per kind and position class
+OUTPUT_FILE = "line_position_stats.csv"
+
+# ==============================================================================
+#    LINE POSITIONS: which words, roots, glyphs and roles prefer which place?
+# ==============================================================================
+# 01 keeps one line per row of voynich_ready_nlp.txt; the line's paragraph
+# and its place in it are in voynich_ready_lines.csv, and the token table
+# (17) holds the same numbers for every transcriber. Here one read of the
+# token table puts every token in a position class (paragraph-initial,
+# line-initial, line-final, interior; line_positions.py), then every item
+# kind is one bincount into an items x classes table. Each item is tested
+# against all others (chi-square, 3 degrees of freedom, Benjamini-Hochberg
+# q-values), and the adjusted residuals show where it is over-represented.
+
+def load_items(transcriber, kinds, inventory):
+    """(folio codes, paragraph, position, {kind: (codes, names)}) for one transcriber, in file order."""
+    import numpy as np
+    columns = ["folio", "paragraph", "position", "word"] + [k for k in ("root", "role") if k in kinds]
+    table = read_tokens(columns=columns, filters=[("transcriber", "=", transcriber)])
+    folio_codes = table["folio"].combine_chunks().dictionary_encode().indices.to_numpy()
+    items = {}
+    for kind in ("word", "root", "role"):
+        if kind in kinds:
+            encoded = table[kind].combine_chunks().dictionary_encode()
+            codes = encoded.indices.fill_null(-1).to_numpy(zero_copy_only=False)
+            items[kind] = (codes, encoded.dictionary.to_pylist())
+    glyph_kinds = [k for k in kinds if k in ("first_glyph", "last_glyph")]
+    if glyph_kinds:
+        encoded = table["word"].combine_chunks().dictionary_encode()
+        tokenizer = GlyphTokenizer(inventory)
+        ids, offsets = tokenizer.encode_words(encoded.dictionary.to_pylist())
+        lengths = np.diff(offsets)
+        word_codes = encoded.indices.to_numpy()
+        for kind in glyph_kinds:
+            ends = offsets[:-1] if kind == "first_glyph" else offsets[1:] - 1
+            type_glyph = np.where(lengths > 0, ids[np.minimum(ends, len(ids) - 1)], -1)
+            items[kind] = (type_glyph[word_codes], list(tokenizer.glyphs))
+    return folio_codes, table["paragraph"].to_numpy(), table["position"].to_numpy(), items
+
+def main(argv=None):
+    import numpy as np
+    parser = argparse.ArgumentParser(description="Line- and paragraph-position preferences with chi-square tests.")
+    parser.add_argument("--kinds", nargs="+", default=ITEM_KINDS, choices=ITEM_KINDS)
+    parser.add_argument("--transcriber", default=TRANSCRIBER)
+    parser.add_argument("--min-lines", type=int, default=MIN_PARAGRAPH_LINES, help="Skip paragraphs with fewer lines.")
+    parser.add_argument("--min-count", type=int, default=MIN_COUNT)
+    args = parser.parse_args(argv)
+
+    print(f"Step 1: Reading transcriber {args.transcriber}'s tokens in page order...")
+    try:
+        with stage("load"):
+            folio_codes, paragraph, position, items = load_items(args.transcriber, args.kinds, GLYPH_INVENTORY)
+    except FileNotFoundError:
+        print(f"ERROR: Token table '{TOKEN_TABLE_FILE}' not found. Please run 17_build_token_table.py first.")
+        return
+    if len(position) == 0:
+        print(f"ERROR: Transcriber '{args.transcriber}' has no tokens in the token table.")
+        return
+
+    start_time = time.perf_counter()
+    with stage("classify") as classify_stage:
+        classes, keep = position_classes(folio_codes, paragraph, position, args.min_lines)
+        classify_stage.add_tokens(len(classes))
+    class_totals = np.bincount(classes[keep], minlength=len(POSITION_CLASSES))
+    print(f" -> {int(keep.sum()):,} of {len(classes):,} tokens in paragraphs of >= {args.min_lines} lines: "
+          + ", ".join(f"{name} {count:,}" for name, count in zip(POSITION_CLASSES, class_totals)))
+
+    print("Step 2: Position tables and chi-square tests...")
+    rows, summaries = [], []
+    with stage("test"):
+        for kind in args.kinds:
+            codes, names = items[kind]
+            counts = position_counts(codes[keep], classes[keep], len(names))
+            tested = counts.sum(axis=1) >= args.min_count
+            statistic, dof, p_values, residuals = chi_square_rows(counts[tested])
+            q_values = benjamini_hochberg(p_values)
+            summaries.append((kind, int(tested.sum()), chi_square_table(counts[tested]),
+                              names, np.flatnonzero(tested), residuals, q_values))
+            for i, item in enumerate(np.flatnonzero(tested)):
+                rows.append([kind, names[item], int(counts[item].sum())] + [int(c) for c in counts[item]]
+                            + [round(float(r), 3) for r in residuals[i]]
+                            + [round(float(statistic[i]), 3), float(f"{p_values[i]:.4g}"), float(f"{q_values[i]:.4g}")])
+    elapsed = time.perf_counter() - start_time
+
+    with open(OUTPUT_FILE, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["Kind", "Item", "Count"] + [f"{c} count" for c in POSITION_CLASSES]
+                        + [f"{c} residual" for c in POSITION_CLASSES] + ["Chi2", "p", "q"])
+        writer.writerows(sorted(rows, key=lambda row: (args.kinds.index(row[0]), row[-1], -row[2])))
+
+    for kind, n_tested, (statistic, dof, p_value, cramers_v), names, tested, residuals, q_values in summaries:
+        print(f"\n--- {kind}: {n_tested} items with >= {args.min_count} tokens; "
+              f"table chi2 = {statistic:,.0f} (dof {dof}, p = {p_value:.2g}), Cramer's V = {cramers_v:.3f} ---")
+        for c, class_name in enumerate(POSITION_CLASSES):
+            significant = np.flatnonzero((q_values < SIGNIFICANCE) & (residuals[:, c] > 0))
+            top = significant[np.argsort(-residuals[significant, c])][:TOP_N]
+            listed = ", ".join(f"{names[tested[i]]} (+{residuals[i, c]:.1f})" for i in top) or "-"
+            print(f"  {class_name:<18} {listed}")
+    print(f"\n✅ Classified and tested {len(args.kinds)} item kinds in {elapsed * 1000:.0f} ms.")
+    print(f"💾 Saved per-item position counts, residuals and q-values to '{OUTPUT_FILE}'")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,211 @@
+import argparse
+import csv
+import re
+import time
+from ivtff import iter_ivtff
+from reading_lattice import ReadingLattice, LATTICE_DIR, WILDCARDS
+from script_loader import load_script
+from instrumentation import stage
+
+# --- CONFIGURATION ---
+VOYNICH_SOURCE_FILE = "voynich.txt"   # All transcribers
+REFERENCE_TRANSCRIBER = "H"           # The reading the rest of the pipeline uses
+ITEM_KINDS = ["word", "root"]
+MIN_COUNT = 10                        # Reference count for a section finding to be checked
+MIN_LIFT = 1.5                        # Section lift cutoff, as 5_ and 24
+SAMPLES = 200                         # Random full readings for the entropy range
+SEED = 1409
+TOP_N = 8                             # Fragile findings printed per kind
+OUTPUT_FILE = "reading_robustness.csv"
+
+PAGE_FOLIO = re.compile(r"^f\d+[rv]$")   # Folios 01 keeps
+
+# ==============================================================================
+#    READING LATTICE: which findings depend on doubtful readings?
+# ==============================================================================
+# The cleaners keep one reading (H) and strip every mark of doubt. Here all
+# transcribers' readings of every line go into a lattice of independent
+# slots (reading_lattice.py), including ',' uncertain spaces and '?'
+# unreadable glyphs. For words and roots, per section:
+#   - the reference count (H's literal reading), the expected count over
+#     the alternatives, and the exact minimum and maximum over all readings;
+#   - section lift from the reference and expected counts, with
+#     conservative bounds from the count bounds;
+#   - every section finding (reference lift >= MIN_LIFT, count >=
+#     MIN_COUNT) marked robust if even the lower lift bound stays above the
+#     cutoff.
+# Word entropy (H1, and H2 as in 03) is given for the reference reading and
+# as a range over SAMPLES random full readings drawn slot by slot.
+
+def load_loci(source_file):
+    """{(folio, line): {transcriber: text}} in page order, for the folios 01 keeps."""
+    loci = {}
+    for record in iter_ivtff(source_file):
+        if record[0] != "locus" or not PAGE_FOLIO.match(record[1].folio):
+            continue
+        locus = record[1]
+        loci.setdefault((locus.folio, locus.line), {})[locus.transcriber] = locus.text
+    return loci
+
+def load_or_build_lattice(rebuild=False):
+    if not rebuild:
+        try:
+            return ReadingLattice.load(LATTICE_DIR), False
+        except (FileNotFoundError, ValueError):
+            pass
+    clean_data = load_script("01_generate_clean_data")
+    loci = load_loci(VOYNICH_SOURCE_FILE)
+    sections = {folio: clean_data.get_section_from_folio(folio) for folio, _ in loci}
+    lattice = ReadingLattice.from_loci(loci, sections)
+    lattice.save(LATTICE_DIR)
+    return lattice, True
+
+def item_codes(lattice, kind):
+    """(item code per word occurrence, item names) for words or their 10b roots."""
+    import numpy as np
+    if kind == "word":
+        return lattice.word_ids.astype(np.int64), lattice.vocabulary
+    translator = load_script("10b_translate_all_improved")
+    names, code = [], {}
+    mapping = np.full(len(lattice.vocabulary), -1, dtype=np.int64)
+    for i, word in enumerate(lattice.vocabulary):
+        root = translator.ParsedWord(word).root
+        if root:
+            if root not in code:
+                code[root] = len(names)
+                names.append(root)
+            mapping[i] = code[root]
+    return mapping[lattice.word_ids], names
+
+def word_entropies(items, lines, n_items):
+    """(H1, H2) of one reading: item codes in reading order and the line of each."""
+    import numpy as np
+    counts = np.bincount(items, minlength=n_items)
+    p = counts[counts > 0] / counts.sum()
+    h1 = float(-(p * np.log2(p)).sum())
+    same_line = lines[1:] == lines[:-1]
+    first, second = items[:-1][same_line], items[1:][same_line]
+    if len(first) == 0:
+        return h1, 0.0
+    _, pair_counts = np.unique(first * n_items + second, return_counts=True)
+    _, first_counts = np.unique(first, return_counts=True)
+    h_pairs = pair_counts / pair_counts.sum()
+    h_first = first_counts / first_counts.sum()
+    # H(next | previous) = H(pair) - H(previous)
+    return h1, float(-(h_pairs * np.log2(h_pairs)).sum() + (h_first * np.log2(h_first)).sum())
+
+def lifts(counts, totals):
+    """Lift of every (group, item) from counts (groups x items) and tokens per group."""
+    import numpy as np
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return (counts / totals[:, None]) / (counts.sum(axis=0) / totals.sum())
+
+def main(argv=None):
+    import numpy as np
+    parser = argparse.ArgumentParser(description="Counts, lift and entropy over all alternative readings.")
+    parser.add_argument("--kinds", nargs="+", default=ITEM_KINDS, choices=ITEM_KINDS)
+    parser.add_argument("--reference", default=REFERENCE_TRANSCRIBER, help="Transcriber of the reference reading.")
+    parser.add_argument("--samples", type=int, default=SAMPLES)
+    parser.add_argument("--rebuild", action="store_true", help="Rebuild the lattice from the source file.")
+    args = parser.parse_args(argv)
+
+    print("Step 1: Loading the reading lattice...")
+    start_time = time.perf_counter()
+    try:
+        with stage("lattice"):
+            lattice, built = load_or_build_lattice(args.rebuild)
+    except FileNotFoundError:
+        print(f"ERROR: Source file '{VOYNICH_SOURCE_FILE}' not found.")
+        return
+    if args.reference not in lattice.transcribers:
+        print(f"ERROR: Transcriber '{args.reference}' is not in the lattice ({', '.join(lattice.transcribers)}).")
+        return
+    alternatives_per_slot = np.diff(lattice.slot_offsets)
+    print(f" -> {len(lattice.lines):,} lines, {len(lattice.slot_line):,} slots "
+          f"({np.count_nonzero(alternatives_per_slot > 1):,} with alternatives), {len(lattice.alt_slot):,} alternatives, "
+          f"{len(lattice.word_ids):,} word occurrences ({'built and saved to' if built else 'loaded from'} "
+          f"'{LATTICE_DIR}/', {time.perf_counter() - start_time:.2f}s)")
+
+    section_names = sorted({line["section"] for line in lattice.lines if line["section"]})
+    line_groups = np.array([section_names.index(line["section"]) if line["section"] else 0 for line in lattice.lines])
+    slot_groups = line_groups[lattice.slot_line].astype(np.int64)
+    groups = lattice.word_groups(slot_groups)
+    reference_alts = lattice.transcriber_alternatives(args.reference)
+    reference_words = reference_alts[lattice.word_alt]
+    rng = np.random.default_rng(SEED)
+    samples = lattice.sample_alternatives(args.samples, rng)
+
+    rows = []
+    for kind in args.kinds:
+        print(f"\nStep 2: {kind}s per section (reference '{args.reference}', expectation, bounds)...")
+        start_time = time.perf_counter()
+        with stage(f"bounds:{kind}") as bounds_stage:
+            items, names = item_codes(lattice, kind)
+            n_items, n_groups = len(names), len(section_names)
+            reference = np.bincount(groups[reference_words & (items >= 0)] * n_items + items[reference_words & (items >= 0)],
+                                    minlength=n_groups * n_items).reshape(n_groups, n_items).astype(np.float64)
+            expected = lattice.expected_counts(items, n_items, groups, n_groups)
+            low, high = lattice.count_bounds(items, n_items, groups, n_groups)
+            # Token totals per section: the same computation with every occurrence as one item
+            every = np.where(items >= 0, 0, -1)
+            total_low, total_high = (bound[:, 0] for bound in lattice.count_bounds(every, 1, groups, n_groups))
+            bounds_stage.add_tokens(len(items))
+        bounds_time = time.perf_counter() - start_time
+        reference_lift = lifts(reference, reference.sum(axis=1))
+        expected_lift = lifts(expected, expected.sum(axis=1))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            lift_low = (low / total_high[:, None]) / (high.sum(axis=0) / total_low.sum())
+            lift_high = (high / total_low[:, None]) / (low.sum(axis=0) / total_high.sum())
+
+        findings = fragile = 0
+        fragile_rows = []
+        for g, section in enumerate(section_names):
+            for i in np.flatnonzero((reference[g] >= MIN_COUNT) | (expected[g] >= MIN_COUNT)):
+                # Unread glyphs are counted but are not findings of their own
+                finding = (reference[g, i] >= MIN_COUNT and reference_lift[g, i] >= MIN_LIFT
+                           and not any(c in WILDCARDS for c in names[i]))
+                robust = bool(lift_low[g, i] >= MIN_LIFT) if finding else ""
+                findings += finding
+                if finding and not robust:
+                    fragile += 1
+                    fragile_rows.append((section, names[i], reference_lift[g, i], lift_low[g, i], reference[g, i], low[g, i], high[g, i]))
+                rows.append([kind, names[i], section, int(reference[g, i]), round(float(expected[g, i]), 3),
+                             int(low[g, i]), int(high[g, i]), round(float(reference_lift[g, i]), 4),
+                             round(float(expected_lift[g, i]), 4), round(float(lift_low[g, i]), 4),
+                             round(float(lift_high[g, i]), 4), robust])
+
+        # Entropy: reference reading and random full readings
+        reference_order = np.flatnonzero(reference_words & (items >= 0))
+        word_lines = lattice.slot_line[lattice.alt_slot[lattice.word_alt]]
+        reference_h = word_entropies(items[reference_order], word_lines[reference_order], n_items)
+        sampled = []
+        with stage(f"samples:{kind}"):
+            for chosen in samples:
+                picked = np.zeros(len(lattice.alt_slot), dtype=bool)
+                picked[chosen] = True
+                order = np.flatnonzero(picked[lattice.word_alt] & (items >= 0))
+                sampled.append(word_entropies(items[order], word_lines[order], n_items))
+        sampled = np.array(sampled)
+
+        print(f" -> {n_items:,} {kind}s, bounds in {bounds_time * 1000:.0f} ms")
+        print(f"    Tokens: reference {int(reference.sum()):,}, expected {expected.sum():,.0f}, "
+              f"range {int(total_low.sum()):,}-{int(total_high.sum()):,}")
+        print(f"    H1: reference {reference_h[0]:.3f}, sampled {np.percentile(sampled[:, 0], 5):.3f}-"
+              f"{np.percentile(sampled[:, 0], 95):.3f} (5-95%); H2: reference {reference_h[1]:.3f}, "
+              f"sampled {np.percentile(sampled[:, 1], 5):.3f}-{np.percentile(sampled[:, 1], 95):.3f}")
+        print(f"    Section findings (lift >= {MIN_LIFT}, count >= {MIN_COUNT}): {findings}, "
+              f"{findings - fragile} robust to every reading, {fragile} depend on doubtful readings")
+        fragile_rows.sort(key=lambda row: row[3] - row[2])
+        for section, name, ref_lift, low_lift, count, count_low, count_high in fragile_rows[:TOP_N]:
+            print(f"      {name:<12} {section:<16} lift {ref_lift:.2f} (lower bound {low_lift:.2f}), "
+                  f"count {int(count)} (readings give {int(count_low)}-{int(count_high)})")
+
+    with open(OUTPUT_FILE, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["Kind", "Item", "Section", "Reference count", "Expected count", "Min count", "Max count",
+                         "Reference lift", "Expected lift", "Min lift", "Max lift", "Robust"])
+        writer.writerows(rows)
+    print(f"\n💾 Saved counts and lift bounds per section to '{OUTPUT_FILE}'")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,200 @@
+import argparse
+import csv
+import time
+from collections import defaultdict
+from eva_glyphs import GlyphTokenizer
+from token_table import import_pyarrow, read_tokens, TOKEN_TABLE_FILE
+from transcriber_alignment import pad_sequences, align_pairs
+from instrumentation import stage
+
+# --- CONFIGURATION ---
+WORD_BAND = 3                     # Band of the word-level alignment (widened to the length difference)
+GLYPH_BAND = 3                    # Band of the glyph-level alignment of substituted words
+GLYPH_INVENTORY = "basic"
+CONTESTED = 0.5                   # Disagreement at or above which a token counts as contested
+TOP_N = 15                        # Glyph confusions printed
+OUTPUT_TOKENS_FILE = "token_disagreement.parquet"
+OUTPUT_CONFUSION_FILE = "glyph_confusion.csv"
+OUTPUT_PAIRS_FILE = "transcriber_agreement.csv"
+
+# ==============================================================================
+#    TRANSCRIBER ALIGNMENT: where do the readings of a line disagree?
+# ==============================================================================
+# voynich.txt has up to six readings of a line (H, C, F, N, U, V, ...). The
+# token table (17) holds each reading's words in order, so every pair of
+# readings of every locus is aligned word by word (banded edit distance,
+# batched over all loci; transcriber_alignment.py), and every pair of
+# different aligned words is aligned again glyph by glyph (basic EVA
+# glyphs, each distinct word pair once).
+#
+# A token's disagreement is its mean cost over the other readings of its
+# line: 0 where the other reading has the same word, the glyph distance /
+# longer word length where it has a different one, 1 where it has none.
+# OUTPUT_TOKENS_FILE has one row per token-table row, in the same order, so
+# other analyses can weight or drop contested tokens:
+#
+#   tokens = read_tokens(columns=["folio", "line", "transcriber", "position", "word"])
+#   scores = pq.read_table(OUTPUT_TOKENS_FILE, columns=["disagreement"])
+#
+# The glyph confusion matrix counts every aligned glyph pair in both
+# directions ('-' = no glyph), the same words included on the diagonal.
+
+def load_readings():
+    """(word codes, word types, folio/line/transcriber/position columns) of every token, in file order."""
+    import numpy as np
+    table = read_tokens(columns=["folio", "line", "transcriber", "position", "word"])
+    words = table["word"].combine_chunks().dictionary_encode()
+    columns = {name: table[name].to_numpy(zero_copy_only=False) for name in ("folio", "line", "transcriber", "position")}
+    return words.indices.to_numpy().astype(np.int32), words.dictionary.to_pylist(), columns
+
+def reading_pairs(columns):
+    """
+    (reading offsets into the token rows, transcriber of each reading,
+    reading pairs: every two readings of the same locus).
+    """
+    import numpy as np
+    starts = np.flatnonzero(columns["position"] == 0)
+    offsets = np.r_[starts, len(columns["position"])]
+    by_locus = defaultdict(list)
+    for reading, row in enumerate(starts):
+        by_locus[(columns["folio"][row], columns["line"][row])].append(reading)
+    pairs = [(first, second) for readings in by_locus.values()
+             for k, first in enumerate(readings) for second in readings[k + 1:]]
+    return offsets, columns["transcriber"][starts], np.array(pairs, dtype=np.int64).reshape(-1, 2)
+
+def glyph_costs(word_types, type_pairs, band, inventory):
+    """
+    Glyph alignment of each distinct (word, word) pair. Returns (normalized
+    distance per pair, glyph names, glyph steps (pair, glyph a or gap, glyph b
+    or gap), glyph ids and offsets of every word type).
+    """
+    import numpy as np
+    tokenizer = GlyphTokenizer(inventory)
+    ids, offsets = tokenizer.encode_words(word_types)
+    padded, lengths = pad_sequences(ids, offsets)
+    distances, steps = align_pairs(padded, lengths, type_pairs, band)
+    gap = len(tokenizer.glyphs)
+    first, second = type_pairs[steps[:, 0], 0], type_pairs[steps[:, 0], 1]
+    glyph_a = np.where(steps[:, 1] >= 0, padded[first, np.maximum(steps[:, 1], 0)], gap)
+    glyph_b = np.where(steps[:, 2] >= 0, padded[second, np.maximum(steps[:, 2], 0)], gap)
+    longest = np.maximum(np.maximum(lengths[type_pairs[:, 0]], lengths[type_pairs[:, 1]]), 1)
+    return distances / longest, list(tokenizer.glyphs), (steps[:, 0], glyph_a, glyph_b), (ids, offsets)
+
+def main(argv=None):
+    import numpy as np
+    parser = argparse.ArgumentParser(description="Align all transcriber readings of every line; token disagreement and glyph confusions.")
+    parser.add_argument("--word-band", type=int, default=WORD_BAND)
+    parser.add_argument("--glyph-band", type=int, default=GLYPH_BAND)
+    args = parser.parse_args(argv)
+
+    print("Step 1: Reading every transcriber's words from the token table...")
+    try:
+        with stage("load"):
+            word_codes, word_types, columns = load_readings()
+    except FileNotFoundError:
+        print(f"ERROR: Token table '{TOKEN_TABLE_FILE}' not found. Please run 17_build_token_table.py first.")
+        return
+    offsets, reading_transcriber, pairs = reading_pairs(columns)
+    print(f" -> {len(word_codes):,} tokens in {len(offsets) - 1:,} readings, {len(pairs):,} reading pairs on the same line")
+
+    print(f"Step 2: Word-level alignment (band {args.word_band})...")
+    start_time = time.perf_counter()
+    with stage("align_words") as align_stage:
+        padded, lengths = pad_sequences(word_codes, offsets)
+        word_distances, steps = align_pairs(padded, lengths, pairs, args.word_band)
+        align_stage.add_tokens(len(word_codes))
+    word_time = time.perf_counter() - start_time
+    pair_of, step_a, step_b = steps[:, 0], steps[:, 1], steps[:, 2]
+    row_a = np.where(step_a >= 0, offsets[pairs[pair_of, 0]] + step_a, -1)
+    row_b = np.where(step_b >= 0, offsets[pairs[pair_of, 1]] + step_b, -1)
+    both = (row_a >= 0) & (row_b >= 0)
+    substituted = both & (word_codes[row_a] != word_codes[row_b])
+    print(f" -> {len(steps):,} alignment columns in {word_time:.2f}s: {int((both & ~substituted).sum()):,} same word, "
+          f"{int(substituted.sum()):,} different word, {int((~both).sum()):,} word in one reading only")
+
+    print(f"Step 3: Glyph-level alignment of the different words (band {args.glyph_band})...")
+    start_time = time.perf_counter()
+    with stage("align_glyphs"):
+        type_a, type_b = word_codes[row_a[substituted]], word_codes[row_b[substituted]]
+        keys = np.minimum(type_a, type_b).astype(np.int64) * len(word_types) + np.maximum(type_a, type_b)
+        unique_keys, type_pair_of, occurrences = np.unique(keys, return_inverse=True, return_counts=True)
+        type_pairs = np.stack([unique_keys // len(word_types), unique_keys % len(word_types)], axis=1)
+        normalized, glyphs, (glyph_pair, glyph_a, glyph_b), (glyph_ids, glyph_offsets) = glyph_costs(
+            word_types, type_pairs, args.glyph_band, GLYPH_INVENTORY)
+    glyph_time = time.perf_counter() - start_time
+    print(f" -> {len(type_pairs):,} distinct word pairs ({int(substituted.sum()):,} occurrences) in {glyph_time:.2f}s")
+
+    # Token disagreement: mean cost over the other readings of the line
+    cost = np.ones(len(steps))
+    cost[both] = 0.0
+    cost[substituted] = normalized[type_pair_of]
+    total = np.bincount(row_a[row_a >= 0], weights=cost[row_a >= 0], minlength=len(word_codes))
+    total += np.bincount(row_b[row_b >= 0], weights=cost[row_b >= 0], minlength=len(word_codes))
+    reading_of_row = np.repeat(np.arange(len(lengths)), lengths)
+    other_readings = np.bincount(pairs.ravel(), minlength=len(lengths))   # Other readings of the same line
+    compared = other_readings[reading_of_row]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        disagreement = np.where(compared > 0, total / compared, np.nan)
+
+    # Glyph confusions: different words by alignment (x occurrences), same words on the diagonal
+    n_glyphs = len(glyphs) + 1
+    weights = occurrences[glyph_pair].astype(np.float64)
+    confusion = np.bincount(glyph_a * n_glyphs + glyph_b, weights=weights, minlength=n_glyphs ** 2)
+    confusion += np.bincount(glyph_b * n_glyphs + glyph_a, weights=weights, minlength=n_glyphs ** 2)
+    same_types = word_codes[row_a[both & ~substituted]]
+    same_per_type = np.bincount(same_types, minlength=len(word_types))
+    glyph_owner = np.repeat(np.arange(len(word_types)), np.diff(glyph_offsets))
+    same_glyphs = np.bincount(glyph_ids, weights=same_per_type[glyph_owner], minlength=n_glyphs)
+    confusion = confusion.reshape(n_glyphs, n_glyphs)
+    confusion[np.arange(n_glyphs), np.arange(n_glyphs)] += 2 * same_glyphs
+
+    pa, pq = import_pyarrow()
+    pq.write_table(pa.table({
+        "folio": columns["folio"], "line": columns["line"], "transcriber": columns["transcriber"],
+        "position": columns["position"], "word": [word_types[c] for c in word_codes],
+        "compared": compared.astype(np.int16), "disagreement": disagreement.astype(np.float32),
+    }), OUTPUT_TOKENS_FILE)
+
+    names = glyphs + ["-"]
+    with open(OUTPUT_CONFUSION_FILE, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["Glyph"] + names)
+        for g, name in enumerate(names):
+            writer.writerow([name] + [int(c) for c in confusion[g]])
+
+    # Per transcriber pair: word edits per aligned word, glyph edits per glyph
+    pair_names = [tuple(sorted((reading_transcriber[a], reading_transcriber[b]))) for a, b in pairs]
+    glyph_edits = np.bincount(pair_of[substituted], weights=normalized[type_pair_of], minlength=len(pairs))
+    summary = defaultdict(lambda: np.zeros(4))
+    for k, name in enumerate(pair_names):
+        summary[name] += (1, lengths[pairs[k, 0]] + lengths[pairs[k, 1]], word_distances[k], glyph_edits[k])
+    with open(OUTPUT_PAIRS_FILE, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["Transcriber A", "Transcriber B", "Loci", "Words", "Word edits", "Word edit rate",
+                         "Different-word glyph cost"])
+        for (first, second), (loci, words, edits, glyph_cost) in sorted(summary.items(), key=lambda item: -item[1][0]):
+            writer.writerow([first, second, int(loci), int(words), int(edits), round(2 * edits / max(words, 1), 4),
+                             round(float(glyph_cost), 2)])
+
+    print("\n--- Token disagreement per transcriber (tokens with another reading of their line) ---")
+    for transcriber in sorted(set(columns["transcriber"]), key=lambda t: -np.count_nonzero(columns["transcriber"] == t)):
+        rows = (columns["transcriber"] == transcriber) & (compared > 0)
+        if rows.sum():
+            print(f"  {transcriber}: {int(rows.sum()):>6,} tokens, mean disagreement {np.nanmean(disagreement[rows]):.3f}, "
+                  f"{(disagreement[rows] >= CONTESTED).mean():.1%} contested (>= {CONTESTED})")
+    print("\n--- Most frequent glyph confusions (share of the first glyph's aligned occurrences) ---")
+    off_diagonal = confusion.copy()
+    np.fill_diagonal(off_diagonal, 0)
+    upper = np.triu_indices(n_glyphs, 1)
+    top = np.argsort(-off_diagonal[upper])[:TOP_N]
+    row_totals = confusion.sum(axis=1)
+    for k in top:
+        g, h = upper[0][k], upper[1][k]
+        print(f"  {names[g]:>4} <-> {names[h]:<4} {int(off_diagonal[g, h]):>6,}  "
+              f"({off_diagonal[g, h] / row_totals[g]:.1%} of '{names[g]}', {off_diagonal[g, h] / row_totals[h]:.1%} of '{names[h]}')")
+    print(f"\n✅ Aligned {len(pairs):,} reading pairs in {word_time + glyph_time:.2f}s.")
+    print(f"💾 Saved token disagreement to '{OUTPUT_TOKENS_FILE}', glyph confusions to '{OUTPUT_CONFUSION_FILE}' "
+          f"and transcriber agreement to '{OUTPUT_PAIRS_FILE}'")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+import argparse
+import csv
+import json
+import re
+import time
+from collections import Counter
+from line_positions import POSITION_CLASSES, PARAGRAPH_INITIAL, LINE_INITIAL, LINE_FINAL, INTERIOR
+from repetition_index import (REPETITION_INDEX_FILE, EDIT_KINDS, readable, neighbour_codes, find_repeats,
+                              edit_kinds, repeat_runs)
+from instrumentation import stage
+
+# --- CONFIGURATION ---
+VOYNICH_SOURCE_FILE = "voynich_ready_nlp.txt"   # The lines the translator (10b) reads
+SECTION_MAP_FILE = "section_map.json"
+LINE_POSITIONS_FILE = "voynich_ready_lines.csv" # Optional: paragraph-initial lines (01)
+WINDOW = 3                                      # Tokens ahead searched for a repeat
+MIN_NEAR_LENGTH = 3                             # Shorter words are only repeated exactly ('ol'/'or' is no variant)
+SHUFFLES = 20                                   # Within-line shuffles for the chance baseline
+SEED = 1409
+TOP_N = 12
+OUTPUT_INDEX_FILE = REPETITION_INDEX_FILE
+OUTPUT_SUMMARY_FILE = "repetition_summary.csv"
+
+# ==============================================================================
+#    REPETITION INDEX: exact and near repeats of a word within a few tokens
+# ==============================================================================
+# The synthesizer (10b) only notices a word followed by the very same word.
+# Here every token of voynich_ready_nlp.txt (split as 10b splits it) is
+# checked against the next WINDOW tokens of its line for an exact repeat or
+# a one-edit variant ('qokeedy qokedy'), using deletion-neighbourhood keys
+# (repetition_index.py). Words with an unreadable glyph are skipped. Adjacent repeats are chained into runs. Every
+# repeat pair is grouped by:
+#   - family: the more frequent of its two words;
+#   - section;
+#   - position of its first token (line_positions.POSITION_CLASSES).
+# Repeat counts are compared with the same text shuffled within each line.
+# OUTPUT_INDEX_FILE is what 10b reads when USE_REPETITION_INDEX is set.
+
+def load_lines(source_file):
+    """Word lists of every clean line, split exactly as 10b splits them."""
+    with open(source_file, "r", encoding="utf-8") as f:
+        return [[w for w in re.sub(r'<@[^>]+>', '', line).split() if w] for line in f.read().splitlines()]
+
+def load_paragraph_starts(path, n_lines):
+    """Set of clean lines that start a paragraph; every line if the file is missing."""
+    try:
+        with open(path, "r", encoding="utf-8", newline="") as f:
+            return {int(row["clean_paragraph"]) for row in csv.DictReader(f) if row["line_in_paragraph"] == "0"}
+    except FileNotFoundError:
+        return set(range(n_lines))
+
+def token_positions(line_ids, paragraph_start_lines):
+    """POSITION_CLASSES index of every token, lines given in order."""
+    import numpy as np
+    starts = np.r_[True, line_ids[1:] != line_ids[:-1]]
+    ends = np.r_[line_ids[1:] != line_ids[:-1], True]
+    classes = np.full(len(line_ids), INTERIOR, dtype=np.int8)
+    classes[ends] = LINE_FINAL
+    classes[starts] = LINE_INITIAL
+    classes[starts & np.isin(line_ids, list(paragraph_start_lines))] = PARAGRAPH_INITIAL
+    return classes
+
+def shuffled_repeats(word_ids, line_ids, neighbours, n_types, window, ignored, shuffles, rng):
+    """(exact, near) repeat counts of every within-line shuffle."""
+    import numpy as np
+    counts = []
+    for _ in range(shuffles):
+        order = np.lexsort((rng.random(len(word_ids)), line_ids))
+        _, _, distance = find_repeats(word_ids[order], line_ids, neighbours, n_types, window, ignored)
+        counts.append((int((distance == 0).sum()), int((distance == 1).sum())))
+    return np.array(counts)
+
+def main(argv=None):
+    import numpy as np
+    parser = argparse.ArgumentParser(description="Exact and one-edit repeats within a window, by family, position and section.")
+    parser.add_argument("--window", type=int, default=WINDOW)
+    parser.add_argument("--min-length", type=int, default=MIN_NEAR_LENGTH, help="Shortest word with near repeats.")
+    parser.add_argument("--shuffles", type=int, default=SHUFFLES)
+    args = parser.parse_args(argv)
+
+    print(f"Step 1: Reading '{VOYNICH_SOURCE_FILE}'...")
+    try:
+        with stage("load"):
+            lines = load_lines(VOYNICH_SOURCE_FILE)
+            with open(SECTION_MAP_FILE, "r", encoding="utf-8") as f:
+                section_map = json.load(f)
+    except FileNotFoundError as e:
+        print(f"ERROR: File '{e.filename}' not found. Please run 01_generate_clean_data.py first.")
+        return
+    vocabulary, code = [], {}
+    word_ids, line_ids, position_in_line = [], [], []
+    for line_number, words in enumerate(lines):
+        for position, word in enumerate(words):
+            if word not in code:
+                code[word] = len(vocabulary)
+                vocabulary.append(word)
+            word_ids.append(code[word])
+            line_ids.append(line_number)
+            position_in_line.append(position)
+    word_ids, line_ids, position_in_line = np.array(word_ids), np.array(line_ids), np.array(position_in_line)
+    frequency = np.bincount(word_ids, minlength=len(vocabulary))
+    print(f" -> {len(word_ids):,} tokens, {len(vocabulary):,} word types in {len(lines):,} lines")
+
+    print(f"Step 2: Deletion-neighbourhood keys and repeats within {args.window} tokens...")
+    start_time = time.perf_counter()
+    with stage("index") as index_stage:
+        neighbours = neighbour_codes(vocabulary, args.min_length)
+        key_time = time.perf_counter() - start_time
+        ignored = np.array([not readable(word) for word in vocabulary])
+        first, second, distance = find_repeats(word_ids, line_ids, neighbours, len(vocabulary), args.window, ignored)
+        run_ids, run_lengths = repeat_runs(first, second, len(word_ids))
+        index_stage.add_tokens(len(word_ids))
+    elapsed = time.perf_counter() - start_time
+    lengths = np.array([len(w) for w in vocabulary])
+    kinds = edit_kinds(lengths[word_ids[first]], lengths[word_ids[second]], distance)
+    a, b = word_ids[first], word_ids[second]
+    family = np.where((frequency[a] > frequency[b]) | ((frequency[a] == frequency[b]) & (a <= b)), a, b)
+    sections = np.array([section_map.get(str(line)) or "Unknown" for line in range(len(lines))], dtype=object)
+    positions = token_positions(line_ids, load_paragraph_starts(LINE_POSITIONS_FILE, len(lines)))
+    print(f" -> {len(neighbours) // 2:,} one-edit word-type pairs ({key_time * 1000:.0f} ms), "
+          f"{len(first):,} repeat pairs in {elapsed * 1000:.0f} ms total")
+
+    print(f"Step 3: Chance baseline ({args.shuffles} within-line shuffles)...")
+    with stage("baseline"):
+        baseline = shuffled_repeats(word_ids, line_ids, neighbours, len(vocabulary), args.window, ignored,
+                                    args.shuffles, np.random.default_rng(SEED))
+
+    with stage("write"):
+        with open(OUTPUT_INDEX_FILE, "w", encoding="utf-8", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["Line", "First", "Second", "Gap", "Distance", "Edit", "First word", "Second word",
+                             "Family", "Run", "Run length", "Section", "Position"])
+            for k in range(len(first)):
+                run = run_ids[first[k]] if second[k] == first[k] + 1 else -1
+                writer.writerow([int(line_ids[first[k]]), int(position_in_line[first[k]]), int(position_in_line[second[k]]),
+                                 int(second[k] - first[k]), int(distance[k]), EDIT_KINDS[kinds[k]], vocabulary[a[k]],
+                                 vocabulary[b[k]], vocabulary[family[k]], int(run),
+                                 int(run_lengths[run]) if run >= 0 else 0, sections[line_ids[first[k]]],
+                                 POSITION_CLASSES[positions[first[k]]]])
+        groups = Counter()
+        for k in range(len(first)):
+            groups[(vocabulary[family[k]], sections[line_ids[first[k]]], POSITION_CLASSES[positions[first[k]]], int(distance[k]))] += 1
+        with open(OUTPUT_SUMMARY_FILE, "w", encoding="utf-8", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["Family", "Section", "Position", "Exact", "Near", "Family tokens"])
+            keys = sorted({key[:3] for key in groups}, key=lambda key: (-(groups[key + (0,)] + groups[key + (1,)]), key))
+            for name, section, position in keys:
+                writer.writerow([name, section, position, groups[(name, section, position, 0)],
+                                 groups[(name, section, position, 1)], int(frequency[code[name]])])
+
+    exact, near = int((distance == 0).sum()), int((distance == 1).sum())
+    print(f"\n--- Repeats within {args.window} tokens (shuffled-line baseline: mean) ---")
+    print(f"  Exact: {exact:,} (chance {baseline[:, 0].mean():,.0f}); one edit apart: {near:,} (chance {baseline[:, 1].mean():,.0f})")
+    gaps = second - first
+    for gap in range(1, args.window + 1):
+        by_kind = Counter(EDIT_KINDS[k] for k in kinds[gaps == gap])
+        print(f"  Gap {gap}: " + ", ".join(f"{kind} {by_kind[kind]:,}" for kind in EDIT_KINDS))
+    run_histogram = Counter(run_lengths.tolist())
+    print("  Runs of adjacent repeats by length: " + ", ".join(f"{n} tokens x{c}" for n, c in sorted(run_histogram.items())))
+    print("\n--- Repeats per 1,000 tokens by section (exact / near) ---")
+    token_sections = sections[line_ids]
+    for section in sorted(set(token_sections)):
+        tokens = np.count_nonzero(token_sections == section)
+        in_section = sections[line_ids[first]] == section
+        print(f"  {section:<16} {tokens:>6,} tokens  {1000 * np.count_nonzero(in_section & (distance == 0)) / tokens:5.1f} / "
+              f"{1000 * np.count_nonzero(in_section & (distance == 1)) / tokens:5.1f}")
+    print("\n--- Repeats by position of the first token (exact / near) ---")
+    for c, name in enumerate(POSITION_CLASSES):
+        at = positions[first] == c
+        if not at.any():
+            continue    # A repeat never starts on the last word of a line
+        print(f"  {name:<18} {np.count_nonzero(at & (distance == 0)):>5,} / {np.count_nonzero(at & (distance == 1)):,}")
+    print("\n--- Most repeated families (exact / near) ---")
+    family_counts = Counter(zip(family.tolist(), distance.tolist()))
+    top = sorted({f for f, _ in family_counts}, key=lambda f: -(family_counts[(f, 0)] + family_counts[(f, 1)]))[:TOP_N]
+    for f in top:
+        print(f"  {vocabulary[f]:<12} {family_counts[(f, 0)]:>4} / {family_counts[(f, 1)]:<4} ({frequency[f]:,} tokens)")
+    print(f"\n💾 Saved {len(first):,} repeat pairs to '{OUTPUT_INDEX_FILE}' and the family/section/position summary "
+          f"to '{OUTPUT_SUMMARY_FILE}'")
+
+if __name__ == "__main__":
+    main()
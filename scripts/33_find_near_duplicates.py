@@ -0,0 +1,227 @@
+import argparse
+import csv
+import json
+import time
+from collections import Counter
+from eva_glyphs import GlyphTokenizer
+from minhash_lsh import (sorted_distinct, ragged_gather, ngram_shingles, identical_documents, minhash_signatures,
+                         lsh_candidates, estimated_jaccard, exact_jaccard, connected_components)
+from token_table import read_tokens, TOKEN_TABLE_FILE
+from instrumentation import stage
+
+# --- CONFIGURATION ---
+TRANSCRIBER = "H"                  # 'all' compares every transcriber's readings (never a line with itself)
+UNITS = ["line", "paragraph"]
+SHINGLES = {"word": 2, "glyph": 4} # Shingle kind -> n-gram length (glyph n-grams run across word breaks)
+GLYPH_INVENTORY = "basic"
+NUM_PERM = 128                     # MinHash functions
+BANDS = 32                         # LSH bands of NUM_PERM // BANDS rows: candidate at J = 0.5 87%, 0.6 99%
+MIN_WORDS = 4                      # Shorter documents (labels, single words) are skipped
+JACCARD_THRESHOLD = 0.5            # Exact Jaccard of a reported pair
+ESTIMATE_MARGIN = 0.15             # Candidates estimated below threshold - margin (> 3 s.d. at 128 hashes) are not verified
+SEED = 1409
+TOP_N = 10
+OUTPUT_CLUSTERS_FILE = "near_duplicate_clusters.csv"
+OUTPUT_PAIRS_FILE = "near_duplicate_pairs.csv"
+
+# ==============================================================================
+#    NEAR DUPLICATES: lines and paragraphs that are near-copies of each other
+# ==============================================================================
+# Every line and every paragraph of the token table (17) becomes a set of
+# shingles: word bigrams, and glyph 4-grams of the text with word breaks.
+# Exact copies are grouped first; MinHash signatures and LSH banding
+# (minhash_lsh.py) give candidate pairs among the rest in time linear in the
+# number of documents; each candidate is then verified by the exact Jaccard similarity of its shingle sets, and the
+# verified pairs are joined into clusters (connected components) reported
+# with their folio locations and sections. '--text FILE' runs the same pass
+# over any one-line-per-row corpus (e.g. voynich_synthetic_nlp.txt), with
+# rows as lines.
+
+def load_documents(transcriber):
+    """(word codes, word types, {unit: (document offsets, locations, sections, locus keys)}) from the token table."""
+    import numpy as np
+    filters = None if transcriber == "all" else [("transcriber", "=", transcriber)]
+    table = read_tokens(columns=["folio", "paragraph", "line", "position", "section", "transcriber", "word"], filters=filters)
+    transcribers = table["transcriber"].combine_chunks().dictionary_encode().indices.to_numpy()
+    order = np.argsort(transcribers, kind="stable")      # One transcriber after the other, each in file order
+    table = table.take(order)
+    words = table["word"].combine_chunks().dictionary_encode()
+    folio = np.array(table["folio"].to_pylist(), dtype=object)
+    line = np.array(table["line"].to_pylist(), dtype=object)
+    paragraph = table["paragraph"].to_numpy()
+    section = np.array(table["section"].to_pylist(), dtype=object)
+    who = np.array(table["transcriber"].to_pylist(), dtype=object)
+    starts = {"line": np.flatnonzero(table["position"].to_numpy() == 0)}
+    changed = (folio[1:] != folio[:-1]) | (paragraph[1:] != paragraph[:-1]) | (who[1:] != who[:-1])
+    starts["paragraph"] = np.flatnonzero(np.r_[True, changed]) if len(folio) else np.zeros(0, dtype=np.int64)
+    documents = {}
+    for unit, unit_starts in starts.items():
+        offsets = np.r_[unit_starts, len(folio)].astype(np.int64)
+        last = offsets[1:] - 1
+        if unit == "line":
+            locations = [f"{folio[s]}.{line[s]}" for s in unit_starts]
+            loci = [(folio[s], line[s]) for s in unit_starts]
+        else:
+            locations = [f"{folio[s]} P{paragraph[s] + 1} ({line[s]}-{line[e]})" for s, e in zip(unit_starts, last)]
+            loci = [(folio[s], paragraph[s]) for s in unit_starts]
+        if transcriber == "all":
+            locations = [f"{location};{who[s]}" for location, s in zip(locations, unit_starts)]
+        documents[unit] = (offsets, locations, [section[s] or "Unknown" for s in unit_starts], loci)
+    return words.indices.to_numpy().astype(np.int64), words.dictionary.to_pylist(), documents
+
+def load_text_documents(path, section_map_path):
+    """Same as load_documents for a plain corpus: one document per row, 'line' unit only."""
+    import numpy as np
+    with open(path, "r", encoding="utf-8") as f:
+        rows = [line.split() for line in f.read().splitlines()]
+    try:
+        with open(section_map_path, "r", encoding="utf-8") as f:
+            section_map = json.load(f)
+    except (FileNotFoundError, TypeError):
+        section_map = {}
+    vocabulary, code, word_codes = [], {}, []
+    for words in rows:
+        for word in words:
+            if word not in code:
+                code[word] = len(vocabulary)
+                vocabulary.append(word)
+            word_codes.append(code[word])
+    offsets = np.r_[0, np.cumsum([len(words) for words in rows])].astype(np.int64)
+    locations = [f"row {i + 1}" for i in range(len(rows))]
+    sections = [section_map.get(str(i)) or "Unknown" for i in range(len(rows))]
+    return np.array(word_codes, dtype=np.int64), vocabulary, {"line": (offsets, locations, sections, list(range(len(rows))))}
+
+def glyph_stream(word_codes, offsets, word_types, inventory):
+    """(glyph ids of every document with a break symbol after each word, offsets, number of symbols)."""
+    import numpy as np
+    tokenizer = GlyphTokenizer(inventory)
+    glyph_ids, glyph_offsets = tokenizer.encode_words(word_types)
+    word_break = len(tokenizer.glyphs)
+    token_glyphs, _ = ragged_gather(glyph_ids, glyph_offsets, word_codes)
+    token_lengths = np.diff(glyph_offsets)[word_codes]
+    token_offsets = np.r_[0, np.cumsum(token_lengths + 1)].astype(np.int64)
+    stream = np.full(int(token_offsets[-1]), word_break, dtype=np.int64)
+    owner = np.repeat(np.arange(len(word_codes)), token_lengths)
+    stream[np.arange(len(token_glyphs)) + owner] = token_glyphs     # Every earlier token added one break
+    return stream, token_offsets[offsets], word_break + 1
+
+def find_clusters(codes, offsets, valid, loci, args):
+    """(first, second, jaccard of verified pairs, candidates, component labels, closest candidate pair (a, b, jaccard))."""
+    import numpy as np
+    # Exact copies: only one representative per shingle set is hashed, the others pair with it at Jaccard 1
+    representative = identical_documents(codes, offsets)
+    copies = np.flatnonzero(valid & (representative != np.arange(len(representative))))
+    unique_docs = np.flatnonzero(valid & (representative == np.arange(len(representative))))
+    unique_codes, unique_offsets = ragged_gather(codes, offsets, unique_docs)
+    signatures = minhash_signatures(unique_codes, unique_offsets, args.num_perm, SEED)
+    first, second = lsh_candidates(signatures, args.bands)
+    candidates = len(first) + len(copies)
+    likely = estimated_jaccard(signatures, first, second) >= args.threshold - ESTIMATE_MARGIN
+    first, second = unique_docs[first[likely]], unique_docs[second[likely]]
+    jaccard = np.r_[exact_jaccard(codes, offsets, first, second), np.ones(len(copies))]
+    first, second = np.r_[first, representative[copies]], np.r_[second, copies]
+    if loci is not None:
+        # Readings of the same line/paragraph by different transcribers are not duplicates
+        locus_ids = {locus: i for i, locus in enumerate(dict.fromkeys(loci))}
+        locus_of = np.array([locus_ids[locus] for locus in loci])
+        distinct = locus_of[first] != locus_of[second]
+        first, second, jaccard = first[distinct], second[distinct], jaccard[distinct]
+    keep = jaccard >= args.threshold
+    labels = connected_components(len(offsets) - 1, first[keep], second[keep])
+    closest = (first[np.argmax(jaccard)], second[np.argmax(jaccard)], jaccard.max()) if len(jaccard) else None
+    return first[keep], second[keep], jaccard[keep], candidates, labels, closest
+
+def main(argv=None):
+    import numpy as np
+    parser = argparse.ArgumentParser(description="MinHash/LSH near-duplicate lines and paragraphs, verified by exact Jaccard.")
+    parser.add_argument("--transcriber", default=TRANSCRIBER, help="Transcriber, or 'all'.")
+    parser.add_argument("--text", help="Plain corpus (one row per line) instead of the token table.")
+    parser.add_argument("--section-map", help="Section map JSON for --text.")
+    parser.add_argument("--units", nargs="+", default=UNITS, choices=UNITS)
+    parser.add_argument("--shingles", nargs="+", default=list(SHINGLES), choices=list(SHINGLES))
+    parser.add_argument("--num-perm", type=int, default=NUM_PERM)
+    parser.add_argument("--bands", type=int, default=BANDS)
+    parser.add_argument("--threshold", type=float, default=JACCARD_THRESHOLD)
+    parser.add_argument("--min-words", type=int, default=MIN_WORDS)
+    args = parser.parse_args(argv)
+
+    print(f"Step 1: Reading documents from '{args.text or TOKEN_TABLE_FILE}'...")
+    try:
+        with stage("load"):
+            if args.text:
+                word_codes, word_types, documents = load_text_documents(args.text, args.section_map)
+            else:
+                word_codes, word_types, documents = load_documents(args.transcriber)
+    except FileNotFoundError:
+        print(f"ERROR: '{args.text or TOKEN_TABLE_FILE}' not found."
+              + ("" if args.text else " Please run 17_build_token_table.py first."))
+        return
+    units = [unit for unit in args.units if unit in documents]
+    print(f" -> {len(word_codes):,} tokens; " + ", ".join(f"{len(documents[u][1]):,} {u}s" for u in units))
+
+    with open(OUTPUT_CLUSTERS_FILE, "w", encoding="utf-8", newline="") as clusters_file, \
+            open(OUTPUT_PAIRS_FILE, "w", encoding="utf-8", newline="") as pairs_file:
+        cluster_writer, pair_writer = csv.writer(clusters_file), csv.writer(pairs_file)
+        cluster_writer.writerow(["Unit", "Shingles", "Cluster", "Cluster size", "Location", "Section", "Best Jaccard", "Text"])
+        pair_writer.writerow(["Unit", "Shingles", "Location A", "Location B", "Section A", "Section B", "Jaccard"])
+        for unit in units:
+            offsets, locations, sections, loci = documents[unit]
+            valid = np.diff(offsets) >= args.min_words
+            for kind in args.shingles:
+                start_time = time.perf_counter()
+                with stage(f"{unit}:{kind}") as pass_stage:
+                    if kind == "word":
+                        symbols, symbol_offsets, n_symbols = word_codes, offsets, len(word_types)
+                    else:
+                        symbols, symbol_offsets, n_symbols = glyph_stream(word_codes, offsets, word_types, GLYPH_INVENTORY)
+                    codes, code_offsets = ngram_shingles(symbols, symbol_offsets, SHINGLES[kind], n_symbols)
+                    first, second, jaccard, candidates, labels, closest = find_clusters(
+                        codes, code_offsets, valid, loci if args.transcriber == "all" and not args.text else None, args)
+                    pass_stage.add_tokens(len(word_codes))
+                elapsed = time.perf_counter() - start_time
+
+                # Cluster members ordered by cluster rank (largest first), then document
+                members = sorted_distinct(np.r_[first, second])
+                cluster_labels, label_index, sizes = np.unique(labels[members], return_inverse=True, return_counts=True)
+                rank_of_label = np.empty(len(cluster_labels), dtype=np.int64)
+                rank_of_label[np.lexsort((cluster_labels, -sizes))] = np.arange(len(cluster_labels))
+                member_rank = rank_of_label[label_index]
+                order = np.lexsort((members, member_rank))
+                members, member_rank = members[order], member_rank[order]
+                bounds = np.r_[0, np.cumsum(np.sort(sizes)[::-1])]
+                best = np.zeros(len(offsets) - 1)
+                np.maximum.at(best, first, jaccard)
+                np.maximum.at(best, second, jaccard)
+
+                n_valid = int(valid.sum())
+                print(f"\n--- {unit}s, {kind} {SHINGLES[kind]}-gram shingles: {n_valid:,} documents of >= "
+                      f"{args.min_words} words, {candidates:,} LSH candidates "
+                      f"({candidates / max(n_valid * (n_valid - 1) / 2, 1):.3%} of all pairs), {len(first):,} pairs "
+                      f"with Jaccard >= {args.threshold}, {len(cluster_labels):,} clusters ({elapsed:.2f}s) ---")
+                if closest is not None:
+                    print(f"    Closest pair: {locations[closest[0]]} ~ {locations[closest[1]]} (Jaccard {closest[2]:.3f})")
+                if not len(members):
+                    continue
+                in_clusters = Counter(sections[d] for d in members)
+                per_section = Counter(sections[d] for d in np.flatnonzero(valid))
+                print("    Share of documents in a cluster: " + ", ".join(
+                    f"{section} {in_clusters[section] / per_section[section]:.1%}" for section in sorted(per_section)))
+                for rank in range(min(TOP_N, len(cluster_labels))):
+                    cluster_members = members[bounds[rank]:bounds[rank + 1]]
+                    listed = ", ".join(locations[d] for d in cluster_members[:6])
+                    more = f" + {len(cluster_members) - 6} more" if len(cluster_members) > 6 else ""
+                    print(f"    #{rank + 1:<3} {len(cluster_members):>3} {unit}s: {listed}{more}")
+
+                with stage("write"):
+                    for d, rank in zip(members, member_rank):
+                        cluster_writer.writerow([unit, kind, int(rank) + 1, int(bounds[rank + 1] - bounds[rank]), locations[d],
+                                                 sections[d], round(float(best[d]), 4),
+                                                 " ".join(word_types[c] for c in word_codes[offsets[d]:offsets[d + 1]])])
+                    for k in np.argsort(-jaccard, kind="stable"):
+                        a, b = first[k], second[k]
+                        pair_writer.writerow([unit, kind, locations[a], locations[b], sections[a], sections[b],
+                                              round(float(jaccard[k]), 4)])
+    print(f"\n💾 Saved near-duplicate clusters to '{OUTPUT_CLUSTERS_FILE}' and verified pairs to '{OUTPUT_PAIRS_FILE}'")
+
+if __name__ == "__main__":
+    main()
@@ -1,74 +1,130 @@
-import matplotlib.pyplot as plt
-import numpy as np
-import pandas as pd
-import io
-
-# --- Data from dialect_quantification.csv ---
-# We embed the data directly into the script for simplicity.
-csv_data = """
-concept,freq_A_per_1000,freq_B_per_1000
-aii,131.39,83.01
-che,71.56,82.73
-cho,53.33,29.57
-ol,30.39,70.61
-kch,35.19,17.56
-teo,6.21,9.66
-f,0.43,0.36
-et,0.33,0.26
-yk,1.28,0.57
-ro,0.29,0.28
-tai,6.45,5.16
-ek,0.24,0.62
-"""
-
-# Read the data into a pandas DataFrame
-data = pd.read_csv(io.StringIO(csv_data))
-
-# --- Combine 'et' and 'yk' into a single "Root Concepts" category ---
-et_yk_a = data[data['concept'].isin(['et', 'yk'])]['freq_A_per_1000'].sum()
-et_yk_b = data[data['concept'].isin(['et', 'yk'])]['freq_B_per_1000'].sum()
-
-# Remove old rows and add the new combined row
-data = data[~data['concept'].isin(['et', 'yk'])]
-new_row = pd.DataFrame([{'concept': 'et/yk (Root)', 'freq_A_per_1000': et_yk_a, 'freq_B_per_1000': et_yk_b}])
-data = pd.concat([new_row, data]).reset_index(drop=True)
-
-
-# --- Select and reorder concepts for the chart for better storytelling ---
-concepts_to_plot = [
-    'aii', 'ol', 'kch', 'teo',  # Planetary/Abstract
-    'f', 'et/yk (Root)',       # Physical/Botanical
-    'che', 'cho'               # Material
-]
-plot_data = data[data['concept'].isin(concepts_to_plot)].set_index('concept').reindex(concepts_to_plot)
-
-
-# --- Chart Generation ---
-labels = plot_data.index
-freq_a = plot_data['freq_A_per_1000']
-freq_b = plot_data['freq_B_per_1000']
-
-x = np.arange(len(labels))  # the label locations
-width = 0.35  # the width of the bars
-
-# Create the plot
-fig, ax = plt.subplots(figsize=(12, 7))
-rects1 = ax.bar(x - width/2, freq_a, width, label='Dialect A (Fundamental)', color='#00796b')
-rects2 = ax.bar(x + width/2, freq_b, width, label='Dialect B (Applied)', color='#80cbc4')
-
-# Add some text for labels, title and axes ticks
-ax.set_ylabel('Frequency per 1,000 Roots')
-ax.set_title('Dialect Fingerprint: Quantitative Comparison of Key Concepts', fontsize=16, pad=20)
-ax.set_xticks(x)
-ax.set_xticklabels(labels, rotation=45, ha="right")
-ax.legend()
-
-# Add value labels on top of the bars
-ax.bar_label(rects1, padding=3, fmt='%.2f')
-ax.bar_label(rects2, padding=3, fmt='%.2f')
-
-# Improve layout and save the file
-fig.tight_layout()
-plt.savefig('appendix_C_chart.png', dpi=300)
-
-print("Chart 'appendix_C_chart.png' has been successfully generated.")
\ No newline at end of file
+import csv
+import io
+import os
+from instrumentation import traced
+from chart_renderer import ChartJob, render_charts, report, save_figure
+
+# --- Data from dialect_quantification.csv ---
+# We embed the data directly into the script for simplicity.
+csv_data = """
+concept,freq_A_per_1000,freq_B_per_1000
+aii,131.39,83.01
+che,71.56,82.73
+cho,53.33,29.57
+ol,30.39,70.61
+kch,35.19,17.56
+teo,6.21,9.66
+f,0.43,0.36
+et,0.33,0.26
+yk,1.28,0.57
+ro,0.29,0.28
+tai,6.45,5.16
+ek,0.24,0.62
+"""
+
+OUTPUT_CHART = 'appendix_C_chart.png'
+# Written by 22_bootstrap_dialect_fingerprint.py; when present and its frequencies
+# equal the embedded table, the chart draws its 95% folio-bootstrap intervals as error bars.
+BOOTSTRAP_FILE = 'dialect_fingerprint_bootstrap.csv'
+STYLE = {"figsize": [12, 7], "color_a": "#00796b", "color_b": "#80cbc4", "dpi": 300}
+
+def bootstrap_matches_table(path=BOOTSTRAP_FILE):
+    """True if the bootstrap CSV has the embedded table's frequencies for every concept."""
+    with open(path, 'r', encoding='utf-8') as f:
+        bootstrap = {row['concept']: row for row in csv.DictReader(f)}
+    for row in csv.DictReader(io.StringIO(csv_data.strip())):
+        other = bootstrap.get(row['concept'])
+        if other is None:
+            return False
+        for column in ('freq_A_per_1000', 'freq_B_per_1000'):
+            if round(float(other[column]), 2) != round(float(row[column]), 2):
+                return False
+    return True
+
+def chart_jobs(style=STYLE):
+    # The embedded csv_data is part of this script's source, which the cache key already covers
+    inputs = []
+    if os.path.exists(BOOTSTRAP_FILE):
+        if bootstrap_matches_table(BOOTSTRAP_FILE):
+            inputs = [BOOTSTRAP_FILE]
+        else:
+            print(f"WARNING: '{BOOTSTRAP_FILE}' does not match the embedded frequencies; drawing the chart without intervals.")
+    return [ChartJob("appendix_chart", "9_generate_appendix_chart", "render_appendix_chart",
+                     inputs, [OUTPUT_CHART], dict(style))]
+
+def generate_appendix_chart():
+    """Renders the Dialect Fingerprint bar chart (Appendix C), unless it is up to date."""
+    report(render_charts(chart_jobs()))
+
+@traced("plot")
+def render_appendix_chart(inputs, outputs, style):
+    """chart_renderer entry point: bootstrap CSV in inputs if chart_jobs matched it to the embedded data, else the embedded data."""
+    # Plotting libraries are imported here so that importing this module stays cheap.
+    import matplotlib.pyplot as plt
+    import numpy as np
+    import pandas as pd
+
+    with_intervals = bool(inputs)
+    if with_intervals:
+        # Bootstrap output already has the combined 'et/yk (Root)' row
+        data = pd.read_csv(inputs[0])
+        print(f"Using frequencies and 95% intervals from '{inputs[0]}'.")
+    else:
+        # Read the data into a pandas DataFrame
+        data = pd.read_csv(io.StringIO(csv_data))
+
+        # --- Combine 'et' and 'yk' into a single "Root Concepts" category ---
+        et_yk_a = data[data['concept'].isin(['et', 'yk'])]['freq_A_per_1000'].sum()
+        et_yk_b = data[data['concept'].isin(['et', 'yk'])]['freq_B_per_1000'].sum()
+
+        # Remove old rows and add the new combined row
+        data = data[~data['concept'].isin(['et', 'yk'])]
+        new_row = pd.DataFrame([{'concept': 'et/yk (Root)', 'freq_A_per_1000': et_yk_a, 'freq_B_per_1000': et_yk_b}])
+        data = pd.concat([new_row, data]).reset_index(drop=True)
+
+
+    # --- Select and reorder concepts for the chart for better storytelling ---
+    concepts_to_plot = [
+        'aii', 'ol', 'kch', 'teo',  # Planetary/Abstract
+        'f', 'et/yk (Root)',       # Physical/Botanical
+        'che', 'cho'               # Material
+    ]
+    plot_data = data[data['concept'].isin(concepts_to_plot)].set_index('concept').reindex(concepts_to_plot)
+
+
+    # --- Chart Generation ---
+    labels = plot_data.index
+    freq_a = plot_data['freq_A_per_1000']
+    freq_b = plot_data['freq_B_per_1000']
+
+    x = np.arange(len(labels))  # the label locations
+    width = 0.35  # the width of the bars
+
+    # Create the plot
+    fig, ax = plt.subplots(figsize=tuple(style["figsize"]))
+    error_a = error_b = None
+    if with_intervals:
+        error_a = [freq_a - plot_data['ci_A_low'], plot_data['ci_A_high'] - freq_a]
+        error_b = [freq_b - plot_data['ci_B_low'], plot_data['ci_B_high'] - freq_b]
+    rects1 = ax.bar(x - width/2, freq_a, width, yerr=error_a, capsize=4, label='Dialect A (Fundamental)', color=style["color_a"])
+    rects2 = ax.bar(x + width/2, freq_b, width, yerr=error_b, capsize=4, label='Dialect B (Applied)', color=style["color_b"])
+
+    # Add some text for labels, title and axes ticks
+    ax.set_ylabel('Frequency per 1,000 Roots')
+    ax.set_title('Dialect Fingerprint: Quantitative Comparison of Key Concepts', fontsize=16, pad=20)
+    ax.set_xticks(x)
+    ax.set_xticklabels(labels, rotation=45, ha="right")
+    ax.legend()
+
+    # Add value labels on top of the bars
+    ax.bar_label(rects1, padding=3, fmt='%.2f')
+    ax.bar_label(rects2, padding=3, fmt='%.2f')
+
+    # Improve layout and save the file
+    fig.tight_layout()
+    save_figure(fig, outputs, dpi=style["dpi"])
+
+    print(f"Chart '{outputs[0]}' has been successfully generated.")
+
+if __name__ == "__main__":
+    generate_appendix_chart()
\ No newline at end of file
@@ -0,0 +1,168 @@
+import ast
+import hashlib
+import json
+import os
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from script_loader import load_script, SCRIPTS_DIR
+
+# ==============================================================================
+#        CHART RENDERER: headless, cached, parallel figure rendering
+# ==============================================================================
+# Every chart is a ChartJob naming a render function in a pipeline script:
+#
+#   ChartJob(name="heatmap", script="02b_plot_thematic_heatmap",
+#            function="render_thematic_heatmap",
+#            inputs=["thematic_analysis_results.csv"], outputs=["thematic_heatmap.png"],
+#            style={"figsize": [12, 18], "dpi": 100})
+#
+# render(inputs, outputs, style) reads its own inputs and writes every output
+# (PNG or SVG, by extension) with save_figure. A job is skipped when all its
+# outputs exist and its cache key is unchanged. The key hashes the input file
+# contents, the style, the output names and the source of the rendering
+# script and of every repo module it depends on (its imports and load_script
+# calls, followed transitively, plus this file). Stale jobs run in worker processes, always on the Agg backend and
+# inside a fresh rc_context, so a seaborn theme cannot leak into the next chart.
+#
+# Cache layout (FIGURE_CACHE_FILE):
+#   {"version", "outputs": {output path: key}, "inputs": {path: [size, mtime, sha256]}}
+
+FIGURE_CACHE_FILE = "figure_cache.json"
+CACHE_VERSION = 2
+
+ChartJob = namedtuple("ChartJob", "name script function inputs outputs style")
+
+def use_agg():
+    """Selects the non-interactive Agg backend (must run before pyplot is imported to be free)."""
+    import matplotlib
+    if matplotlib.get_backend().lower() != "agg":
+        matplotlib.use("Agg")
+
+def save_figure(fig, outputs, dpi=None):
+    """Writes one figure to every output path (format from the extension) and closes it."""
+    import matplotlib.pyplot as plt
+    for path in outputs:
+        fig.savefig(path, dpi=dpi, format=os.path.splitext(path)[1].lstrip(".").lower() or "png")
+    plt.close(fig)
+
+# --- CACHE KEYS ---
+
+def load_cache(path=FIGURE_CACHE_FILE):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            cache = json.load(f)
+        if cache.get("version") == CACHE_VERSION:
+            return cache
+    except (FileNotFoundError, json.JSONDecodeError):
+        pass
+    return {"version": CACHE_VERSION, "outputs": {}, "inputs": {}}
+
+def save_cache(cache, path=FIGURE_CACHE_FILE):
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(cache, f, indent=1, sort_keys=True)
+    os.replace(tmp_path, path)
+
+def file_digest(path, cache):
+    """sha256 of a file, re-hashed only when its size or mtime changed."""
+    stat = os.stat(path)
+    known = cache["inputs"].get(path)
+    if known and known[0] == stat.st_size and known[1] == stat.st_mtime:
+        return known[2]
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    cache["inputs"][path] = [stat.st_size, stat.st_mtime, digest.hexdigest()]
+    return digest.hexdigest()
+
+def local_dependencies(script):
+    """Paths of the script and of the repo modules it imports or load_script()s, transitively, plus this module."""
+    seen, pending = set(), [script, "chart_renderer"]
+    while pending:
+        name = pending.pop()
+        path = os.path.join(SCRIPTS_DIR, f"{name}.py")
+        if name in seen or not os.path.exists(path):
+            continue                        # Already visited, or not a repo module (numpy, os, ...)
+        seen.add(name)
+        with open(path, "r", encoding="utf-8") as f:
+            tree = ast.parse(f.read(), filename=path)
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                pending.extend(alias.name.split(".")[0] for alias in node.names)
+            elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+                pending.append(node.module.split(".")[0])
+            elif (isinstance(node, ast.Call) and getattr(node.func, "id", None) == "load_script"
+                  and node.args and isinstance(node.args[0], ast.Constant)):
+                pending.append(node.args[0].value)
+    return sorted(os.path.join(SCRIPTS_DIR, f"{name}.py") for name in seen)
+
+def job_key(job, cache):
+    key = hashlib.sha256()
+    key.update(json.dumps([CACHE_VERSION, job.script, job.function, list(job.outputs), job.style],
+                          sort_keys=True, default=str).encode("utf-8"))
+    for path in local_dependencies(job.script):
+        key.update(os.path.basename(path).encode("utf-8") + b"\0" + file_digest(path, cache).encode("ascii"))
+    for path in job.inputs:
+        key.update(path.encode("utf-8") + b"\0" + file_digest(path, cache).encode("ascii"))
+    return key.hexdigest()
+
+# --- RENDERING ---
+
+def render_job(job):
+    """Runs one job (in a worker or in-process). Returns (name, seconds, error message or None)."""
+    use_agg()
+    import matplotlib.pyplot as plt
+    start = time.perf_counter()
+    try:
+        with plt.rc_context():
+            getattr(load_script(job.script), job.function)(list(job.inputs), list(job.outputs), dict(job.style))
+    except Exception as e:
+        return job.name, time.perf_counter() - start, f"{type(e).__name__}: {e}"
+    return job.name, time.perf_counter() - start, None
+
+def render_charts(jobs, workers=None, force=False, cache_file=FIGURE_CACHE_FILE):
+    """
+    Renders the jobs whose outputs are missing or stale and returns
+    {"rendered": [...], "skipped": [...], "failed": {name: error}}.
+    """
+    workers = workers or os.cpu_count() or 1
+    cache = load_cache(cache_file)
+    stale, keys, summary = [], {}, {"rendered": [], "skipped": [], "failed": {}}
+    for job in jobs:
+        missing = [path for path in job.inputs if not os.path.exists(path)]
+        if missing:
+            summary["failed"][job.name] = f"input file '{missing[0]}' not found"
+            continue
+        keys[job.name] = job_key(job, cache)
+        fresh = all(os.path.exists(path) and cache["outputs"].get(path) == keys[job.name] for path in job.outputs)
+        if fresh and not force:
+            summary["skipped"].append(job.name)
+        else:
+            stale.append(job)
+
+    if len(stale) > 1 and workers > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, len(stale)), initializer=use_agg) as executor:
+            results = list(executor.map(render_job, stale))
+    else:
+        results = [render_job(job) for job in stale]
+
+    for job, (name, _, error) in zip(stale, results):
+        if error:
+            summary["failed"][name] = error
+            continue
+        summary["rendered"].append(name)
+        for path in job.outputs:
+            cache["outputs"][path] = keys[name]
+    save_cache(cache, cache_file)
+    return summary
+
+def report(summary):
+    """Prints one line per rendered/skipped/failed chart, in the scripts' usual style."""
+    for name in summary["rendered"]:
+        print(f"✅ Rendered '{name}'")
+    for name in summary["skipped"]:
+        print(f" -> '{name}' is up to date (inputs and style unchanged), skipped.")
+    for name, error in summary["failed"].items():
+        print(f"ERROR: Could not render '{name}': {error}")
@@ -0,0 +1,203 @@
+import json
+import os
+
+# ==============================================================================
+#     CONCEPT BITSETS: packed paragraph x concept presence with itemset mining
+# ==============================================================================
+# Written by 24_mine_concept_itemsets.py from the token table. Every item (a
+# dictionary concept, a root, ...) is one row of packed uint64 words with one
+# bit per paragraph, so the support of any item set is the popcount of the AND
+# of its rows. A batch of candidate sets is counted in one vectorized pass:
+#
+#   bitsets = BitsetMatrix.load("concept_bitsets_H_concept")
+#   mask = bitsets.row_mask(section="Herbal")                 # packed paragraph mask
+#   bitsets.support([["Heat/Energy/Active Principle", "Cycle/Cosmos"]], mask)
+#   apriori(bitsets, min_support=0.02, min_lift=1.5, mask=mask)
+#
+# Layout of <bitset_dir>:
+#   meta.json     {"version", "transcriber", "kind", "unit", "rows": [row ids],
+#                  "items": [names], "attributes": {name: [value per row]}}
+#   bits.npy      uint64 (items x ceil(rows / 64)); bit r of an item row = row r has the item
+
+BITSET_VERSION = 1
+BITSET_DIR_TEMPLATE = "concept_bitsets_{transcriber}_{kind}"
+CANDIDATE_BATCH = 4096   # Candidate sets ANDed and counted per vectorized pass
+
+def popcount(words):
+    """Number of set bits along the last axis of a uint64 array."""
+    import numpy as np
+    if hasattr(np, "bitwise_count"):  # NumPy >= 2.0
+        return np.bitwise_count(words).sum(axis=-1, dtype=np.int64)
+    table = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+    return table[np.ascontiguousarray(words).view(np.uint8)].sum(axis=-1, dtype=np.int64)
+
+def pack_bits(presence):
+    """Packs a boolean (items x rows) matrix into uint64 words, bit r of word r // 64 = row r."""
+    import numpy as np
+    presence = np.asarray(presence, dtype=bool)
+    n_words = (presence.shape[-1] + 63) // 64
+    padded = np.zeros(presence.shape[:-1] + (n_words * 64,), dtype=bool)
+    padded[..., :presence.shape[-1]] = presence
+    return np.packbits(padded, axis=-1, bitorder="little").view(np.uint64)
+
+class BitsetMatrix:
+    def __init__(self, rows, items, bits, attributes=None, transcriber=None, kind=None, unit=None):
+        import numpy as np
+        self.rows = list(rows)
+        self.items = list(items)
+        self.bits = bits                    # uint64 (items x words), ndarray or memmap
+        self.attributes = {name: np.asarray(values, dtype=object) for name, values in (attributes or {}).items()}
+        self.transcriber = transcriber
+        self.kind = kind
+        self.unit = unit                    # What a row is: "clean_paragraph", "paragraph", ...
+        self._item_index = {item: i for i, item in enumerate(self.items)}
+
+    @classmethod
+    def from_row_sets(cls, rows, item_sets, attributes=None, **info):
+        """Builds the matrix from one set of items per row (items sorted by name)."""
+        import numpy as np
+        items = sorted(set().union(*item_sets)) if item_sets else []
+        index = {item: i for i, item in enumerate(items)}
+        presence = np.zeros((len(items), len(rows)), dtype=bool)
+        for row, item_set in enumerate(item_sets):
+            presence[[index[item] for item in item_set], row] = True
+        return cls(rows, items, pack_bits(presence), attributes, **info)
+
+    # --- PERSISTENCE ---
+
+    @classmethod
+    def load(cls, bitset_dir, mmap=True):
+        import numpy as np
+        with open(os.path.join(bitset_dir, "meta.json"), "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        if meta.get("version") != BITSET_VERSION:
+            raise ValueError(f"Bitset matrix '{bitset_dir}' has version {meta.get('version')}, expected {BITSET_VERSION}.")
+        bits = np.load(os.path.join(bitset_dir, "bits.npy"), mmap_mode="r" if mmap else None)
+        return cls(meta["rows"], meta["items"], bits, meta["attributes"],
+                   transcriber=meta.get("transcriber"), kind=meta.get("kind"), unit=meta.get("unit"))
+
+    def save(self, bitset_dir):
+        import numpy as np
+        os.makedirs(bitset_dir, exist_ok=True)
+        np.save(os.path.join(bitset_dir, "bits.npy"), np.ascontiguousarray(self.bits, dtype=np.uint64))
+        meta = {"version": BITSET_VERSION, "transcriber": self.transcriber, "kind": self.kind, "unit": self.unit,
+                "rows": self.rows, "items": self.items,
+                "attributes": {name: [None if v is None else str(v) for v in values]
+                               for name, values in self.attributes.items()}}
+        with open(os.path.join(bitset_dir, "meta.json"), "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+
+    # --- COUNTING ---
+
+    def item_ids(self, items):
+        return [self._item_index[item] for item in items]
+
+    def row_mask(self, **attribute_filters):
+        """Packed mask of the rows matching every filter, e.g. row_mask(section="Herbal"); None = all rows."""
+        import numpy as np
+        if not attribute_filters:
+            return None
+        keep = np.ones(len(self.rows), dtype=bool)
+        for name, wanted in attribute_filters.items():
+            wanted = [wanted] if isinstance(wanted, str) or not hasattr(wanted, "__iter__") else list(wanted)
+            keep &= np.isin(self.attributes[name], wanted)
+        return pack_bits(keep)
+
+    def n_rows(self, mask=None):
+        return len(self.rows) if mask is None else int(popcount(mask))
+
+    def item_counts(self, mask=None):
+        """Support count of every single item (under an optional packed row mask)."""
+        bits = self.bits if mask is None else self.bits & mask
+        return popcount(bits)
+
+    def support_ids(self, candidates, mask=None):
+        """Support counts of an (n x k) array of item ids, CANDIDATE_BATCH sets per pass."""
+        import numpy as np
+        candidates = np.asarray(candidates, dtype=np.int64)
+        counts = np.empty(len(candidates), dtype=np.int64)
+        for start in range(0, len(candidates), CANDIDATE_BATCH):
+            batch = candidates[start:start + CANDIDATE_BATCH]
+            words = self.bits[batch[:, 0]]
+            for column in range(1, batch.shape[1]):
+                words = words & self.bits[batch[:, column]]
+            if mask is not None:
+                words = words & mask
+            counts[start:start + len(batch)] = popcount(words)
+        return counts
+
+    def support(self, itemsets, mask=None):
+        """Support counts of item sets given by name (all of the same size)."""
+        return self.support_ids([self.item_ids(itemset) for itemset in itemsets], mask)
+
+# --- MINING ---
+
+def next_candidates(frequent):
+    """
+    Apriori join and prune: k-sets whose (k-1)-prefixes are frequent sets
+    sharing their first k-2 items, and all of whose (k-1)-subsets are frequent.
+    'frequent' is a lexicographically sorted (n x k-1) int array.
+    """
+    import numpy as np
+    k = frequent.shape[1]
+    # Blocks of rows sharing the first k-1 columns (lexicographic order keeps them adjacent)
+    if k == 1:
+        boundaries = [0, len(frequent)]
+    else:
+        changed = (frequent[1:, :k - 1] != frequent[:-1, :k - 1]).any(axis=1)
+        boundaries = [0, *(np.flatnonzero(changed) + 1).tolist(), len(frequent)]
+    joined = []
+    for start, end in zip(boundaries[:-1], boundaries[1:]):
+        if end - start > 1:
+            left, right = np.triu_indices(end - start, 1)
+            joined.append(np.column_stack([frequent[start + left], frequent[start + right, -1]]))
+    if not joined:
+        return np.empty((0, k + 1), dtype=np.int64)
+    candidates = np.vstack(joined)
+    if k == 1:
+        return candidates  # Every 1-subset of a joined pair is frequent by construction
+    # Encode each (k)-set as one integer (base n_items) and look its subsets up in the sorted frequent keys
+    radix = int(frequent.max()) + 1
+    if radix ** k >= 2 ** 63:
+        known = set(map(tuple, frequent.tolist()))
+        keep = [all(row[:drop] + row[drop + 1:] in known for drop in range(k - 1))
+                for row in map(tuple, candidates.tolist())]
+        return candidates[np.array(keep, dtype=bool)]
+    weights = radix ** np.arange(k - 1, -1, -1, dtype=np.int64)
+    known = np.sort(frequent @ weights)
+    keep = np.ones(len(candidates), dtype=bool)
+    for drop in range(k - 1):  # Dropping one of the last two items gives a join parent, known to be frequent
+        keys = np.delete(candidates, drop, axis=1) @ weights
+        position = np.minimum(np.searchsorted(known, keys), len(known) - 1)
+        keep &= known[position] == keys
+    return candidates[keep]
+
+def apriori(bitsets, min_support=0.02, min_count=5, min_lift=1.0, max_size=4, mask=None):
+    """
+    All item sets of 2..max_size items with support >= max(min_support * rows,
+    min_count) among the rows of 'mask', and lift >= min_lift. Lift is
+    P(all items) / product of P(item), i.e. co-occurrence over independence.
+    Returns [(item names, count, support, lift)], largest lift first.
+    """
+    import numpy as np
+    n_rows = bitsets.n_rows(mask)
+    if n_rows == 0:
+        return []
+    threshold = max(int(np.ceil(min_support * n_rows)), min_count)
+    single = bitsets.item_counts(mask)
+    frequent = np.flatnonzero(single >= threshold).reshape(-1, 1)
+    probability = single / n_rows
+    results = []
+    for _ in range(2, max_size + 1):
+        candidates = next_candidates(frequent)
+        if len(candidates) == 0:
+            break
+        counts = bitsets.support_ids(candidates, mask)
+        keep = counts >= threshold
+        frequent, counts = candidates[keep], counts[keep]
+        lift = (counts / n_rows) / probability[frequent].prod(axis=1)
+        strong = np.flatnonzero(lift >= min_lift)
+        for ids, count, value in zip(frequent[strong].tolist(), counts[strong].tolist(), lift[strong].tolist()):
+            results.append((tuple(bitsets.items[i] for i in ids), count, count / n_rows, value))
+    results.sort(key=lambda result: (-result[3], -result[1]))
+    return results
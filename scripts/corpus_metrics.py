@@ -0,0 +1,218 @@
+import bz2
+import json
+import lzma
+import os
+import re
+import zlib
+from collections import Counter
+
+# ==============================================================================
+#        CORPUS METRICS: shared cleaning, integer-encoded cache, metrics
+# ==============================================================================
+# Used by 03 (entropy), 04 (Zipf) and 16 (batch comparison). A corpus is
+# cleaned once per (file, language) and cached as an int32 token-id array
+# plus its vocabulary, so comparing dozens of corpora only pays for cleaning
+# the ones that changed. numpy is imported inside the numeric functions, so
+# importing clean_text stays cheap for the plain scripts.
+#
+# Cache layout (CACHE_DIR):
+#   <slug>.npy    token ids (id 0 = most frequent word type)
+#   <slug>.json   {"version", "source", "language", "size", "mtime", "vocab"}
+
+CACHE_DIR = "corpus_cache"
+CACHE_VERSION = 2
+
+GUTENBERG_START = "*** start of this project gutenberg ebook"
+GUTENBERG_END = "*** end of this project gutenberg ebook"
+
+# Letters kept in addition to a-z for each language hint. 'eva' also drops
+# inline <...> codes: <@...>/<!...> codes and comments vanish inside their
+# word (as in 10a/10b), any other code (<->, <$>, <plant>...) is a word break.
+# 'any' keeps every Unicode letter (Greek, Hebrew, ...). 'raw' keeps the
+# whitespace tokens exactly as written, which is how 03 reads voynich_ready_nlp.txt.
+LANGUAGE_LETTERS = {
+    "english": "",
+    "latin": "",
+    "eva": "",
+    "german": "äöüß",
+    "french": "àâæçéèêëîïôœùûüÿ",
+    "italian": "àèéìíîòóùú",
+    "spanish": "áéíñóúü",
+    "portuguese": "áâãàçéêíóôõú",
+}
+
+# --- CLEANING ---
+
+def clean_text(text, language='english'):
+    """
+    Cleans text: lowercase, remove Gutenberg headers/footers (basic),
+    remove punctuation/numbers, keep only letters and spaces relevant to the language.
+    """
+    if language == 'raw':
+        return " ".join(text.split())
+    text = text.lower()
+
+    # Basic Gutenberg header/footer removal
+    start_idx = text.find(GUTENBERG_START)
+    if start_idx != -1: text = text[start_idx + len(GUTENBERG_START):]
+    end_idx = text.find(GUTENBERG_END)
+    if end_idx != -1: text = text[:end_idx]
+
+    if language == 'eva':
+        text = re.sub(r'<[@!][^>]*>', '', text)  # In-word codes: ck<@K>eor -> ckeor
+        text = re.sub(r'<[^>]*>', ' ', text)     # Line, paragraph and illustration breaks
+    if language == 'any':
+        text = re.sub(r'[^\w\s]|[\d_]', '', text)
+    else:
+        extra = LANGUAGE_LETTERS.get(language, "")
+        text = re.sub(f'[^a-z{extra}\\s]', '', text)
+
+    text = re.sub(r'\s+', ' ', text) # Normalize whitespace
+    return text.strip()
+
+# --- INTEGER-ENCODED CACHE ---
+
+def cache_slug(source, language):
+    base = re.sub(r'[^A-Za-z0-9_-]+', '_', os.path.splitext(os.path.basename(source))[0])
+    return f"{base}.{language}"
+
+def encode_words(words):
+    """Returns (ids, vocab) with ids assigned by descending frequency (ties by first occurrence)."""
+    import numpy as np
+    vocab = [w for w, _ in Counter(words).most_common()]
+    lookup = {w: i for i, w in enumerate(vocab)}
+    return np.fromiter((lookup[w] for w in words), dtype=np.int32, count=len(words)), vocab
+
+def load_encoded(source, language, cache_dir=CACHE_DIR):
+    """
+    Returns (ids, vocab, from_cache) for a corpus file, cleaning and encoding it
+    only when the cache is missing or older than the file.
+    """
+    import numpy as np
+    stat = os.stat(source)
+    slug = cache_slug(source, language)
+    ids_path = os.path.join(cache_dir, slug + ".npy")
+    meta_path = os.path.join(cache_dir, slug + ".json")
+    try:
+        with open(meta_path, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        if (meta.get("version") == CACHE_VERSION and meta.get("size") == stat.st_size
+                and meta.get("mtime") == stat.st_mtime and os.path.exists(ids_path)):
+            return np.load(ids_path, mmap_mode="r"), meta["vocab"], True
+    except (FileNotFoundError, json.JSONDecodeError):
+        pass
+
+    with open(source, "r", encoding="utf-8", errors="ignore") as f:
+        words = clean_text(f.read(), language=language).split()
+    ids, vocab = encode_words(words)
+
+    # Write to temporary names first: two workers may encode the same file at once
+    os.makedirs(cache_dir, exist_ok=True)
+    tmp_suffix = f".{os.getpid()}.tmp"
+    with open(ids_path + tmp_suffix, "wb") as f:
+        np.save(f, ids)
+    with open(meta_path + tmp_suffix, "w", encoding="utf-8") as f:
+        json.dump({"version": CACHE_VERSION, "source": source, "language": language,
+                   "size": stat.st_size, "mtime": stat.st_mtime, "vocab": vocab}, f, ensure_ascii=False)
+    os.replace(ids_path + tmp_suffix, ids_path)
+    os.replace(meta_path + tmp_suffix, meta_path)
+    return ids, vocab, False
+
+# --- METRICS (all on integer ids) ---
+
+def unigram_entropy(ids, vocab_size):
+    import numpy as np
+    counts = np.bincount(ids, minlength=vocab_size)
+    p = counts[counts > 0] / len(ids)
+    return float(-(p * np.log2(p)).sum())
+
+def second_order_entropy(ids, vocab_size):
+    """H_2 as in 03: -sum p(w1,w2) * log2 p(w2 | w1), with p(w1) counted over words[:-1]."""
+    import numpy as np
+    if len(ids) < 2:
+        return 0.0
+    first = np.asarray(ids[:-1], dtype=np.int64)
+    pairs = first * vocab_size + np.asarray(ids[1:], dtype=np.int64)
+    pair_codes, pair_counts = np.unique(pairs, return_counts=True)
+    preceding_counts = np.bincount(first, minlength=vocab_size)[pair_codes // vocab_size]
+    p_bigram = pair_counts / len(pairs)
+    return float(-(p_bigram * np.log2(pair_counts / preceding_counts)).sum())
+
+def zipf_fit(ids, vocab_size):
+    """Least-squares slope and intercept of log10(frequency) against log10(rank), as in 04."""
+    import numpy as np
+    frequencies = np.sort(np.bincount(ids, minlength=vocab_size))[::-1]
+    frequencies = frequencies[frequencies > 0]
+    if len(frequencies) < 2:
+        return 0.0, 0.0
+    ranks = np.arange(1, len(frequencies) + 1)
+    slope, intercept = np.polyfit(np.log10(ranks), np.log10(frequencies), 1)
+    return float(slope), float(intercept)
+
+def heaps_fit(ids, points=50):
+    """
+    Fits V(n) = K * n^beta on log-spaced prefix lengths. V(n) comes from the
+    sorted first-occurrence position of every type, so it is one searchsorted.
+    """
+    import numpy as np
+    n_tokens = len(ids)
+    if n_tokens < 10:
+        return 0.0, 0.0
+    _, first_positions = np.unique(np.asarray(ids), return_index=True)
+    first_positions.sort()
+    n = np.unique(np.geomspace(10, n_tokens, points).astype(np.int64))
+    vocabulary = np.searchsorted(first_positions, n, side="left")
+    beta, log_k = np.polyfit(np.log(n), np.log(vocabulary), 1)
+    return float(np.exp(log_k)), float(beta)
+
+def compression_ratios(text):
+    """Compressed size / raw size for zlib, bz2 and lzma (lower = more redundant)."""
+    raw = text.encode("utf-8")
+    if not raw:
+        return {"zlib_ratio": 0.0, "bz2_ratio": 0.0, "lzma_ratio": 0.0}
+    return {
+        "zlib_ratio": len(zlib.compress(raw, 9)) / len(raw),
+        "bz2_ratio": len(bz2.compress(raw, 9)) / len(raw),
+        "lzma_ratio": len(lzma.compress(raw, preset=6)) / len(raw),
+    }
+
+def character_ids(text):
+    """(ids, alphabet size) of every character of a text, spaces included."""
+    import numpy as np
+    codes = np.frombuffer(text.encode("utf-32-le"), dtype=np.uint32)
+    alphabet, ids = np.unique(codes, return_inverse=True)
+    return ids.ravel(), len(alphabet)
+
+def character_entropy(text):
+    ids, alphabet_size = character_ids(text)
+    return unigram_entropy(ids, alphabet_size) if len(ids) else 0.0
+
+def second_order_character_entropy(text):
+    """H_2 of characters: the word-level second_order_entropy over character ids."""
+    ids, alphabet_size = character_ids(text)
+    return second_order_entropy(ids, alphabet_size)
+
+def corpus_metrics(ids, vocab):
+    """Every comparison metric for one encoded corpus."""
+    import numpy as np
+    ids = np.asarray(ids)
+    vocab_size = len(vocab)
+    used_types = int(np.count_nonzero(np.bincount(ids, minlength=vocab_size))) if len(ids) else 0
+    text = " ".join(np.asarray(vocab, dtype=object)[ids]) if len(ids) else ""
+    zipf_slope, _ = zipf_fit(ids, vocab_size)
+    heaps_k, heaps_beta = heaps_fit(ids)
+    metrics = {
+        "tokens": int(len(ids)),
+        "types": used_types,
+        "ttr": used_types / len(ids) if len(ids) else 0.0,
+        "mean_word_len": (len(text) - max(0, len(ids) - 1)) / len(ids) if len(ids) else 0.0,
+        "h1_word": unigram_entropy(ids, vocab_size) if len(ids) else 0.0,
+        "h2_word": second_order_entropy(ids, vocab_size),
+        "h1_char": character_entropy(text),
+        "h2_char": second_order_character_entropy(text),
+        "zipf_slope": zipf_slope,
+        "heaps_k": heaps_k,
+        "heaps_beta": heaps_beta,
+    }
+    metrics.update(compression_ratios(text))
+    return metrics
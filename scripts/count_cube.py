@@ -0,0 +1,210 @@
+import json
+import os
+
+# ==============================================================================
+#        COUNT CUBE: persisted folio x feature counts with roll-up/slice APIs
+# ==============================================================================
+# Written by 18_build_count_cube.py, either from the token table (one
+# transcriber, every locus) or from the corpus files the analysis scripts
+# read (CORPUS_CUBE_DIR: a 'corpus' attribute tells 02a's folio segments of
+# voynich_final_formatted_complete.txt from the folios of 0's
+# voynich_super_clean_with_pages.txt, which 5 reads whole and 3 by dialect).
+# Every feature kind (word, root, prefix, suffix, role, ...) is a dense int32
+# matrix of shape (folios, features) saved as .npy and opened memory-mapped,
+# and every folio carries its attributes (section, dialect, language, hand,
+# ...). Any partition of the folios is then a reduction over rows and any
+# re-grouping of features (a new root dictionary, a prefix test) a reduction
+# over columns of the 'word' matrix - no corpus pass:
+#
+#   cube = CountCube.load("count_cube_H")
+#   groups, counts = cube.roll_up("lift_root", by="section")
+#   groups, counts = CountCube.load(CORPUS_CUBE_DIR).roll_up("dict_root", by="dialect", corpus="segmented")
+#   groups, lift = cube.lift("root", by="dialect")
+#   counts = cube.slice("word", features=["daiin", "chedy"], hand="2")
+#   cube.add_kind("my_root", lambda word: my_parser(word))   # derived from 'word'
+#
+# Layout of <cube_dir>:
+#   meta.json     {"version", "transcriber", "folios", "attributes": {name: [value per folio]},
+#                  "kinds": {kind: [feature names]}}
+#   <kind>.npy    int32 counts, rows in 'folios' order, columns in 'kinds[kind]' order
+
+CUBE_VERSION = 1
+CUBE_DIR_TEMPLATE = "count_cube_{transcriber}"
+CORPUS_CUBE_DIR = "count_cube_corpora"
+
+class CountCube:
+    def __init__(self, folios, attributes, kinds, matrices, transcriber=None, cube_dir=None):
+        import numpy as np
+        self.folios = list(folios)
+        self.attributes = {name: np.asarray(values, dtype=object) for name, values in attributes.items()}
+        self.kinds = {kind: list(features) for kind, features in kinds.items()}
+        self.matrices = matrices            # kind -> ndarray or memmap (folios x features)
+        self.transcriber = transcriber
+        self.cube_dir = cube_dir
+        self._feature_index = {}
+
+    # --- PERSISTENCE ---
+
+    @classmethod
+    def load(cls, cube_dir, mmap=True):
+        """Opens a saved cube. Matrices are memory-mapped unless mmap=False."""
+        import numpy as np
+        with open(os.path.join(cube_dir, "meta.json"), "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        if meta.get("version") != CUBE_VERSION:
+            raise ValueError(f"Count cube '{cube_dir}' has version {meta.get('version')}, expected {CUBE_VERSION}.")
+        matrices = {kind: np.load(os.path.join(cube_dir, f"{kind}.npy"), mmap_mode="r" if mmap else None)
+                    for kind in meta["kinds"]}
+        return cls(meta["folios"], meta["attributes"], meta["kinds"], matrices,
+                   transcriber=meta.get("transcriber"), cube_dir=cube_dir)
+
+    def save(self, cube_dir):
+        import numpy as np
+        os.makedirs(cube_dir, exist_ok=True)
+        for kind, matrix in self.matrices.items():
+            np.save(os.path.join(cube_dir, f"{kind}.npy"), np.ascontiguousarray(matrix, dtype=np.int32))
+        meta = {"version": CUBE_VERSION, "transcriber": self.transcriber, "folios": self.folios,
+                "attributes": {name: [None if v is None else str(v) for v in values]
+                               for name, values in self.attributes.items()},
+                "kinds": self.kinds}
+        with open(os.path.join(cube_dir, "meta.json"), "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+        self.cube_dir = cube_dir
+
+    # --- LOOKUPS ---
+
+    def feature_index(self, kind, feature):
+        if kind not in self._feature_index:
+            self._feature_index[kind] = {f: i for i, f in enumerate(self.kinds[kind])}
+        return self._feature_index[kind].get(feature)
+
+    def folio_mask(self, **attribute_filters):
+        """
+        Boolean row mask. Each keyword is an attribute name with one value or a
+        list of values, e.g. folio_mask(section="Herbal", hand=["1", "2"]).
+        """
+        import numpy as np
+        mask = np.ones(len(self.folios), dtype=bool)
+        for name, wanted in attribute_filters.items():
+            values = np.asarray(self.folios, dtype=object) if name == "folio" else self.attributes[name]
+            wanted = wanted if isinstance(wanted, (list, tuple, set)) else [wanted]
+            mask &= np.isin(values, list(wanted))
+        return mask
+
+    def feature_columns(self, kind, features):
+        import numpy as np
+        columns = [self.feature_index(kind, f) for f in features]
+        return np.array([-1 if c is None else c for c in columns], dtype=np.int64)
+
+    # --- SLICE / ROLL-UP ---
+
+    def slice(self, kind, features=None, **attribute_filters):
+        """Counts for the selected folios (rows) and features (columns; missing features count 0)."""
+        import numpy as np
+        matrix = self.matrices[kind]
+        mask = self.folio_mask(**attribute_filters)
+        rows = np.asarray(matrix[mask]) if not mask.all() else np.asarray(matrix)
+        if features is None:
+            return rows
+        columns = self.feature_columns(kind, features)
+        out = np.zeros((rows.shape[0], len(columns)), dtype=rows.dtype)
+        present = columns >= 0
+        out[:, present] = rows[:, columns[present]]
+        return out
+
+    def group_codes(self, by):
+        """
+        Folio -> group codes for a partition scheme: an attribute name, or a
+        dict {folio: group} / callable(folio) for ad-hoc schemes. Folios
+        mapped to None are left out (code -1).
+        """
+        import numpy as np
+        if isinstance(by, str):
+            labels = self.attributes[by]
+        elif callable(by):
+            labels = [by(f) for f in self.folios]
+        else:
+            labels = [by.get(f) for f in self.folios]
+        groups = sorted({label for label in labels if label is not None}, key=str)
+        lookup = {g: i for i, g in enumerate(groups)}
+        return groups, np.array([lookup.get(label, -1) for label in labels], dtype=np.int64)
+
+    def roll_up(self, kind, by, features=None, **attribute_filters):
+        """Sums folio rows into groups: returns (group labels, groups x features counts)."""
+        import numpy as np
+        groups, codes = self.group_codes(by)
+        keep = (codes >= 0) & self.folio_mask(**attribute_filters)
+        matrix = self.matrices[kind]
+        if features is not None:
+            counts = self.slice(kind, features)
+        else:
+            counts = np.asarray(matrix)
+        # One-hot (groups x folios) product = grouped row sums in one BLAS call
+        one_hot = np.zeros((len(groups), len(self.folios)), dtype=np.float64)
+        one_hot[codes[keep], np.nonzero(keep)[0]] = 1.0
+        return groups, (one_hot @ counts).astype(np.int64)
+
+    def totals(self, kind, by=None, **attribute_filters):
+        """Tokens per group (or overall, when by is None) for a kind."""
+        import numpy as np
+        if by is None:
+            return np.asarray(self.slice(kind, **attribute_filters)).sum()
+        groups, counts = self.roll_up(kind, by, **attribute_filters)
+        return groups, counts.sum(axis=1)
+
+    def lift(self, kind, by, features=None, min_total=0, per_kind=None, **attribute_filters):
+        """
+        Lift of every feature in every group: P(feature | group) / P(feature).
+        Probabilities are per token of 'per_kind' (default: the kind itself;
+        per_kind="word" gives 02a's per-word lift). Features with fewer than
+        min_total occurrences get NaN.
+        """
+        import numpy as np
+        groups, counts = self.roll_up(kind, by, **attribute_filters)
+        feature_totals = counts.sum(axis=0)
+        if per_kind is None or per_kind == kind:
+            group_totals = counts.sum(axis=1, keepdims=True)
+        else:
+            group_totals = self.roll_up(per_kind, by, **attribute_filters)[1].sum(axis=1, keepdims=True)
+        total = group_totals.sum()
+        with np.errstate(divide="ignore", invalid="ignore"):
+            lift = (counts / group_totals) / (feature_totals / total)
+        lift[:, feature_totals < max(min_total, 1)] = np.nan
+        if features is not None:
+            columns = self.feature_columns(kind, features)
+            out = np.full((len(groups), len(columns)), np.nan)
+            present = columns >= 0
+            out[:, present] = lift[:, columns[present]]
+            return groups, out
+        return groups, lift
+
+    # --- DERIVED KINDS ---
+
+    def add_kind(self, kind, word_to_feature):
+        """
+        Derives a new kind by re-grouping the 'word' columns with a function
+        word -> feature (None drops the word). No corpus pass is needed.
+        """
+        import numpy as np
+        words = self.kinds["word"]
+        labels = [word_to_feature(w) for w in words]
+        features = sorted({label for label in labels if label is not None})
+        lookup = {f: i for i, f in enumerate(features)}
+        codes = np.array([lookup.get(label, -1) for label in labels], dtype=np.int64)
+        self.matrices[kind] = group_columns(np.asarray(self.matrices["word"]), codes, len(features))
+        self.kinds[kind] = features
+        self._feature_index.pop(kind, None)
+        return features
+
+def group_columns(matrix, codes, n_groups):
+    """Sums the columns of matrix that share a code (code -1 = dropped) into n_groups columns."""
+    import numpy as np
+    out = np.zeros((matrix.shape[0], n_groups), dtype=np.int32)
+    kept = np.nonzero(codes >= 0)[0]
+    if len(kept) == 0:
+        return out
+    columns = kept[np.argsort(codes[kept], kind="stable")]
+    sorted_codes = codes[columns]
+    starts = np.flatnonzero(np.r_[True, sorted_codes[1:] != sorted_codes[:-1]])
+    out[:, sorted_codes[starts]] = np.add.reduceat(matrix[:, columns], starts, axis=1)
+    return out
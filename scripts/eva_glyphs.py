@@ -0,0 +1,122 @@
+# ==============================================================================
+#    EVA GLYPHS: word -> glyph id tokenizer and glyph histograms
+# ==============================================================================
+# EVA spells several Voynich glyphs with more than one letter (the benches
+# 'ch'/'sh', the pedestalled gallows 'cth', 'ckh', 'cph', 'cfh', and, in
+# some readings, 'ii'/'iii'). A GlyphTokenizer splits a word greedily into
+# the longest glyph of its inventory at each position; every other letter
+# is a glyph of its own. Glyph ids are assigned as glyphs are first seen.
+#
+#   tokenizer = GlyphTokenizer("basic")
+#   tokenizer.split("qokchedy")            # ['q', 'o', 'k', 'ch', 'e', 'd', 'y']
+#   ids, offsets = tokenizer.encode_words(word_types)   # glyphs of type i = ids[offsets[i]:offsets[i + 1]]
+#
+# The histogram functions work on that ragged (ids, offsets) array of the
+# word types with one weight column per group (a count of each word type in
+# each section or transcriber), so every group is one bincount.
+
+GLYPH_INVENTORIES = {
+    "characters": [],                                       # Plain letters, as clean_text statistics
+    "basic": ["cth", "ckh", "cph", "cfh", "ch", "sh"],      # What 15 and 20 have always used
+    "extended": ["cth", "ckh", "cph", "cfh", "ch", "sh", "iii", "ii"],
+}
+POSITIONS = ["initial", "medial", "final", "single"]        # 'single' = the word is one glyph
+
+class GlyphTokenizer:
+    def __init__(self, inventory="basic"):
+        multi = GLYPH_INVENTORIES[inventory] if isinstance(inventory, str) else list(inventory)
+        self.inventory = inventory if isinstance(inventory, str) else "custom"
+        self.multi = set(multi)
+        self.lengths = sorted({len(glyph) for glyph in multi if len(glyph) > 1}, reverse=True)
+        self.glyphs = []
+        self.ids = {}
+
+    def split(self, word):
+        glyphs, i = [], 0
+        while i < len(word):
+            for length in self.lengths:
+                if word[i:i + length] in self.multi:
+                    glyphs.append(word[i:i + length])
+                    i += length
+                    break
+            else:
+                glyphs.append(word[i])
+                i += 1
+        return glyphs
+
+    def glyph_id(self, glyph):
+        if glyph not in self.ids:
+            self.ids[glyph] = len(self.glyphs)
+            self.glyphs.append(glyph)
+        return self.ids[glyph]
+
+    def encode(self, word):
+        return [self.glyph_id(glyph) for glyph in self.split(word)]
+
+    def encode_words(self, words):
+        """(int32 glyph ids of all words concatenated, int64 offsets with len(words) + 1 entries)."""
+        import numpy as np
+        ids, offsets = [], [0]
+        for word in words:
+            ids.extend(self.encode(word))
+            offsets.append(len(ids))
+        return np.array(ids, dtype=np.int32), np.array(offsets, dtype=np.int64)
+
+def glyph_positions(offsets):
+    """POSITIONS index of every glyph in the ragged array."""
+    import numpy as np
+    lengths = np.diff(offsets)
+    positions = np.full(int(offsets[-1]), 1, dtype=np.int8)      # medial
+    starts, ends = offsets[:-1][lengths > 0], offsets[1:][lengths > 0] - 1
+    positions[ends] = 2
+    positions[starts] = 0
+    positions[starts[starts == ends]] = 3
+    return positions
+
+def glyph_histograms(ids, offsets, weights, n_glyphs):
+    """
+    Weighted glyph counts per group. weights is (n_word_types x n_groups).
+    Returns (unigrams: groups x G, positional: groups x len(POSITIONS) x G,
+    transitions: groups x (G + 1) x (G + 1)); index G of the transitions is
+    the word boundary, so each word contributes boundary -> first ... last
+    -> boundary.
+    """
+    import numpy as np
+    n_groups = weights.shape[1]
+    lengths = np.diff(offsets)
+    owner = np.repeat(np.arange(len(lengths)), lengths)
+    positions = glyph_positions(offsets)
+    # Transitions: previous glyph (or boundary) -> glyph, plus last glyph -> boundary
+    boundary = n_glyphs
+    previous = np.r_[boundary, ids[:-1]].astype(np.int64)
+    previous[offsets[:-1][lengths > 0]] = boundary
+    ends = offsets[1:][lengths > 0] - 1
+    pair_from = np.r_[previous, ids[ends]]
+    pair_to = np.r_[ids, np.full(len(ends), boundary)]
+    pair_owner = np.r_[owner, owner[ends]]
+    pair_codes = pair_from * (n_glyphs + 1) + pair_to
+    unigrams = np.zeros((n_groups, n_glyphs))
+    positional = np.zeros((n_groups, len(POSITIONS), n_glyphs))
+    transitions = np.zeros((n_groups, n_glyphs + 1, n_glyphs + 1))
+    position_codes = positions.astype(np.int64) * n_glyphs + ids
+    for g in range(n_groups):
+        glyph_weights = weights[owner, g]
+        unigrams[g] = np.bincount(ids, weights=glyph_weights, minlength=n_glyphs)
+        positional[g] = np.bincount(position_codes, weights=glyph_weights,
+                                    minlength=len(POSITIONS) * n_glyphs).reshape(len(POSITIONS), n_glyphs)
+        transitions[g] = np.bincount(pair_codes, weights=weights[pair_owner, g],
+                                     minlength=(n_glyphs + 1) ** 2).reshape(n_glyphs + 1, n_glyphs + 1)
+    return unigrams, positional, transitions
+
+def entropy_bits(counts, axis=-1):
+    """Shannon entropy (bits) of count vectors along an axis."""
+    import numpy as np
+    totals = counts.sum(axis=axis, keepdims=True)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        p = np.where(totals > 0, counts / totals, 0.0)
+        return -(np.where(p > 0, p * np.log2(p), 0.0)).sum(axis=axis)
+
+def conditional_entropy_bits(transitions):
+    """H(next glyph | previous glyph or boundary) per group, from (groups x F x T) counts."""
+    flat = transitions.reshape(len(transitions), -1)
+    return entropy_bits(flat) - entropy_bits(transitions.sum(axis=2))
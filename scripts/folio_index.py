@@ -0,0 +1,151 @@
+import json
+import re
+
+# ==============================================================================
+#        FOLIO INDEX: persistent folio -> paragraph range / byte offset map
+# ==============================================================================
+# Written by 01_generate_clean_data.py (clean corpus offsets) and updated by
+# 10b_translate_all_improved.py (translation offsets). Readers seek straight
+# to the bytes of a folio instead of re-parsing voynich.txt every run.
+#
+# Layout of folio_index.json:
+# {
+#   "version": 1,
+#   "clean_file": "voynich_ready_nlp.txt",
+#   "translation_file": "voynich_full_translation_v3_IMPROVED.txt",   (optional)
+#   "folios": {
+#     "f57v": {"section": "Herbal",
+#              "paragraphs": [1449, 1462],        # [first, end) global indices
+#              "clean_bytes": [251234, 253210],   # [start, end) in clean_file
+#              "translation_bytes": [...]},       # [start, end) in translation_file
+#     ...
+#   }
+# }
+
+INDEX_VERSION = 1
+FOLIO_INDEX_FILE = "folio_index.json"
+PARAGRAPH_MARKER = re.compile(rb"^--- Paragraph \d+")
+SEGMENT_MARKER = re.compile(rb"<(f[0-9a-zA-Zvr]+)>")
+
+# --- BUILDING ---
+
+def scan_line_offsets(path):
+    """
+    Returns the byte offset at which every line of a file starts, plus the
+    file size as a final sentinel. Works for both LF and CRLF files.
+    """
+    offsets = [0]
+    with open(path, "rb") as f:
+        for line in f:
+            offsets.append(offsets[-1] + len(line))
+    return offsets
+
+def build_folio_index(folio_ranges, clean_file):
+    """
+    Builds the index from an ordered {folio: (section, first, end)} map of
+    paragraph ranges and the clean corpus file that was just written.
+    """
+    line_offsets = scan_line_offsets(clean_file)
+    total_paragraphs = len(line_offsets) - 1
+    folios = {}
+    for folio_id, (section, first, end) in folio_ranges.items():
+        if end > total_paragraphs:
+            print(f"WARNING: Folio '{folio_id}' points past the end of '{clean_file}'. Skipping.")
+            continue
+        folios[folio_id] = {
+            "section": section,
+            "paragraphs": [first, end],
+            "clean_bytes": [line_offsets[first], line_offsets[end]],
+        }
+    return {"version": INDEX_VERSION, "clean_file": clean_file, "folios": folios}
+
+def add_translation_offsets(index, translation_file):
+    """
+    Scans a rendered translation file for its '--- Paragraph N ---' blocks and
+    records the byte range of every folio's translation in the index.
+    """
+    block_starts = []
+    position = 0
+    with open(translation_file, "rb") as f:
+        for line in f:
+            if PARAGRAPH_MARKER.match(line):
+                block_starts.append(position)
+            position += len(line)
+    block_starts.append(position)  # Sentinel: end of the last block
+
+    total_blocks = len(block_starts) - 1
+    for folio_id, entry in index["folios"].items():
+        first, end = entry["paragraphs"]
+        if end > total_blocks:
+            print(f"WARNING: Translation of '{translation_file}' has no block for folio '{folio_id}'.")
+            entry.pop("translation_bytes", None)
+            continue
+        entry["translation_bytes"] = [block_starts[first], block_starts[end]]
+    index["translation_file"] = translation_file
+    return index
+
+def build_segment_index(segmented_file):
+    """
+    Indexes a '<fNNN>'-segmented corpus (voynich_super_clean_with_pages.txt)
+    so that a folio's text can be read without re-splitting the whole file.
+    """
+    with open(segmented_file, "rb") as f:
+        content = f.read()
+    markers = list(SEGMENT_MARKER.finditer(content))
+    folios = {}
+    for i, match in enumerate(markers):
+        start = match.end()
+        end = markers[i + 1].start() if i + 1 < len(markers) else len(content)
+        folios[match.group(1).decode("ascii")] = {"text_bytes": [start, end]}
+    return {"version": INDEX_VERSION, "segmented_file": segmented_file, "folios": folios}
+
+# --- PERSISTENCE ---
+
+def save_index(index, path=FOLIO_INDEX_FILE):
+    """Saves an index to disk as JSON."""
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(index, f, indent=1)
+
+def load_index(path=FOLIO_INDEX_FILE):
+    """Loads an index from disk. Returns None if it is missing or outdated."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            index = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+    if index.get("version") != INDEX_VERSION:
+        print(f"WARNING: Index '{path}' has an outdated format. Re-run the generating script.")
+        return None
+    return index
+
+# --- RANDOM ACCESS ---
+
+def read_byte_range(path, start, end):
+    """Reads and decodes the [start, end) byte range of a file."""
+    with open(path, "rb") as f:
+        f.seek(start)
+        return f.read(end - start).decode("utf-8", errors="ignore")
+
+def read_folio_paragraphs(index, folio_id, clean_file=None):
+    """Returns the clean paragraphs of a folio, or None if it is not indexed."""
+    entry = index["folios"].get(folio_id)
+    if entry is None:
+        return None
+    start, end = entry["clean_bytes"]
+    return read_byte_range(clean_file or index["clean_file"], start, end).splitlines()
+
+def read_folio_translation(index, folio_id, translation_file=None):
+    """Returns the rendered translation blocks of a folio, or None if unavailable."""
+    entry = index["folios"].get(folio_id)
+    if entry is None or "translation_bytes" not in entry:
+        return None
+    start, end = entry["translation_bytes"]
+    return read_byte_range(translation_file or index["translation_file"], start, end)
+
+def read_segment_text(index, folio_id):
+    """Returns the text of a folio from a segmented corpus index, or None."""
+    entry = index["folios"].get(folio_id)
+    if entry is None:
+        return None
+    start, end = entry["text_bytes"]
+    return read_byte_range(index["segmented_file"], start, end).strip()
@@ -0,0 +1,136 @@
+import csv
+import re
+from collections import Counter, defaultdict
+from ivtff import parse_page_header
+
+# ==============================================================================
+#        FOLIO METADATA: IVTFF page variables as a folio-indexed table
+# ==============================================================================
+# Written by 01_generate_clean_data.py from the page headers of voynich.txt:
+#
+#   <f1r>          <! $I=T $Q=A $P=A $L=A $H=1 $X=V>
+#
+# One row per folio (file order) with the folio number and side, the page
+# variables ($I illustration, $Q quire, $P page in quire, $L Currier
+# language, $H hand, $X extra) and the section of 01's SECTION_MAP. Missing
+# variables are empty. Any analysis can then partition by any column in one
+# grouped pass instead of hard-coding folio lists:
+#
+#   metadata = load_folio_metadata()
+#   metadata.partition("quire")                     # {"A": ["f1r", ...], ...}
+#   metadata.group_counts(folio_word_pairs, by=("quire", "hand"))
+#   hand_of = metadata.lookup("hand")               # {"f1r": "1", ...}
+
+FOLIO_METADATA_FILE = "folio_metadata.csv"
+
+# $I codes as documented in the voynich.txt header
+ILLUSTRATION_TYPES = {
+    "T": "Text", "H": "Herbal", "A": "Astronomical", "Z": "Zodiac",
+    "B": "Biological", "C": "Cosmological", "P": "Pharmaceutical", "S": "Stars",
+}
+
+# Column -> IVTFF page variable (None = derived)
+FIELDS = [
+    ("folio", None), ("number", None), ("side", None), ("section", None),
+    ("illustration", "I"), ("illustration_type", None), ("quire", "Q"), ("page", "P"),
+    ("language", "L"), ("hand", "H"), ("extra", "X"),
+]
+FOLIO_NUMBER = re.compile(r"^f(\d+)([rv])")
+
+def folio_record(folio, variables, section=None):
+    """One metadata row from a folio id and its page variables."""
+    match = FOLIO_NUMBER.match(folio)
+    record = {name: (variables.get(code) or None) if code else None for name, code in FIELDS}
+    record["folio"] = folio
+    record["number"] = int(match.group(1)) if match else None
+    record["side"] = match.group(2) if match else None
+    record["section"] = section
+    record["illustration_type"] = ILLUSTRATION_TYPES.get(record["illustration"])
+    return record
+
+def parse_folio_metadata(source_file, section_of=None):
+    """Reads only the page headers of an IVTFF file. section_of(folio) fills 'section'."""
+    records = {}
+    with open(source_file, "r", encoding="utf-8", errors="ignore") as f:
+        for line in f:
+            if not line.startswith("<f"):
+                continue
+            header = parse_page_header(line.strip())
+            if header:
+                folio, variables = header
+                records[folio] = folio_record(folio, variables, section_of(folio) if section_of else None)
+    return FolioMetadata(records)
+
+# --- TABLE ---
+
+class FolioMetadata:
+    def __init__(self, records):
+        self.records = dict(records)   # folio -> {column: value}, file order
+
+    def __contains__(self, folio):
+        return folio in self.records
+
+    def __len__(self):
+        return len(self.records)
+
+    @property
+    def folios(self):
+        return list(self.records)
+
+    def get(self, folio, attribute, default=None):
+        record = self.records.get(folio)
+        if record is None or record.get(attribute) is None:
+            return default
+        return record[attribute]
+
+    def key(self, folio, by):
+        """Group key of a folio: one attribute value, or a tuple for several attributes."""
+        if isinstance(by, str):
+            return self.get(folio, by)
+        return tuple(self.get(folio, attribute) for attribute in by)
+
+    def lookup(self, by):
+        """{folio: group key} for one attribute or a tuple of attributes."""
+        return {folio: self.key(folio, by) for folio in self.records}
+
+    def partition(self, by):
+        """{group key: [folios]} in file order; folios with no value for 'by' are left out."""
+        groups = defaultdict(list)
+        for folio in self.records:
+            key = self.key(folio, by)
+            if key is not None and not (isinstance(key, tuple) and None in key):
+                groups[key].append(folio)
+        return dict(groups)
+
+    def group_counts(self, pairs, by):
+        """
+        Counts (folio, item) pairs per group in a single pass, e.g. pairs of
+        (folio, word) grouped by "hand" or ("quire", "hand"). Returns
+        {group key: Counter}; folios with no value for 'by' are skipped.
+        """
+        keys = self.lookup(by)
+        counts = defaultdict(Counter)
+        for folio, item in pairs:
+            key = keys.get(folio)
+            if key is None or (isinstance(key, tuple) and None in key):
+                continue
+            counts[key][item] += 1
+        return dict(counts)
+
+# --- PERSISTENCE ---
+
+def save_folio_metadata(metadata, path=FOLIO_METADATA_FILE):
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=[name for name, _ in FIELDS])
+        writer.writeheader()
+        for record in metadata.records.values():
+            writer.writerow({name: "" if value is None else value for name, value in record.items()})
+
+def load_folio_metadata(path=FOLIO_METADATA_FILE):
+    records = {}
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        for row in csv.DictReader(f):
+            record = {name: (row.get(name) or None) for name, _ in FIELDS}
+            record["number"] = int(record["number"]) if record["number"] else None
+            records[record["folio"]] = record
+    return FolioMetadata(records)
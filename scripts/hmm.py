@@ -0,0 +1,116 @@
+from collections import namedtuple
+
+# ==============================================================================
+#        HMM: log-space Baum-Welch and Viterbi over integer-encoded paragraphs
+# ==============================================================================
+# Used by 26_induce_hmm_grammar.py. Paragraphs are grouped by length, so a
+# batch is an (n_sequences x length) int array with no padding, and every
+# forward/backward/Viterbi step works on all sequences of the batch at once:
+#
+#   batches = length_batches(encoded_paragraphs)
+#   model, history = baum_welch(batches, n_states=10, n_symbols=len(vocabulary), seed=1)
+#   states = viterbi(model, batches)          # {length: (n x length) state array}
+#
+# All probabilities are stored as logs; sums over states use logsumexp.
+
+HMM = namedtuple("HMM", "log_start log_trans log_emit")   # (K,), (K, K), (K, V)
+PSEUDOCOUNT = 1e-3   # Added to expected counts so no probability becomes exactly zero
+
+def logsumexp(values, axis):
+    import numpy as np
+    peak = values.max(axis=axis, keepdims=True)
+    peak = np.where(np.isfinite(peak), peak, 0.0)
+    return (peak + np.log(np.exp(values - peak).sum(axis=axis, keepdims=True))).squeeze(axis)
+
+def length_batches(sequences):
+    """{length: int32 array (n_sequences x length)} in first-seen order; empty sequences are dropped."""
+    import numpy as np
+    grouped = {}
+    for sequence in sequences:
+        if len(sequence):
+            grouped.setdefault(len(sequence), []).append(sequence)
+    return {length: np.array(rows, dtype=np.int32) for length, rows in grouped.items()}
+
+def random_hmm(n_states, n_symbols, rng):
+    """Dirichlet-random starting parameters (one restart)."""
+    import numpy as np
+    return HMM(np.log(rng.dirichlet(np.ones(n_states))),
+               np.log(rng.dirichlet(np.ones(n_states), size=n_states)),
+               np.log(rng.dirichlet(np.ones(n_symbols), size=n_states)))
+
+def normalize_log(counts, axis=-1):
+    import numpy as np
+    counts = counts + PSEUDOCOUNT
+    return np.log(counts / counts.sum(axis=axis, keepdims=True))
+
+def forward_backward(model, obs):
+    """Log forward/backward tables (n x T x K) and log-likelihood per sequence for one batch."""
+    import numpy as np
+    n, length = obs.shape
+    emissions = model.log_emit[:, obs].transpose(1, 2, 0)      # n x T x K
+    alpha = np.empty((n, length, len(model.log_start)))
+    beta = np.zeros_like(alpha)
+    alpha[:, 0] = model.log_start + emissions[:, 0]
+    for t in range(1, length):
+        alpha[:, t] = logsumexp(alpha[:, t - 1, :, None] + model.log_trans, axis=1) + emissions[:, t]
+    for t in range(length - 2, -1, -1):
+        beta[:, t] = logsumexp(model.log_trans + (emissions[:, t + 1] + beta[:, t + 1])[:, None, :], axis=2)
+    return alpha, beta, emissions, logsumexp(alpha[:, -1], axis=1)
+
+def expected_counts(model, batches):
+    """E-step over all batches: (start, transition, emission) expected counts and total log-likelihood."""
+    import numpy as np
+    n_states, n_symbols = model.log_emit.shape
+    start = np.zeros(n_states)
+    trans = np.zeros((n_states, n_states))
+    emit = np.zeros((n_states, n_symbols))
+    log_likelihood = 0.0
+    for obs in batches.values():
+        alpha, beta, emissions, seq_ll = forward_backward(model, obs)
+        log_likelihood += seq_ll.sum()
+        gamma = np.exp(alpha + beta - seq_ll[:, None, None])   # n x T x K
+        start += gamma[:, 0].sum(axis=0)
+        if obs.shape[1] > 1:
+            xi = (alpha[:, :-1, :, None] + model.log_trans
+                  + (emissions[:, 1:] + beta[:, 1:])[:, :, None, :] - seq_ll[:, None, None, None])
+            trans += np.exp(xi).sum(axis=(0, 1))
+        flat_obs, flat_gamma = obs.ravel(), gamma.reshape(-1, n_states)
+        for state in range(n_states):
+            emit[state] += np.bincount(flat_obs, weights=flat_gamma[:, state], minlength=n_symbols)
+    return start, trans, emit, log_likelihood
+
+def baum_welch(batches, n_states, n_symbols, iterations=100, tolerance=1e-4, seed=None, model=None):
+    """
+    EM from a random (or given) model until the relative log-likelihood gain
+    drops below 'tolerance'. Returns (model, log-likelihood per iteration).
+    """
+    import numpy as np
+    model = model or random_hmm(n_states, n_symbols, np.random.default_rng(seed))
+    history = []
+    for _ in range(iterations):
+        start, trans, emit, log_likelihood = expected_counts(model, batches)
+        history.append(float(log_likelihood))
+        model = HMM(normalize_log(start), normalize_log(trans), normalize_log(emit))
+        if len(history) > 1 and abs(history[-1] - history[-2]) <= tolerance * abs(history[-2]):
+            break
+    return model, history
+
+def viterbi(model, batches):
+    """Most likely state path of every sequence: {length: (n x length) int array}."""
+    import numpy as np
+    paths = {}
+    for length, obs in batches.items():
+        n = len(obs)
+        emissions = model.log_emit[:, obs].transpose(1, 2, 0)
+        score = model.log_start + emissions[:, 0]
+        back = np.empty((n, length, len(model.log_start)), dtype=np.int32)
+        for t in range(1, length):
+            candidates = score[:, :, None] + model.log_trans      # n x from x to
+            back[:, t] = candidates.argmax(axis=1)
+            score = candidates.max(axis=1) + emissions[:, t]
+        path = np.empty((n, length), dtype=np.int32)
+        path[:, -1] = score.argmax(axis=1)
+        for t in range(length - 1, 0, -1):
+            path[:, t - 1] = back[np.arange(n), t, path[:, t]]
+        paths[length] = path
+    return paths
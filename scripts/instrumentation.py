@@ -0,0 +1,285 @@
+import atexit
+import functools
+import json
+import os
+import sys
+import time
+import tracemalloc
+from collections import defaultdict
+
+# ==============================================================================
+#        INSTRUMENTATION: per-stage timing, memory and profiling hooks
+# ==============================================================================
+# Pipeline scripts mark their stages (load, clean, tag, count, score, write,
+# plot) with:
+#
+#     with stage("count") as s:
+#         ...
+#         s.add_tokens(len(words))
+#
+#     @traced("plot")
+#     def create_heatmap(...): ...
+#
+# Tracing is off unless VOYNICH_TRACE names a JSON-lines trace file (or the CLI
+# is run with --trace). When off, stage() returns one shared no-op object and
+# traced() calls the function directly, so the hooks cost a few hundred
+# nanoseconds per stage. When on, every stage appends one record to the trace
+# (wall time, CPU time, tokens, tokens/s, tracemalloc peak) and a one-page
+# summary is printed when the script exits.
+#
+#   VOYNICH_TRACE=trace.jsonl          enable tracing
+#   VOYNICH_TRACE_MEMORY=0             skip tracemalloc (it slows tight Python loops several-fold)
+#   VOYNICH_PROFILE=cprofile           also profile each stage; writes
+#   VOYNICH_PROFILE=pyinstrument         <trace>.<script>.<stage>.prof / .txt
+#
+# 'python scripts/instrumentation.py trace.jsonl' summarizes a whole trace file.
+
+TRACE_ENV = "VOYNICH_TRACE"
+MEMORY_ENV = "VOYNICH_TRACE_MEMORY"
+PROFILE_ENV = "VOYNICH_PROFILE"
+PROFILERS = ("cprofile", "pyinstrument")
+
+# --- DISABLED PATH ---
+
+class _NullStage:
+    """Stand-in returned by stage() when tracing is off."""
+    tokens = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def add_tokens(self, count):
+        pass
+
+_NULL_STAGE = _NullStage()
+
+# --- ENABLED PATH ---
+
+class Stage:
+    """One timed stage. Nested stages are recorded with their parent's name."""
+    def __init__(self, tracer, name, tokens=0):
+        self.tracer = tracer
+        self.name = name
+        self.tokens = tokens
+        self.peak_bytes = 0   # Highest tracemalloc peak seen so far inside this stage
+        self.profiler = None
+
+    def add_tokens(self, count):
+        self.tokens += count
+
+    def __enter__(self):
+        self.tracer.enter(self)
+        self.wall_start = time.perf_counter()
+        self.cpu_start = time.process_time()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        wall = time.perf_counter() - self.wall_start
+        cpu = time.process_time() - self.cpu_start
+        self.tracer.exit(self, wall, cpu, failed=exc_type is not None)
+        return False
+
+class Tracer:
+    """Collects stage records for one process and appends them to the trace file."""
+    def __init__(self, trace_file, memory=True, profiler=None):
+        if profiler and profiler not in PROFILERS:
+            raise ValueError(f"Unknown profiler '{profiler}'. Use one of: {', '.join(PROFILERS)}")
+        self.trace_file = trace_file
+        self.memory = memory
+        self.profiler = profiler
+        self.script = os.path.splitext(os.path.basename(sys.argv[0] or "interactive"))[0]
+        self.run_id = f"{time.strftime('%Y%m%dT%H%M%S')}-{os.getpid()}"
+        self.started = time.perf_counter()
+        self.stack = []
+        self.records = []
+        self.profiling = False  # cProfile/pyinstrument cannot nest, so only the outermost stage is profiled
+        if memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def stage(self, name, tokens=0):
+        return Stage(self, name, tokens)
+
+    def enter(self, stage):
+        if self.memory:
+            # The peak reached so far belongs to the parent; restart the counter for the child
+            if self.stack:
+                parent = self.stack[-1]
+                parent.peak_bytes = max(parent.peak_bytes, tracemalloc.get_traced_memory()[1])
+            tracemalloc.reset_peak()
+        self.stack.append(stage)
+        if self.profiler and not self.profiling:
+            stage.profiler = start_profiler(self.profiler)
+            self.profiling = stage.profiler is not None
+
+    def exit(self, stage, wall, cpu, failed=False):
+        profile_file = None
+        if stage.profiler is not None:
+            profile_file = stop_profiler(stage.profiler, self.profiler, self.profile_path(stage.name))
+            self.profiling = False
+        self.stack.pop()
+        if self.memory:
+            stage.peak_bytes = max(stage.peak_bytes, tracemalloc.get_traced_memory()[1])
+            if self.stack:
+                parent = self.stack[-1]
+                parent.peak_bytes = max(parent.peak_bytes, stage.peak_bytes)
+            tracemalloc.reset_peak()
+
+        record = {
+            "run": self.run_id,
+            "script": self.script,
+            "stage": stage.name,
+            "parent": self.stack[-1].name if self.stack else None,
+            "depth": len(self.stack),
+            "start_s": round(stage.wall_start - self.started, 6),
+            "wall_s": round(wall, 6),
+            "cpu_s": round(cpu, 6),
+            "tokens": stage.tokens,
+            "tokens_per_s": round(stage.tokens / wall, 1) if stage.tokens and wall > 0 else None,
+            "peak_mb": round(stage.peak_bytes / 1e6, 3) if self.memory else None,
+            "failed": failed,
+        }
+        if profile_file:
+            record["profile"] = profile_file
+        self.records.append(record)
+        try:
+            with open(self.trace_file, "a", encoding="utf-8") as f:
+                f.write(json.dumps(record) + "\n")
+        except OSError as e:
+            print(f"WARNING: could not write trace record to '{self.trace_file}': {e}")
+
+    def profile_path(self, stage_name):
+        base = os.path.splitext(self.trace_file)[0]
+        safe_stage = "".join(c if c.isalnum() or c in "-_" else "_" for c in stage_name)
+        extension = "prof" if self.profiler == "cprofile" else "txt"
+        return f"{base}.{self.script}.{safe_stage}.{extension}"
+
+    def print_summary(self):
+        if self.records:
+            print("\n" + format_summary(self.records, f"{self.script} (run {self.run_id})"))
+            print(f"Trace appended to '{self.trace_file}'.")
+
+# --- PROFILERS (opt-in) ---
+
+def start_profiler(kind):
+    if kind == "cprofile":
+        import cProfile
+        profiler = cProfile.Profile()
+        profiler.enable()
+        return profiler
+    try:
+        from pyinstrument import Profiler
+    except ImportError:
+        print("WARNING: pyinstrument is not installed (pip install pyinstrument). Stage not profiled.")
+        return None
+    profiler = Profiler()
+    profiler.start()
+    return profiler
+
+def stop_profiler(profiler, kind, path):
+    if kind == "cprofile":
+        profiler.disable()
+        profiler.dump_stats(path)
+    else:
+        profiler.stop()
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(profiler.output_text(unicode=True))
+    return path
+
+# --- SUMMARY ---
+
+def format_summary(records, title):
+    """One-page table: stages in execution order, nested stages indented under their parent."""
+    top_level_wall = sum(r["wall_s"] for r in records if r["depth"] == 0) or 1e-12
+    width = max(28, max(len(r["stage"]) + 2 * r["depth"] for r in records) + 2)
+    lines = [f"--- Stage summary: {title} ---",
+             f"{'Stage':<{width}}{'Wall (s)':>10}{'CPU (s)':>10}{'% wall':>8}{'Tokens':>12}{'Tokens/s':>12}{'Peak MB':>10}"]
+    # Records are written when a stage ends (children before their parent), so
+    # re-order them by start time to show each parent above its children.
+    for r in sorted(records, key=lambda r: (r["start_s"], r["depth"])):
+        name = "  " * r["depth"] + r["stage"] + (" (failed)" if r.get("failed") else "")
+        tokens = f"{r['tokens']:,}" if r["tokens"] else "-"
+        rate = f"{r['tokens_per_s']:,.0f}" if r.get("tokens_per_s") else "-"
+        peak = f"{r['peak_mb']:.1f}" if r.get("peak_mb") is not None else "-"
+        lines.append(f"{name:<{width}}{r['wall_s']:>10.3f}{r['cpu_s']:>10.3f}{r['wall_s'] / top_level_wall * 100:>7.1f}%"
+                     f"{tokens:>12}{rate:>12}{peak:>10}")
+    lines.append(f"{'Total':<{width}}{top_level_wall:>10.3f}")
+    return "\n".join(lines)
+
+def summarize_trace_file(trace_file):
+    """Aggregates every run in a trace file by script and stage (count, mean/total wall, max peak)."""
+    totals = defaultdict(lambda: {"runs": 0, "wall_s": 0.0, "cpu_s": 0.0, "tokens": 0, "peak_mb": None})
+    with open(trace_file, "r", encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            r = json.loads(line)
+            entry = totals[(r["script"], r["stage"])]
+            entry["runs"] += 1
+            entry["wall_s"] += r["wall_s"]
+            entry["cpu_s"] += r["cpu_s"]
+            entry["tokens"] += r["tokens"] or 0
+            if r.get("peak_mb") is not None:
+                entry["peak_mb"] = max(entry["peak_mb"] or 0, r["peak_mb"])
+    lines = [f"--- Trace summary: {trace_file} ---",
+             f"{'Script':<36}{'Stage':<18}{'Runs':>6}{'Mean wall':>11}{'Mean CPU':>10}{'Tokens/s':>12}{'Max MB':>9}"]
+    for (script, stage_name), e in sorted(totals.items(), key=lambda item: -item[1]["wall_s"]):
+        rate = f"{e['tokens'] / e['wall_s']:,.0f}" if e["tokens"] and e["wall_s"] else "-"
+        peak = f"{e['peak_mb']:.1f}" if e["peak_mb"] is not None else "-"
+        lines.append(f"{script:<36}{stage_name:<18}{e['runs']:>6}{e['wall_s'] / e['runs']:>11.3f}"
+                     f"{e['cpu_s'] / e['runs']:>10.3f}{rate:>12}{peak:>9}")
+    return "\n".join(lines)
+
+# --- PUBLIC API ---
+
+_tracer = None
+
+def configure(trace_file, memory=True, profiler=None):
+    """Turns tracing on for this process (the env variables do the same at import time)."""
+    global _tracer
+    if _tracer is None:
+        atexit.register(lambda: _tracer and _tracer.print_summary())
+    _tracer = Tracer(trace_file, memory=memory, profiler=profiler or None)
+    os.environ[TRACE_ENV] = trace_file  # Child processes (pools, spawned workers) inherit the setting
+    os.environ[MEMORY_ENV] = "1" if memory else "0"
+    if profiler:
+        os.environ[PROFILE_ENV] = profiler
+    return _tracer
+
+def is_enabled():
+    return _tracer is not None
+
+def stage(name, tokens=0):
+    """Context manager timing one stage; a no-op when tracing is off."""
+    if _tracer is None:
+        return _NULL_STAGE
+    return _tracer.stage(name, tokens)
+
+def traced(name=None):
+    """Decorator form of stage(); the stage name defaults to the function name."""
+    def decorator(func):
+        stage_name = name or func.__name__
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if _tracer is None:
+                return func(*args, **kwargs)
+            with _tracer.stage(stage_name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+if os.environ.get(TRACE_ENV):
+    configure(os.environ[TRACE_ENV],
+              memory=os.environ.get(MEMORY_ENV, "1") != "0",
+              profiler=os.environ.get(PROFILE_ENV))
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Usage: python instrumentation.py <trace.jsonl>")
+    else:
+        try:
+            print(summarize_trace_file(sys.argv[1]))
+        except FileNotFoundError:
+            print(f"ERROR: Trace file '{sys.argv[1]}' not found.")
@@ -0,0 +1,100 @@
+import re
+from collections import namedtuple
+
+# ==============================================================================
+#        IVTFF: parser for the interlinear transcription file (voynich.txt)
+# ==============================================================================
+# voynich.txt holds one page header per folio and one locus line per
+# transcriber reading of each text line:
+#
+#   <f1r>          <! $I=T $Q=A $P=A $L=A $H=1 $X=V>
+#   <f1r.1,@P0;H>      fachys.ykal.ar.ataiin.shol.shory.cth!res.y.kor.sholdy!
+#   <f1r.1,@P0;C>      fachys.ykal.ar.ataiin.shol.shory.cthorys.y.kor.sholdy!
+#
+# Locus tag: <folio.line,{marker}{unit};{transcriber}>
+#   marker: '@' starts a paragraph/unit, '+' continues it, '=' ends it,
+#           '*', '&', '~', '/' mark isolated lines (labels, rings, ...)
+#   unit:   P = paragraph text, L = label, C = circular, R = radial (+ subtype)
+#   transcriber: H (Takahashi), C (Currier), F (Friedman), N, U, V, T, G, ...
+#
+# Page variables: $I illustration, $Q quire, $P page in quire, $L Currier
+# language, $H hand, $X extra. Missing variables are simply absent.
+
+PAGE_HEADER = re.compile(r"^<(f[0-9A-Za-z]+)>\s*(?:<!(.*?)>)?")
+PAGE_VARIABLE = re.compile(r"\$([A-Z])=([^\s>]+)")
+LOCUS_LINE = re.compile(r"^<(f[0-9A-Za-z]+)\.([0-9A-Za-z]+),([@+=*&~/])([A-Za-z])([A-Za-z0-9]*);([A-Za-z])>\s*(.*)$")
+IN_WORD_CODE = re.compile(r"<[!@][^>]*>")  # <!plant>, <!@o'>, <@T>, ...: removed inside the word, as in 10b
+INLINE_CODE = re.compile(r"<[^>]*>")       # <$> end of paragraph, anything left: a word break
+WORD_BREAK = re.compile(r"[.,\s]+")        # '.' space, ',' uncertain space
+FILLERS = re.compile(r"[!%]")              # Alignment fillers, not glyphs
+
+PAGE_VARIABLE_NAMES = {"I": "illustration", "Q": "quire", "P": "page", "L": "language", "H": "hand", "X": "extra"}
+ISOLATED_MARKERS = "@*&~/"   # Markers that open a new paragraph/unit
+
+Locus = namedtuple("Locus", "folio line marker unit subtype transcriber text")
+
+def parse_page_header(line):
+    """Returns (folio, {variable: value}) for a page header line, else None."""
+    match = PAGE_HEADER.match(line)
+    if not match:
+        return None
+    return match.group(1), dict(PAGE_VARIABLE.findall(match.group(2) or ""))
+
+def parse_locus(line):
+    """Returns a Locus for a transcription line, else None."""
+    match = LOCUS_LINE.match(line)
+    if not match:
+        return None
+    return Locus(*match.groups())
+
+def split_words(text):
+    """
+    EVA words of one locus: comments and <@...> codes removed without
+    breaking the word (o<!@o'>oiin -> ooiin), '<->' (plant interruption),
+    ',' (uncertain space) and other inline codes treated as word breaks,
+    fillers dropped. '?' and '*' (unreadable glyphs) are kept inside the word.
+    """
+    text = IN_WORD_CODE.sub("", text).replace("<->", ".")
+    text = FILLERS.sub("", INLINE_CODE.sub(" ", text))
+    return [w for w in WORD_BREAK.split(text) if w]
+
+class LineNumbering:
+    """
+    Line index and paragraph number of every locus of one folio, in file
+    order. All transcriber readings of a line share its numbers. A paragraph
+    starts at an opening marker (ISOLATED_MARKERS), after a line closed with
+    '=', or when the unit type (P, L, C, R) changes; the subtype is ignored,
+    so a closing '=Pt' line stays with the '+P0' lines above it.
+    """
+    def __init__(self):
+        self.lines = {}
+        self.last = None
+        self.paragraph = -1
+
+    def number(self, locus):
+        """(line_index, paragraph) of the locus; both count from 0 within the folio."""
+        if locus.line not in self.lines:
+            if (self.last is None or locus.marker in ISOLATED_MARKERS or self.last.marker == "="
+                    or locus.unit != self.last.unit):
+                self.paragraph += 1
+            self.lines[locus.line] = (len(self.lines), self.paragraph)
+            self.last = locus
+        return self.lines[locus.line]
+
+def iter_ivtff(path):
+    """
+    Yields ("page", folio, variables) and ("locus", Locus) records in file
+    order, skipping comments and blank lines.
+    """
+    with open(path, "r", encoding="utf-8", errors="ignore") as f:
+        for raw_line in f:
+            line = raw_line.strip().lstrip("﻿")
+            if not line.startswith("<f"):
+                continue
+            locus = parse_locus(line)
+            if locus:
+                yield "locus", locus
+                continue
+            header = parse_page_header(line)
+            if header:
+                yield "page", header[0], header[1]
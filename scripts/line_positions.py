@@ -0,0 +1,114 @@
+import sys
+
+# ==============================================================================
+#    LINE POSITIONS: token position classes and vectorized chi-square tests
+# ==============================================================================
+# Used by 29_analyze_line_positions.py. The token table keeps every locus's
+# paragraph number and each word's position in its line, in file order, so
+# one transcriber's rows give every token's place on the page in one pass:
+#
+#   classes, keep = position_classes(folio_codes, paragraph, position)
+#   counts = position_counts(word_codes[keep], classes[keep], n_words)   # items x POSITION_CLASSES
+#   chi2, dof, p, residuals = chi_square_rows(counts)
+#
+# Each item (row) is tested against all other items with a 2 x C table; the
+# adjusted residuals say in which position class it is over- (> 0) or
+# under-represented (< 0), in standard deviations.
+
+POSITION_CLASSES = ["paragraph_initial", "line_initial", "line_final", "interior"]
+PARAGRAPH_INITIAL, LINE_INITIAL, LINE_FINAL, INTERIOR = range(len(POSITION_CLASSES))
+
+def import_scipy_special():
+    """
+    Imports scipy.special on first use and provides a helpful error message
+    if it's not installed.
+    """
+    try:
+        import scipy.special
+    except ImportError:
+        print("Error: The 'scipy' library is not installed.")
+        print("Please install it by running: pip install scipy")
+        sys.exit(1)
+    return scipy.special
+
+def position_classes(folio_codes, paragraph, position, min_paragraph_lines=1):
+    """
+    Position class of every token of one transcriber (rows in file order).
+    The first word of a paragraph's first line is paragraph-initial, the
+    first word of any other line line-initial, the last word of a line
+    line-final (a one-word line counts as initial). Returns (classes, keep),
+    keep being False for tokens of paragraphs with fewer than
+    min_paragraph_lines lines (labels and other isolated lines).
+    """
+    import numpy as np
+    line_start = np.asarray(position) == 0
+    line_end = np.r_[line_start[1:], True]
+    keys = np.asarray(folio_codes, dtype=np.int64) * (int(np.max(paragraph)) + 1) + np.asarray(paragraph)
+    start_rows = np.flatnonzero(line_start)
+    start_keys = keys[start_rows]
+    first_line = np.r_[True, start_keys[1:] != start_keys[:-1]]
+    classes = np.full(len(line_start), INTERIOR, dtype=np.int8)
+    classes[line_end] = LINE_FINAL
+    classes[line_start] = LINE_INITIAL
+    classes[start_rows[first_line]] = PARAGRAPH_INITIAL
+    paragraph_of_line = np.cumsum(first_line) - 1
+    lines_per_paragraph = np.bincount(paragraph_of_line)
+    token_paragraph = paragraph_of_line[np.cumsum(line_start) - 1]
+    return classes, lines_per_paragraph[token_paragraph] >= min_paragraph_lines
+
+def position_counts(codes, classes, n_items):
+    """(n_items x len(POSITION_CLASSES)) token counts; codes < 0 are skipped."""
+    import numpy as np
+    valid = codes >= 0
+    flat = np.bincount(codes[valid].astype(np.int64) * len(POSITION_CLASSES) + classes[valid],
+                       minlength=n_items * len(POSITION_CLASSES))
+    return flat.reshape(n_items, len(POSITION_CLASSES))
+
+def chi_square_rows(counts):
+    """
+    Chi-square test of every row against the rest of the table. Returns
+    (statistic, degrees of freedom, p-value, adjusted residuals per class).
+    Classes that no token falls into are left out.
+    """
+    import numpy as np
+    special = import_scipy_special()
+    counts = np.asarray(counts, dtype=np.float64)
+    used = counts.sum(axis=0) > 0
+    observed = counts[:, used]
+    column = observed.sum(axis=0)
+    total = column.sum()
+    row = observed.sum(axis=1, keepdims=True)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        expected = row * column / total
+        expected_rest = (total - row) * column / total
+        statistic = (((observed - expected) ** 2 / expected).sum(axis=1)
+                     + (((column - observed) - expected_rest) ** 2 / expected_rest).sum(axis=1))
+        adjusted = (observed - expected) / np.sqrt(expected * (1 - row / total) * (1 - column / total))
+    dof = int(used.sum()) - 1
+    residuals = np.full(counts.shape, np.nan)
+    residuals[:, used] = adjusted
+    return statistic, dof, special.chdtrc(dof, statistic), residuals
+
+def chi_square_table(counts):
+    """Chi-square independence test of a whole items x classes table: (statistic, dof, p-value, Cramer's V)."""
+    import numpy as np
+    special = import_scipy_special()
+    counts = np.asarray(counts, dtype=np.float64)
+    counts = counts[counts.sum(axis=1) > 0][:, counts.sum(axis=0) > 0]
+    total = counts.sum()
+    expected = counts.sum(axis=1, keepdims=True) * counts.sum(axis=0) / total
+    statistic = float(((counts - expected) ** 2 / expected).sum())
+    dof = (counts.shape[0] - 1) * (counts.shape[1] - 1)
+    cramers_v = float(np.sqrt(statistic / (total * max(1, min(counts.shape) - 1))))
+    return statistic, dof, float(special.chdtrc(dof, statistic)), cramers_v
+
+def benjamini_hochberg(p_values):
+    """False-discovery-rate q-values (NaN p-values stay NaN)."""
+    import numpy as np
+    p_values = np.asarray(p_values, dtype=np.float64)
+    q = np.full(len(p_values), np.nan)
+    valid = np.flatnonzero(~np.isnan(p_values))
+    order = valid[np.argsort(p_values[valid])]
+    ranked = p_values[order] * len(order) / np.arange(1, len(order) + 1)
+    q[order] = np.minimum(1.0, np.minimum.accumulate(ranked[::-1])[::-1])
+    return q
@@ -0,0 +1,182 @@
+# ==============================================================================
+#    MINHASH / LSH: near-duplicate documents without comparing all pairs
+# ==============================================================================
+# Used by 33_find_near_duplicates.py. A document (a line or a paragraph) is
+# a set of shingle ids: n-grams of its word ids or of its glyph ids, padded
+# with a boundary symbol so one-word lines still have shingles. Everything
+# works on ragged (values, offsets) arrays:
+#
+#   codes, offsets = ngram_shingles(symbols, doc_offsets, n=2, n_symbols=V)
+#   representative = identical_documents(codes, offsets)     # Exact copies share one
+#   signatures = minhash_signatures(codes, offsets, num_perm=128, seed=1409)
+#   first, second = lsh_candidates(signatures, bands=32)
+#   jaccard = exact_jaccard(codes, offsets, first, second)
+#   labels = connected_components(len(offsets) - 1, first[keep], second[keep])
+#
+# Documents with identical shingle sets (common in multi-transcriber and
+# synthetic corpora) are found by a set fingerprint and only their
+# representative goes through MinHash. MinHash uses the universal hashes
+# (a * x + b) mod (2^31 - 1), computed once per distinct shingle and
+# gathered per document in chunks. Candidates whose signatures estimate a
+# similarity far below the threshold are dropped before exact Jaccard.
+# LSH hashes every band of rows to one uint64 key, sorts the keys, and pairs
+# each document with the next MAX_OFFSET documents of its bucket in sorted
+# order. A large bucket is chained rather than fully paired, so the work
+# stays linear in the number of documents; clusters are still joined
+# through the chain.
+
+MERSENNE_PRIME = (1 << 31) - 1
+CHUNK_SHINGLES = 200_000          # Shingles gathered per chunk (x num_perm uint32)
+MAX_OFFSET = 32                   # Bucket neighbours paired per document
+
+def sorted_distinct(values):
+    """np.unique of a 1-D array by sorting (numpy 2's hash-based unique is far slower on large int arrays)."""
+    import numpy as np
+    values = np.sort(values)
+    return values[np.r_[True, values[1:] != values[:-1]]] if len(values) else values
+
+def ragged_gather(values, offsets, rows):
+    """(values of the given rows concatenated, their offsets)."""
+    import numpy as np
+    starts, lengths = offsets[rows], np.diff(offsets)[rows]
+    new_offsets = np.r_[0, np.cumsum(lengths)].astype(np.int64)
+    index = np.repeat(starts - new_offsets[:-1], lengths) + np.arange(int(new_offsets[-1]))
+    return values[index], new_offsets
+
+def ngram_shingles(symbols, offsets, n, n_symbols):
+    """
+    Distinct n-gram codes of every document (symbols in [0, n_symbols),
+    documents padded with the boundary symbol n_symbols). Codes are compact:
+    0 .. number of distinct n-grams - 1. Returns (codes, offsets).
+    """
+    import numpy as np
+    symbols = np.asarray(symbols, dtype=np.int64)
+    lengths = np.diff(offsets)
+    base = n_symbols + 1
+    # Padded stream: boundary, document, boundary, document, ...
+    padded_lengths = lengths + 2
+    padded_offsets = np.r_[0, np.cumsum(padded_lengths)]
+    padded = np.full(int(padded_offsets[-1]), n_symbols, dtype=np.int64)
+    owner = np.repeat(np.arange(len(lengths)), lengths)
+    padded[np.arange(len(symbols)) + 1 + 2 * owner] = symbols
+    width = np.maximum(padded_lengths - n + 1, 0)
+    starts = np.repeat(padded_offsets[:-1], width) + (np.arange(int(width.sum())) - np.repeat(np.r_[0, np.cumsum(width)[:-1]], width))
+    codes = np.zeros(len(starts), dtype=np.int64)
+    for k in range(n):
+        codes = codes * base + padded[starts + k]
+    docs = np.repeat(np.arange(len(lengths)), width)
+    order = np.argsort(codes)
+    compact = np.empty(len(codes), dtype=np.int64)
+    compact[order] = np.cumsum(np.r_[True, np.diff(codes[order]) != 0])[:len(codes)] - 1   # Rank among distinct n-grams
+    scale = int(compact.max()) + 1 if len(compact) else 1
+    pairs = sorted_distinct(docs * scale + compact)
+    doc_of, code_of = pairs // scale, pairs % scale
+    return code_of, np.r_[0, np.cumsum(np.bincount(doc_of, minlength=len(lengths)))].astype(np.int64)
+
+def identical_documents(codes, offsets, seed=0):
+    """Representative (first document with the same shingle set) of every document."""
+    import numpy as np
+    n_docs = len(offsets) - 1
+    lengths = np.diff(offsets)
+    values = np.random.default_rng(seed).integers(0, 1 << 63, int(codes.max()) + 1 if len(codes) else 1,
+                                                  dtype=np.int64).astype(np.uint64)
+    fingerprint = np.zeros(n_docs, dtype=np.uint64)
+    filled = np.flatnonzero(lengths > 0)
+    if len(filled):
+        fingerprint[filled] = np.add.reduceat(values[codes], offsets[:-1][filled])   # Set hash: sum of random values
+    keys = np.stack([fingerprint, lengths.astype(np.uint64)], axis=1)
+    _, first_of_group, group = np.unique(keys, axis=0, return_index=True, return_inverse=True)
+    return first_of_group[group.ravel()]
+
+def minhash_signatures(codes, offsets, num_perm, seed):
+    """(documents x num_perm) uint32 MinHash signatures; empty documents get the maximum value."""
+    import numpy as np
+    rng = np.random.default_rng(seed)
+    a = rng.integers(1, MERSENNE_PRIME, num_perm, dtype=np.int64).astype(np.uint64)
+    b = rng.integers(0, MERSENNE_PRIME, num_perm, dtype=np.int64).astype(np.uint64)
+    distinct = np.arange(int(codes.max()) + 1 if len(codes) else 0, dtype=np.uint64)
+    table = ((distinct[:, None] * a[None, :] + b[None, :]) % np.uint64(MERSENNE_PRIME)).astype(np.uint32)
+    n_docs = len(offsets) - 1
+    signatures = np.full((n_docs, num_perm), MERSENNE_PRIME, dtype=np.uint32)
+    lengths = np.diff(offsets)
+    doc = 0
+    while doc < n_docs:
+        # Whole documents per chunk, at least one
+        end = max(int(np.searchsorted(offsets, offsets[doc] + CHUNK_SHINGLES, side="right")) - 1, doc + 1)
+        end = min(end, n_docs)
+        chunk = codes[offsets[doc]:offsets[end]]
+        if len(chunk):
+            hashes = table[chunk]
+            chunk_lengths = lengths[doc:end]
+            filled = np.flatnonzero(chunk_lengths > 0)
+            starts = (offsets[doc:end] - offsets[doc])[filled]
+            signatures[doc + filled] = np.minimum.reduceat(hashes, starts, axis=0)
+        doc = end
+    return signatures
+
+def lsh_candidates(signatures, bands, max_offset=MAX_OFFSET, valid=None):
+    """Candidate pairs (first < second) sharing at least one band, as two int64 arrays."""
+    import numpy as np
+    n_docs, num_perm = signatures.shape
+    rows = num_perm // bands
+    valid = np.ones(n_docs, dtype=bool) if valid is None else valid
+    documents = np.flatnonzero(valid)
+    multipliers = np.random.default_rng(0).integers(1, 1 << 62, rows, dtype=np.int64).astype(np.uint64) | np.uint64(1)
+    found = []
+    for band in range(bands):
+        block = signatures[documents, band * rows:(band + 1) * rows].astype(np.uint64)
+        keys = (block * multipliers).sum(axis=1)        # Wraps around: collisions are verified later
+        order = np.argsort(keys, kind="stable")
+        sorted_keys, sorted_docs = keys[order], documents[order]
+        band_pairs = []
+        for offset in range(1, max_offset + 1):
+            same = sorted_keys[offset:] == sorted_keys[:-offset]
+            if not same.any():
+                break
+            a, b = sorted_docs[:-offset][same], sorted_docs[offset:][same]
+            band_pairs.append(np.minimum(a, b) * n_docs + np.maximum(a, b))
+        if band_pairs:
+            found.append(sorted_distinct(np.concatenate(band_pairs)))     # Deduplicated per band to bound memory
+    pairs = sorted_distinct(np.concatenate(found)) if found else np.zeros(0, dtype=np.int64)
+    return pairs // n_docs, pairs % n_docs
+
+def estimated_jaccard(signatures, first, second, chunk_pairs=200_000):
+    """Share of equal MinHash values of each (first, second) pair."""
+    import numpy as np
+    estimate = np.zeros(len(first))
+    for start in range(0, len(first), chunk_pairs):
+        a, b = first[start:start + chunk_pairs], second[start:start + chunk_pairs]
+        estimate[start:start + len(a)] = (signatures[a] == signatures[b]).mean(axis=1)
+    return estimate
+
+def exact_jaccard(codes, offsets, first, second, chunk_pairs=200_000):
+    """Exact Jaccard similarity of the shingle sets of each (first, second) pair."""
+    import numpy as np
+    lengths = np.diff(offsets)
+    scale = int(codes.max()) + 1 if len(codes) else 1
+    jaccard = np.zeros(len(first))
+    for start in range(0, len(first), chunk_pairs):
+        a, b = first[start:start + chunk_pairs], second[start:start + chunk_pairs]
+        codes_a, offsets_a = ragged_gather(codes, offsets, a)
+        codes_b, offsets_b = ragged_gather(codes, offsets, b)
+        pair_a = np.repeat(np.arange(len(a)), np.diff(offsets_a))
+        pair_b = np.repeat(np.arange(len(b)), np.diff(offsets_b))
+        keys = np.sort(np.r_[pair_a * scale + codes_a, pair_b * scale + codes_b])
+        shared = keys[1:] == keys[:-1]                   # Each set is distinct, so a repeat is a shared shingle
+        intersection = np.bincount(keys[1:][shared] // scale, minlength=len(a))
+        union = lengths[a] + lengths[b] - intersection
+        jaccard[start:start + len(a)] = np.where(union > 0, intersection / np.maximum(union, 1), 0.0)
+    return jaccard
+
+def connected_components(n_nodes, first, second):
+    """Component label (its smallest node) of every node, by min-label propagation with pointer jumping."""
+    import numpy as np
+    labels = np.arange(n_nodes)
+    while True:
+        previous = labels.copy()
+        smaller = np.minimum(labels[first], labels[second])
+        np.minimum.at(labels, labels[first], smaller)
+        np.minimum.at(labels, labels[second], smaller)
+        labels = labels[labels]
+        if np.array_equal(labels, previous):
+            return labels
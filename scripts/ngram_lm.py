@@ -0,0 +1,116 @@
+from collections import Counter, namedtuple
+
+# ==============================================================================
+#    N-GRAM LM: interpolated modified Kneser-Ney on sorted integer arrays
+# ==============================================================================
+# Used by 27_score_ngram_perplexity.py. Sequences (paragraphs of words or
+# roots) are turned into an "events" matrix: one row per predicted token
+# (every token plus the closing </s>), holding the order - 1 preceding
+# symbols and the token itself. An n-gram is stored as one int64 key in base
+# V (the vocabulary size), so the key of its context is simply key // V and
+# a table sorted by key is also sorted by context:
+#
+#   vocabulary = build_vocabulary(train_sequences + test_sequences)
+#   train, _ = ngram_events(train_sequences, vocabulary, order=3)
+#   model = KneserNeyLM.fit(train, len(vocabulary), order=3)
+#   test, owner = ngram_events(test_sequences, vocabulary, order=3)
+#   log_probs = model.log_prob(test)           # natural log, one per event
+#
+# Each order keeps its keys, discounted counts, and per context the total
+# count and back-off weight (Chen & Goodman's D1, D2, D3+ discounts; lower
+# orders use continuation counts). Scoring looks every event up with
+# searchsorted, order by order, so a whole corpus is one vectorized pass.
+
+BOS, EOS, UNK = "<s>", "</s>", "<unk>"
+
+NgramTable = namedtuple("NgramTable", "keys discounted contexts totals backoff")
+
+def build_vocabulary(sequences, min_count=1):
+    """[BOS, EOS, UNK] + every symbol seen at least min_count times, sorted."""
+    counts = Counter(symbol for sequence in sequences for symbol in sequence)
+    return [BOS, EOS, UNK] + sorted(symbol for symbol, count in counts.items() if count >= min_count)
+
+def ngram_events(sequences, vocabulary, order):
+    """
+    (events, owner): events is an (n_events x order) int64 array of
+    [history..., token] rows, padded with BOS; owner is the sequence index
+    of every row. Symbols outside the vocabulary become UNK.
+    """
+    import numpy as np
+    code = {symbol: i for i, symbol in enumerate(vocabulary)}
+    unk = code[UNK]
+    rows, owner = [], []
+    for i, sequence in enumerate(sequences):
+        padded = [0] * (order - 1) + [code.get(symbol, unk) for symbol in sequence] + [code[EOS]]
+        for end in range(order, len(padded) + 1):
+            rows.append(padded[end - order:end])
+        owner.extend([i] * (len(sequence) + 1))
+    return np.array(rows, dtype=np.int64).reshape(-1, order), np.array(owner, dtype=np.int64)
+
+def encode_keys(grams, base):
+    """One int64 key per row of an (n x k) symbol array."""
+    import numpy as np
+    keys = np.zeros(len(grams), dtype=np.int64)
+    for column in range(grams.shape[1]):
+        keys = keys * base + grams[:, column]
+    return keys
+
+def discounts(counts):
+    """Modified Kneser-Ney D1, D2, D3+ from the count-of-counts (plain absolute discount if they are degenerate)."""
+    import numpy as np
+    n = [int(np.count_nonzero(counts == i)) for i in range(1, 5)]
+    y = n[0] / (n[0] + 2 * n[1]) if n[0] and n[1] else 0.5
+    if not all(n):
+        return np.array([y, y, y])
+    d = np.array([1 - 2 * y * n[1] / n[0], 2 - 3 * y * n[2] / n[1], 3 - 4 * y * n[3] / n[2]])
+    return np.minimum(d, [1.0, 2.0, 3.0]) if (d > 0).all() else np.array([y, y, y])
+
+def build_table(keys, counts, base):
+    """Sorted n-gram keys and counts -> NgramTable (contexts = key // base)."""
+    import numpy as np
+    d = discounts(counts)
+    discounted = counts - d[np.minimum(counts, 3).astype(np.int64) - 1]
+    contexts, starts = np.unique(keys // base, return_index=True)
+    totals = np.add.reduceat(counts, starts)
+    removed = np.add.reduceat(counts - discounted, starts)   # D(c) summed over the context's n-grams
+    return NgramTable(keys, discounted, contexts, totals, removed / totals)
+
+class KneserNeyLM:
+    def __init__(self, tables, base, order):
+        self.tables = tables     # tables[k - 1] holds the k-grams
+        self.base = base
+        self.order = order
+
+    @classmethod
+    def fit(cls, events, base, order=None):
+        """Counts the highest-order n-grams of the events; lower orders use continuation counts."""
+        import numpy as np
+        order = order or events.shape[1]
+        if base ** order >= 2 ** 63:
+            raise ValueError(f"vocabulary of {base} symbols is too large for order {order} int64 keys")
+        keys, counts = np.unique(encode_keys(events[:, -order:], base), return_counts=True)
+        tables = [build_table(keys, counts.astype(np.float64), base)]
+        for k in range(order - 1, 0, -1):
+            # N1+(. w): distinct left extensions of each k-gram = distinct (k+1)-grams after dropping the first symbol
+            keys, counts = np.unique(keys % base ** k, return_counts=True)
+            tables.insert(0, build_table(keys, counts.astype(np.float64), base))
+        return cls(tables, base, order)
+
+    def log_prob(self, events):
+        """Natural-log probability of the last symbol of every event row."""
+        import numpy as np
+        events = events[:, -self.order:]
+        prob = np.full(len(events), 1.0 / (self.base - 1))   # Uniform over every symbol but BOS
+        for k, table in enumerate(self.tables, 1):
+            keys = encode_keys(events[:, -k:], self.base)
+            at = np.minimum(np.searchsorted(table.contexts, keys // self.base), len(table.contexts) - 1)
+            seen_context = table.contexts[at] == keys // self.base
+            gram_at = np.minimum(np.searchsorted(table.keys, keys), len(table.keys) - 1)
+            discounted = np.where(table.keys[gram_at] == keys, table.discounted[gram_at], 0.0)
+            mixed = discounted / table.totals[at] + table.backoff[at] * prob
+            prob = np.where(seen_context, mixed, prob)   # Unseen context: keep the lower-order estimate
+        return np.log(prob)
+
+def perplexity(log_probs):
+    import numpy as np
+    return float(np.exp(-np.mean(log_probs))) if len(log_probs) else float("nan")
@@ -0,0 +1,276 @@
+import json
+import os
+import re
+from collections import defaultdict
+
+# ==============================================================================
+#    READING LATTICE: every transcriber's reading of a line, kept side by side
+# ==============================================================================
+# Used by 30_analyze_reading_lattice.py. voynich.txt unfolds each '[a|b]'
+# choice into the readings of several transcribers, aligned column by column
+# with '!' fillers. Instead of keeping one of them (01 keeps H and strips
+# '!', '%', '*', '<@..>'), a line becomes a sequence of independent slots:
+# the line is cut wherever every reading has a word break, and a slot's
+# alternatives are the distinct word sequences the readings give between two
+# cuts, weighted by the share of transcribers behind each. Two more kinds of
+# doubt are expanded inside a reading:
+#   - ',' (uncertain space): the split reading and the joined word, half each;
+#   - '?' / '*' (unreadable glyph): the known words that fit the pattern,
+#     weighted by frequency (the literal word is kept with weight 0).
+#
+# Storage is flat arrays (CSR style): slot -> line, alternative -> slot,
+# weight and transcriber bitmask, alternative -> range of word ids. Because
+# slots are independent, expected counts are weighted bincounts and exact
+# min/max counts are sums of per-slot minima and maxima, without ever
+# enumerating whole readings:
+#
+#   lattice = ReadingLattice.load(LATTICE_DIR)
+#   expected = lattice.expected_counts(lattice.word_items(), n_items)
+#   low, high = lattice.count_bounds(lattice.word_items(), n_items)
+
+LATTICE_DIR = "reading_lattice"
+LATTICE_VERSION = 2
+WILDCARDS = "?*"                 # Unreadable-glyph marks
+FILLER_CHARACTERS = "!%"         # Alignment fillers, not glyphs
+MAX_WILDCARDS = 2                # Words with more unreadable glyphs are kept literal
+MAX_MATCHES = 20                 # Most frequent fitting words per wildcard word
+
+IN_WORD_CODE = re.compile(r"<[!@][^>]*>")   # Removed inside the word, as in ivtff.split_words
+INLINE_CODE = re.compile(r"<[^>]*>")
+WORD_SPLIT = re.compile(r"[.\s]+")
+
+def normalize_reading(text):
+    """
+    (text, break columns): the locus text with '<->' as a word break and
+    other inline codes removed, so the readings stay column-aligned. As in
+    ivtff.split_words, comments and <@...> codes vanish inside their word,
+    while any other removed code still breaks it.
+    """
+    pieces, breaks, length = [], set(), 0
+    for piece in INLINE_CODE.split(IN_WORD_CODE.sub("", text).replace("<->", "...")):
+        pieces.append(piece)
+        length += len(piece)
+        breaks.add(length)
+    return "".join(pieces).rstrip(), breaks
+
+def reading_words(segment):
+    """[(words, share)] of one reading of a segment: split at ',' and, if any, joined as well."""
+    cleaned = "".join(c for c in segment if c not in FILLER_CHARACTERS)
+    split = tuple(w for w in WORD_SPLIT.split(cleaned.replace(",", ".")) if w)
+    if "," not in cleaned:
+        return [(split, 1.0, True)]
+    joined = tuple(w for w in WORD_SPLIT.split(cleaned.replace(",", "")) if w)
+    if joined == split:
+        return [(split, 1.0, True)]
+    return [(split, 0.5, True), (joined, 0.5, False)]
+
+def locus_slots(readings):
+    """
+    readings: {transcriber: locus text}. Returns [slot], a slot being
+    {words tuple: [weight, set of transcribers whose literal reading it is]}.
+    """
+    texts = {t: normalize_reading(text) for t, text in readings.items()}
+    lengths = {len(text) for text, _ in texts.values()}
+    if len(texts) > 1 and len(lengths) == 1:
+        # Aligned: cut at columns where every reading breaks
+        length = lengths.pop()
+        cuts = [i for i in range(length) if all(text[i] in ". " for text, _ in texts.values())]
+        bounds = list(zip([-1] + cuts, cuts + [length]))
+    else:
+        bounds = [(-1, max(lengths) if lengths else 0)]  # One slot: each transcriber's whole line
+    slots = []
+    share = 1.0 / len(texts)
+    for start, end in bounds:
+        slot = {}
+        for transcriber, (text, breaks) in texts.items():
+            segment = "".join(("." if i in breaks else "") + text[i] for i in range(start + 1, min(end, len(text))))
+            for words, part, literal in reading_words(segment):
+                entry = slot.setdefault(words, [0.0, set()])
+                entry[0] += share * part
+                if literal:
+                    entry[1].add(transcriber)
+        if any(words for words in slot):
+            slots.append(slot)
+    return slots
+
+def wildcard_matches(word, vocabulary_by_length, max_matches=MAX_MATCHES):
+    """[(known word, frequency)] fitting a word whose '?'/'*' stand for one glyph each."""
+    import numpy as np
+    entry = vocabulary_by_length.get(len(word))
+    if entry is None:
+        return []
+    words, letters, frequencies = entry
+    pattern = np.frombuffer(word.encode("latin-1", "replace"), dtype=np.uint8)
+    known = ~np.isin(pattern, np.frombuffer(WILDCARDS.encode(), dtype=np.uint8))
+    fits = np.flatnonzero((letters[:, known] == pattern[known]).all(axis=1))
+    fits = fits[np.argsort(-frequencies[fits], kind="stable")][:max_matches]
+    return [(words[i], float(frequencies[i])) for i in fits]
+
+class ReadingLattice:
+    def __init__(self, lines, slot_line, alt_slot, alt_weight, alt_mask, word_offsets, word_ids,
+                 vocabulary, transcribers):
+        import numpy as np
+        self.lines = lines                      # [{"folio", "line", "section"}]
+        self.slot_line = np.asarray(slot_line, dtype=np.int32)
+        self.alt_slot = np.asarray(alt_slot, dtype=np.int32)        # Alternatives are grouped by slot
+        self.alt_weight = np.asarray(alt_weight, dtype=np.float64)  # Sums to 1 within a slot
+        self.alt_mask = np.asarray(alt_mask, dtype=np.int64)        # Bit i: transcribers[i] reads exactly this
+        self.word_offsets = np.asarray(word_offsets, dtype=np.int64)
+        self.word_ids = np.asarray(word_ids, dtype=np.int32)
+        self.vocabulary = list(vocabulary)
+        self.transcribers = list(transcribers)
+        self.word_alt = np.repeat(np.arange(len(self.alt_slot), dtype=np.int32), np.diff(self.word_offsets))
+        self.slot_offsets = np.searchsorted(self.alt_slot, np.arange(len(self.slot_line) + 1))
+
+    # --- BUILD ---
+
+    @classmethod
+    def from_loci(cls, loci, sections):
+        """loci: {(folio, line): {transcriber: text}} in page order; sections: {folio: section}."""
+        import numpy as np
+        transcribers = sorted({t for readings in loci.values() for t in readings})
+        bit = {t: 1 << i for i, t in enumerate(transcribers)}
+        lines, raw_slots = [], []
+        frequencies = defaultdict(float)
+        for (folio, line), readings in loci.items():
+            slots = locus_slots(readings)
+            if not slots:
+                continue
+            lines.append({"folio": folio, "line": line, "section": sections.get(folio)})
+            for slot in slots:
+                raw_slots.append((len(lines) - 1, slot))
+                for words, (weight, _) in slot.items():
+                    for word in words:
+                        if not any(c in WILDCARDS for c in word):
+                            frequencies[word] += weight
+        by_length = defaultdict(list)
+        for word in frequencies:
+            by_length[len(word)].append(word)
+        vocabulary_by_length = {
+            length: (words, np.array([list(w.encode("latin-1", "replace")) for w in words], dtype=np.uint8),
+                     np.array([frequencies[w] for w in words]))
+            for length, words in by_length.items()}
+
+        vocabulary, code = [], {}
+        def word_id(word):
+            if word not in code:
+                code[word] = len(vocabulary)
+                vocabulary.append(word)
+            return code[word]
+
+        slot_line, alt_slot, alt_weight, alt_mask, word_offsets, word_ids = [], [], [], [], [0], []
+        match_cache = {}
+        for line_index, slot in raw_slots:
+            alternatives = {}
+            for words, (weight, readers) in slot.items():
+                mask = sum(bit[t] for t in readers)
+                expanded = [(words, 1.0)]
+                doubtful = [i for i, w in enumerate(words) if any(c in WILDCARDS for c in w)]
+                if doubtful:
+                    # The literal reading stays (for the transcribers' own counts) with weight 0
+                    previous = alternatives.get(words, (0.0, 0))
+                    alternatives[words] = (previous[0], previous[1] | mask)
+                    expanded, mask = [((), 1.0)], 0
+                    for i, word in enumerate(words):
+                        if i in doubtful and sum(c in WILDCARDS for c in word) <= MAX_WILDCARDS:
+                            if word not in match_cache:
+                                match_cache[word] = wildcard_matches(word, vocabulary_by_length)
+                            options = match_cache[word] or [(word, 1.0)]
+                        else:
+                            options = [(word, 1.0)]
+                        total = sum(f for _, f in options)
+                        expanded = [(prefix + (w,), p * f / total) for prefix, p in expanded for w, f in options]
+                        if len(expanded) > MAX_MATCHES:
+                            expanded = sorted(expanded, key=lambda e: -e[1])[:MAX_MATCHES]
+                            norm = sum(p for _, p in expanded)
+                            expanded = [(e, p / norm) for e, p in expanded]
+                for option, p in expanded:
+                    previous = alternatives.get(option, (0.0, 0))
+                    alternatives[option] = (previous[0] + weight * p, previous[1] | mask)
+            slot_line.append(line_index)
+            for words, (weight, mask) in alternatives.items():
+                alt_slot.append(len(slot_line) - 1)
+                alt_weight.append(weight)
+                alt_mask.append(mask)
+                word_ids.extend(word_id(w) for w in words)
+                word_offsets.append(len(word_ids))
+        return cls(lines, slot_line, alt_slot, alt_weight, alt_mask, word_offsets, word_ids, vocabulary, transcribers)
+
+    def save(self, lattice_dir):
+        import numpy as np
+        os.makedirs(lattice_dir, exist_ok=True)
+        np.savez(os.path.join(lattice_dir, "lattice.npz"), slot_line=self.slot_line, alt_slot=self.alt_slot,
+                 alt_weight=self.alt_weight, alt_mask=self.alt_mask, word_offsets=self.word_offsets,
+                 word_ids=self.word_ids)
+        with open(os.path.join(lattice_dir, "manifest.json"), "w", encoding="utf-8") as f:
+            json.dump({"version": LATTICE_VERSION, "transcribers": self.transcribers, "lines": self.lines,
+                       "vocabulary": self.vocabulary}, f)
+
+    @classmethod
+    def load(cls, lattice_dir):
+        import numpy as np
+        with open(os.path.join(lattice_dir, "manifest.json"), "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+        if manifest.get("version") != LATTICE_VERSION:
+            raise ValueError(f"'{lattice_dir}' is lattice version {manifest.get('version')}, expected {LATTICE_VERSION}")
+        arrays = np.load(os.path.join(lattice_dir, "lattice.npz"))
+        return cls(manifest["lines"], arrays["slot_line"], arrays["alt_slot"], arrays["alt_weight"],
+                   arrays["alt_mask"], arrays["word_offsets"], arrays["word_ids"],
+                   manifest["vocabulary"], manifest["transcribers"])
+
+    # --- STATISTICS ---
+
+    def word_groups(self, slot_groups):
+        """Group code of every word occurrence, from one group code per slot."""
+        return slot_groups[self.alt_slot[self.word_alt]]
+
+    def expected_counts(self, items, n_items, groups=None, n_groups=1):
+        """(n_groups x n_items) expected item counts. items: code per word occurrence (-1 = skip)."""
+        import numpy as np
+        groups = np.zeros(len(items), dtype=np.int64) if groups is None else groups
+        valid = items >= 0
+        flat = np.bincount(groups[valid] * n_items + items[valid], weights=self.alt_weight[self.word_alt[valid]],
+                           minlength=n_groups * n_items)
+        return flat.reshape(n_groups, n_items)
+
+    def count_bounds(self, items, n_items, groups=None, n_groups=1):
+        """Exact (min, max) item counts over all readings, (n_groups x n_items) each."""
+        import numpy as np
+        groups = np.zeros(len(items), dtype=np.int64) if groups is None else groups
+        valid = items >= 0
+        # Count of each item in each alternative
+        alt_item, per_alt = np.unique(self.word_alt[valid].astype(np.int64) * n_items + items[valid], return_counts=True)
+        alts, item_codes = alt_item // n_items, alt_item % n_items
+        slots = self.alt_slot[alts].astype(np.int64)
+        # Per (slot, item): max over the alternatives; min is 0 unless every alternative has the item
+        slot_item = slots * n_items + item_codes
+        order = np.argsort(slot_item, kind="stable")
+        slot_item, per_alt = slot_item[order], per_alt[order]
+        starts = np.flatnonzero(np.r_[True, slot_item[1:] != slot_item[:-1]])
+        high = np.maximum.reduceat(per_alt, starts)
+        low = np.minimum.reduceat(per_alt, starts)
+        having = np.diff(np.r_[starts, len(slot_item)])
+        slot_of = slot_item[starts] // n_items
+        low = np.where(having == np.diff(self.slot_offsets)[slot_of], low, 0)
+        item_of = slot_item[starts] % n_items
+        # The group of a (slot, item) pair is the group of any of its occurrences
+        group_of_slot = np.zeros(len(self.slot_line), dtype=np.int64)
+        group_of_slot[self.alt_slot[self.word_alt[valid]]] = groups[valid]
+        keys = group_of_slot[slot_of] * n_items + item_of
+        size = n_groups * n_items
+        return (np.bincount(keys, weights=low, minlength=size).reshape(n_groups, n_items),
+                np.bincount(keys, weights=high, minlength=size).reshape(n_groups, n_items))
+
+    def transcriber_alternatives(self, transcriber):
+        """Mask of the alternatives that are the transcriber's literal reading."""
+        return (self.alt_mask & (1 << self.transcribers.index(transcriber))) != 0
+
+    def sample_alternatives(self, n_samples, rng):
+        """(n_samples x n_slots) alternative index drawn for every slot by weight."""
+        import numpy as np
+        cumulative = np.cumsum(self.alt_weight)
+        slot_start = np.r_[0.0, cumulative][self.slot_offsets[:-1]]
+        slot_total = np.add.reduceat(self.alt_weight, self.slot_offsets[:-1])
+        draws = slot_start + rng.random((n_samples, len(self.slot_line))) * slot_total
+        chosen = np.searchsorted(cumulative, draws, side="right")
+        return np.minimum(chosen, self.slot_offsets[1:] - 1)
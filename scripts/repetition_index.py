@@ -0,0 +1,119 @@
+import csv
+from collections import defaultdict
+
+# ==============================================================================
+#    REPETITION INDEX: exact and one-edit repeats via deletion-neighbourhood keys
+# ==============================================================================
+# Used by 32_build_repetition_index.py and, optionally, by the translator
+# (10b). Two words are one edit apart exactly when they share a key:
+#   - deletion:     one word is the other with one glyph removed
+#                   (the full word of one == a one-deletion of the other);
+#   - substitution: the same one-deletion at the same position
+#                   ('qokeedy' / 'qokaedy' both give 'qokedy' at 3).
+# Every word type's keys are built once, so the whole vocabulary's
+# one-edit neighbours come from key buckets without comparing word pairs.
+# Neighbours are stored as sorted int64 codes (type_a * V + type_b), and a
+# token stream is scanned one window offset at a time with searchsorted:
+#
+#   neighbours = neighbour_codes(vocabulary)
+#   first, second, distance = find_repeats(word_ids, line_ids, neighbours, len(vocabulary), window=3)
+#
+# The CSV written by 32 is read back by load_adjacent_repeats(), which gives
+# the translator each line's repeats of the next word.
+
+REPETITION_INDEX_FILE = "repetition_index.csv"
+EDIT_KINDS = ["exact", "substitution", "deletion", "insertion"]   # Second word vs first
+UNREADABLE = "?*"                 # Words with an unreadable glyph repeat nothing
+
+def deletion_keys(word):
+    """(one-deletion strings, 'deletion<TAB>position' substitution keys) of a word."""
+    deletions = [word[:i] + word[i + 1:] for i in range(len(word))]
+    return deletions, [f"{d}\t{i}" for i, d in enumerate(deletions)]
+
+def readable(word):
+    return not any(c in UNREADABLE for c in word)
+
+def neighbour_codes(vocabulary, min_length=1):
+    """
+    Sorted int64 codes a * V + b of every ordered pair of word types one edit
+    apart, both readable and at least min_length long.
+    """
+    import numpy as np
+    index = {word: i for i, word in enumerate(vocabulary) if len(word) >= min_length and readable(word)}
+    by_deletion = defaultdict(set)
+    by_substitution = defaultdict(list)
+    for word, i in index.items():
+        deletions, substitutions = deletion_keys(word)
+        for key in deletions:
+            by_deletion[key].add(i)
+        for key in substitutions:
+            by_substitution[key].append(i)
+    codes = set()
+    n = len(vocabulary)
+    for key, longer in by_deletion.items():
+        shorter = index.get(key)
+        if shorter is not None:
+            for i in longer:
+                codes.add(shorter * n + i)
+                codes.add(i * n + shorter)
+    for members in by_substitution.values():
+        for i in members:
+            for j in members:
+                if i != j:
+                    codes.add(i * n + j)
+    return np.array(sorted(codes), dtype=np.int64)
+
+def find_repeats(word_ids, line_ids, neighbours, n_types, window, ignored=None):
+    """
+    Token pairs (first, second) within 'window' tokens of each other on the
+    same line whose words are equal (distance 0) or one edit apart (1).
+    ignored: optional boolean per word type (e.g. unreadable words).
+    """
+    import numpy as np
+    word_ids = np.asarray(word_ids, dtype=np.int64)
+    line_ids = np.asarray(line_ids)
+    firsts, seconds, distances = [], [], []
+    for offset in range(1, window + 1):
+        first = np.arange(len(word_ids) - offset)
+        second = first + offset
+        same_line = line_ids[first] == line_ids[second]
+        a, b = word_ids[first], word_ids[second]
+        codes = a * n_types + b
+        slots = np.minimum(np.searchsorted(neighbours, codes), max(len(neighbours) - 1, 0))
+        near = neighbours[slots] == codes if len(neighbours) else np.zeros(len(codes), dtype=bool)
+        hit = same_line & ((a == b) | near)
+        if ignored is not None:
+            hit &= ~ignored[a]
+        firsts.append(first[hit])
+        seconds.append(second[hit])
+        distances.append((a[hit] != b[hit]).astype(np.int8))
+    order = np.lexsort((np.concatenate(seconds), np.concatenate(firsts)))
+    return (np.concatenate(firsts)[order], np.concatenate(seconds)[order], np.concatenate(distances)[order])
+
+def edit_kinds(first_lengths, second_lengths, distances):
+    """EDIT_KINDS index of each pair, from word lengths (the pairs are at most one edit apart)."""
+    import numpy as np
+    kinds = np.where(second_lengths == first_lengths, 1, np.where(second_lengths < first_lengths, 2, 3))
+    return np.where(distances == 0, 0, kinds)
+
+def repeat_runs(first, second, n_tokens):
+    """
+    Runs of adjacent repeats (second == first + 1) chained into maximal
+    stretches. Returns (run id per token, -1 outside runs; run lengths).
+    """
+    import numpy as np
+    adjacent = np.zeros(n_tokens, dtype=bool)
+    adjacent[first[second == first + 1]] = True        # Token i repeats as token i + 1
+    in_run = adjacent | np.r_[False, adjacent[:-1]]
+    starts = in_run & ~np.r_[False, adjacent[:-1]]
+    run_ids = np.where(in_run, np.cumsum(starts) - 1, -1)
+    return run_ids, np.bincount(run_ids[in_run]) if in_run.any() else np.zeros(0, dtype=np.int64)
+
+def load_adjacent_repeats(path=REPETITION_INDEX_FILE):
+    """{line: {token position: (distance, run length)}} for every word followed by a repeat of itself."""
+    repeats = defaultdict(dict)
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        for row in csv.DictReader(f):
+            if row["Gap"] == "1":
+                repeats[int(row["Line"])][int(row["First"])] = (int(row["Distance"]), int(row["Run length"]))
+    return dict(repeats)
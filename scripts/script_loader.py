@@ -0,0 +1,38 @@
+import importlib.util
+import os
+import sys
+
+# ==============================================================================
+#        SCRIPT LOADER: import functions from the numbered pipeline scripts
+# ==============================================================================
+# The pipeline scripts are named '10b_translate_all_improved.py' etc., which
+# is not a valid module name for a plain 'import'. This helper loads them by
+# file name so long-lived tools (query server, CLI, benchmarks) can reuse
+# ParsedWord, synthesize_interpretation_v4, the dictionaries, ... directly.
+# Every script only runs its pipeline under "if __name__ == '__main__'", so
+# loading one has no side effects beyond defining its functions.
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+_loaded_scripts = {}
+
+def load_script(script_name, fresh=False):
+    """
+    Loads 'scripts/<script_name>.py' as a module and returns it.
+    Loaded modules are cached; fresh=True re-executes the file (e.g. to pick
+    up an edited dictionary) and returns a new, independent module object.
+    """
+    if not fresh and script_name in _loaded_scripts:
+        return _loaded_scripts[script_name]
+
+    path = os.path.join(SCRIPTS_DIR, f"{script_name}.py")
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"Pipeline script '{path}' not found.")
+
+    if SCRIPTS_DIR not in sys.path:
+        sys.path.insert(0, SCRIPTS_DIR)  # Scripts import their helper modules by name
+    module_name = "voynich_script_" + script_name.replace("-", "_")
+    spec = importlib.util.spec_from_file_location(module_name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    _loaded_scripts[script_name] = module
+    return module
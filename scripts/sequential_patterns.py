@@ -0,0 +1,100 @@
+# ==============================================================================
+#     SEQUENTIAL PATTERNS: PrefixSpan with gap and length constraints
+# ==============================================================================
+# Used by 25_mine_sequential_patterns.py. All sequences (one per paragraph:
+# its roles, its roots, ...) are concatenated into one int32 array of symbol
+# codes. A projected database is then just the sorted array of global
+# positions where the current prefix's embeddings end. Extending a prefix
+# looks at the next max_gap + 1 positions of every embedding in one
+# vectorized pass, and groups the candidates by symbol with one sort:
+#
+#   db = SequenceDatabase.from_sequences([["SUBJECT", "CONNECTOR", "OBJECT"], ...])
+#   for pattern, sequences in prefixspan(db, min_count=20, max_gap=1, max_length=4):
+#       print([db.alphabet[s] for s in pattern], len(sequences))
+#
+# With max_gap = 0 the patterns are contiguous n-grams (06's bigrams and
+# trigrams); with max_gap = g up to g tokens may sit between two consecutive
+# pattern elements. Support is the number of sequences with at least one
+# embedding. Mining can be split by first symbol (first_symbols=...), which
+# is how the script spreads the work across processes.
+
+class SequenceDatabase:
+    def __init__(self, symbols, offsets, alphabet):
+        import numpy as np
+        self.symbols = np.asarray(symbols, dtype=np.int32)   # All sequences, concatenated
+        self.offsets = np.asarray(offsets, dtype=np.int64)   # Sequence i = symbols[offsets[i]:offsets[i + 1]]
+        self.alphabet = list(alphabet)
+        self.sequence_of = np.repeat(np.arange(len(self.offsets) - 1, dtype=np.int32), np.diff(self.offsets))
+        self.sequence_end = self.offsets[1:][self.sequence_of]  # End of its sequence, per position
+
+    @classmethod
+    def from_sequences(cls, sequences, alphabet=None):
+        """Encodes lists of hashable symbols; the alphabet is sorted unless given."""
+        import numpy as np
+        alphabet = list(alphabet) if alphabet is not None else sorted({s for sequence in sequences for s in sequence})
+        code = {symbol: i for i, symbol in enumerate(alphabet)}
+        symbols = np.fromiter((code[s] for sequence in sequences for s in sequence), dtype=np.int32)
+        offsets = np.zeros(len(sequences) + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum([len(sequence) for sequence in sequences])
+        return cls(symbols, offsets, alphabet)
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def symbol_support(self):
+        """Number of sequences containing each symbol."""
+        import numpy as np
+        pairs = np.unique(self.symbols.astype(np.int64) * len(self) + self.sequence_of)
+        return np.bincount(pairs // len(self), minlength=len(self.alphabet))
+
+    def decode(self, pattern):
+        return tuple(self.alphabet[s] for s in pattern)
+
+def grouped_extensions(db, positions, max_gap):
+    """
+    Every (symbol, next position) reachable from the embedding ends within
+    the gap window, sorted by symbol. Returns (symbols, positions, boundaries,
+    unique symbols).
+    """
+    import numpy as np
+    windows = positions[:, None] + np.arange(1, max_gap + 2)
+    valid = windows < db.sequence_end[positions][:, None]
+    following = np.unique(windows[valid])  # An end position reached twice is one embedding end
+    if len(following) == 0:                 # Every embedding ends its sequence: nothing to extend
+        empty = np.zeros(0, dtype=np.int64)
+        return empty, np.zeros(1, dtype=np.int64), db.symbols[:0]
+    symbols = db.symbols[following]
+    order = np.argsort(symbols, kind="stable")
+    symbols, following = symbols[order], following[order]
+    starts = np.flatnonzero(np.r_[True, symbols[1:] != symbols[:-1]])
+    return following, np.r_[starts, len(symbols)], symbols[starts]
+
+def prefixspan(db, min_count, max_gap=0, min_length=2, max_length=5, first_symbols=None):
+    """
+    Yields (pattern as symbol codes, array of supporting sequence ids) for
+    every pattern of min_length..max_length symbols found in >= min_count
+    sequences, depth first. first_symbols restricts the patterns' first symbol.
+
+    >>> db = SequenceDatabase.from_sequences([["A", "B"], ["A", "B"], ["C", "D"]])
+    >>> [(db.decode(pattern), len(sequences)) for pattern, sequences in prefixspan(db, min_count=2)]
+    [(('A', 'B'), 2)]
+    """
+    import numpy as np
+    if first_symbols is None:
+        first_symbols = np.flatnonzero(db.symbol_support() >= min_count)
+    for first in first_symbols:
+        positions = np.flatnonzero(db.symbols == first)
+        stack = [((int(first),), positions)]
+        while stack:
+            pattern, positions = stack.pop()
+            sequences = np.unique(db.sequence_of[positions])
+            if len(sequences) < min_count:
+                continue
+            if len(pattern) >= min_length:
+                yield pattern, sequences
+            if len(pattern) == max_length:
+                continue
+            following, boundaries, symbols = grouped_extensions(db, positions, max_gap)
+            for i in range(len(symbols) - 1, -1, -1):  # Reversed, so patterns come out in symbol order
+                extended = np.sort(following[boundaries[i]:boundaries[i + 1]])
+                stack.append((pattern + (int(symbols[i]),), extended))
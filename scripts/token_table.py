@@ -0,0 +1,58 @@
+import sys
+
+# ==============================================================================
+#        TOKEN TABLE: one row per token, stored as Parquet row groups by folio
+# ==============================================================================
+# Written by 17_build_token_table.py from voynich.txt (all transcribers).
+# Every folio is its own row group, so a filter on 'folio' (or on any column
+# whose row-group statistics rule a folio out) skips the other folios without
+# reading them:
+#
+#   from token_table import read_tokens
+#   herbal_h = read_tokens(columns=["folio", "word", "role"],
+#                          filters=[("section", "=", "Herbal"), ("transcriber", "=", "H")])
+#   herbal_h.group_by("role").aggregate([("word", "count")])
+#
+# 'clean_paragraph' is the paragraph index used by voynich_ready_nlp.txt,
+# section_map.json and the translations (-1 for rows 01 does not keep), so
+# results can be joined back to the rest of the pipeline.
+
+TOKEN_TABLE_FILE = "voynich_tokens.parquet"
+
+# (column, arrow type name) in file order
+COLUMNS = [
+    ("folio", "string"), ("paragraph", "int32"), ("line", "string"), ("line_index", "int32"),
+    ("position", "int16"), ("section", "string"), ("language", "string"), ("hand", "string"),
+    ("transcriber", "string"), ("word", "string"), ("prefix", "string"), ("root", "string"),
+    ("suffix", "string"), ("role", "string"), ("violation", "bool"), ("clean_paragraph", "int32"),
+]
+
+def import_pyarrow():
+    """
+    Imports pyarrow on first use and provides a helpful error message
+    if it's not installed.
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        print("Error: The 'pyarrow' library is not installed.")
+        print("Please install it by running: pip install pyarrow")
+        sys.exit(1)
+    return pa, pq
+
+def token_schema():
+    pa, _ = import_pyarrow()
+    types = {"string": pa.string(), "int32": pa.int32(), "int16": pa.int16(), "bool": pa.bool_()}
+    return pa.schema([(name, types[type_name]) for name, type_name in COLUMNS])
+
+def read_tokens(columns=None, filters=None, path=TOKEN_TABLE_FILE):
+    """
+    Reads the token table as a pyarrow Table. 'filters' uses the
+    pyarrow.parquet DNF syntax, e.g. [("folio", "in", ["f1r", "f1v"])], and is
+    pushed down to the row groups.
+    """
+    _, pq = import_pyarrow()
+    if filters is None:
+        return pq.ParquetFile(path).read(columns=columns)  # Skips the dataset layer when there is nothing to prune
+    return pq.read_table(path, columns=columns, filters=filters)
@@ -0,0 +1,123 @@
+# ==============================================================================
+#    TRANSCRIBER ALIGNMENT: batched banded edit distance with traceback
+# ==============================================================================
+# Used by 31_align_transcribers.py. Sequences (word ids of a locus reading,
+# or glyph ids of a word) are padded into int matrices, and a whole batch
+# of pairs is aligned at once: the Levenshtein table is filled one
+# anti-diagonal at a time (every cell of a diagonal depends only on the two
+# before it), each step one numpy operation over all pairs and all cells of
+# the diagonal. Only cells within 'band' of the main diagonal are computed,
+# widened per pair to the length difference so an alignment always exists;
+# the result is exact whenever the optimal path stays within the band.
+#
+#   distance, steps = align_batch(a, a_lengths, b, b_lengths, band=3)
+#   # steps: (pair, index in a or -1, index in b or -1), one row per column
+#   # of the alignment, from the end of the sequences back to the start
+#
+# align_pairs() does the batching: pairs are sorted by length and cut into
+# batches of at most CELL_BUDGET table cells.
+
+DIAGONAL, UP, LEFT = 0, 1, 2      # Match/substitution, a-only (deletion), b-only (insertion)
+CELL_BUDGET = 4_000_000           # Table cells per batch
+
+def pad_sequences(ids, offsets, fill=-1):
+    """Ragged (ids, offsets) -> (n x max length int32 matrix, int64 lengths)."""
+    import numpy as np
+    lengths = np.diff(offsets).astype(np.int64)
+    width = int(lengths.max()) if len(lengths) else 0
+    padded = np.full((len(lengths), max(width, 1)), fill, dtype=np.int32)
+    rows = np.repeat(np.arange(len(lengths)), lengths)
+    columns = np.arange(int(offsets[-1])) - np.repeat(offsets[:-1], lengths)
+    padded[rows, columns] = ids
+    return padded, lengths
+
+def align_batch(a, a_lengths, b, b_lengths, band):
+    """
+    Banded edit distance and alignment of a[p, :a_lengths[p]] with
+    b[p, :b_lengths[p]] for every pair p. Returns (distances, steps).
+    """
+    import numpy as np
+    n, la = a.shape
+    lb = b.shape[1]
+    width = np.maximum(band, np.abs(a_lengths - b_lengths))
+    max_width = int(width.max()) if n else 0
+    infinity = np.iinfo(np.int32).max // 2
+    table = np.full((n, la + 1, lb + 1), infinity, dtype=np.int32)
+    moves = np.zeros((n, la + 1, lb + 1), dtype=np.int8)
+    edge_i = np.arange(la + 1)
+    edge_j = np.arange(lb + 1)
+    table[:, :, 0] = np.where(edge_i[None, :] <= width[:, None], edge_i[None, :], infinity)
+    table[:, 0, :] = np.where(edge_j[None, :] <= width[:, None], edge_j[None, :], infinity)
+    moves[:, :, 0] = UP
+    moves[:, 0, :] = LEFT
+    for d in range(2, la + lb + 1):
+        # Cells (i, d - i) of this anti-diagonal inside the widest band
+        i = np.arange(max(1, d - lb, (d - max_width + 1) // 2), min(la, d - 1, (d + max_width) // 2) + 1)
+        if len(i) == 0:
+            continue
+        j = d - i
+        diagonal = table[:, i - 1, j - 1] + (a[:, i - 1] != b[:, j - 1])
+        up = table[:, i - 1, j] + 1
+        left = table[:, i, j - 1] + 1
+        best = np.minimum(diagonal, np.minimum(up, left))
+        move = np.where(best == diagonal, DIAGONAL, np.where(best == up, UP, LEFT)).astype(np.int8)
+        inside = np.abs(i - j)[None, :] <= width[:, None]
+        table[:, i, j] = np.where(inside, np.minimum(best, infinity), infinity)
+        moves[:, i, j] = move
+    pairs = np.arange(n)
+    distances = table[pairs, a_lengths, b_lengths].astype(np.int64)
+
+    # Traceback of all pairs at once, one alignment column per step
+    i, j = a_lengths.copy(), b_lengths.copy()
+    steps = []
+    active = (i > 0) | (j > 0)
+    while active.any():
+        p, pi, pj = pairs[active], i[active], j[active]
+        move = moves[p, pi, pj]
+        step_a = np.where(move != LEFT, pi - 1, -1)
+        step_b = np.where(move != UP, pj - 1, -1)
+        steps.append(np.stack([p, step_a, step_b], axis=1))
+        i[active] = pi - (move != LEFT)
+        j[active] = pj - (move != UP)
+        active = (i > 0) | (j > 0)
+    steps = np.concatenate(steps) if steps else np.zeros((0, 3), dtype=np.int64)
+    return distances, steps
+
+def align_pairs(padded, lengths, pairs, band, cell_budget=CELL_BUDGET):
+    """
+    Aligns padded[pairs[k, 0]] with padded[pairs[k, 1]] for every k, in
+    length-sorted batches. Returns (distances, steps) with steps[:, 0] = k.
+    """
+    import numpy as np
+    pairs = np.asarray(pairs, dtype=np.int64).reshape(-1, 2)
+    distances = np.zeros(len(pairs), dtype=np.int64)
+    all_steps = []
+    longest = np.maximum(lengths[pairs[:, 0]], lengths[pairs[:, 1]]) if len(pairs) else np.zeros(0, dtype=np.int64)
+    order = np.argsort(longest, kind="stable")
+    start = 0
+    while start < len(order):
+        end = start + 1
+        # Grow the batch while its (longest + 1)^2 table still fits the budget
+        while end < len(order) and (end - start + 1) * (int(longest[order[end]]) + 1) ** 2 <= cell_budget:
+            end += 1
+        batch = order[start:end]
+        width = max(int(longest[batch].max()), 1)
+        first, second = pairs[batch, 0], pairs[batch, 1]
+        batch_distances, steps = align_batch(padded[first, :width], lengths[first],
+                                             padded[second, :width], lengths[second], band)
+        distances[batch] = batch_distances
+        steps[:, 0] = batch[steps[:, 0]]
+        all_steps.append(steps)
+        start = end
+    steps = np.concatenate(all_steps) if all_steps else np.zeros((0, 3), dtype=np.int64)
+    return distances, steps
+
+def edit_distance(a, b):
+    """Plain full-table Levenshtein distance of two sequences (reference for checks)."""
+    previous = list(range(len(b) + 1))
+    for i, x in enumerate(a, 1):
+        current = [i]
+        for j, y in enumerate(b, 1):
+            current.append(min(previous[j - 1] + (x != y), previous[j] + 1, current[j - 1] + 1))
+        previous = current
+    return previous[-1]
@@ -0,0 +1,187 @@
+import bisect
+import json
+import lzma
+import os
+import zlib
+from array import array
+from collections import namedtuple
+
+# ==============================================================================
+#     TRANSLATION STORE: chunked, indexed, random-access paragraph translations
+# ==============================================================================
+# Written by 10b_translate_all_improved.py next to the rendered text file:
+#
+#   translation_store_H_v3.1/
+#     manifest.json   version, source file, transcriber, dictionary,
+#                     paragraph/chunk counts, compression,
+#                     folios {folio: [first, end)}, sections {name: [[first, end), ...]}
+#     chunks.bin      CHUNK_SIZE paragraphs per chunk, each chunk compressed on its own
+#     offsets.bin     uint64: chunk byte offsets in chunks.bin (n_chunks + 1), then
+#                     CHUNK_SIZE + 1 paragraph offsets per chunk (inside the
+#                     decompressed chunk, last one = chunk length)
+#
+# A paragraph record is "original<TAB>translation\n" in UTF-8. Paragraph i
+# lives in chunk i // chunk_size, so any paragraph, folio or section range is
+# two array lookups and the decompression of only the chunks it touches:
+#
+#   store = TranslationStore.load(TRANSLATION_STORE_DIR)
+#   store.paragraph(1449)              # TranslationRecord(index, original, translation)
+#   store.folio("f57v")                # [TranslationRecord, ...]
+#   store.section("Balneological")     # every paragraph of the section, in order
+#
+# Stores of other transcribers or dictionary versions sit side by side
+# (TRANSLATION_STORE_TEMPLATE).
+
+STORE_VERSION = 1
+TRANSLATION_STORE_TEMPLATE = "translation_store_{transcriber}_{dictionary}"
+CHUNK_SIZE = 256
+COMPRESSORS = {
+    None: (lambda data: data, lambda data: data),
+    "zlib": (lambda data: zlib.compress(data, 6), zlib.decompress),
+    "lzma": (lzma.compress, lzma.decompress),
+}
+
+TranslationRecord = namedtuple("TranslationRecord", "index original translation")
+
+def section_ranges(sections):
+    """Run-length [first, end) ranges per section from a per-paragraph list of section names."""
+    ranges = {}
+    start = 0
+    for i in range(1, len(sections) + 1):
+        if i == len(sections) or sections[i] != sections[start]:
+            if sections[start] is not None:
+                ranges.setdefault(sections[start], []).append([start, i])
+            start = i
+    return ranges
+
+# --- WRITING ---
+
+def write_translation_store(store_dir, records, folios=None, sections=None,
+                            chunk_size=CHUNK_SIZE, compression="zlib", info=None):
+    """
+    Writes (original, translation) pairs, in paragraph order, as a store.
+    folios: {folio: [first, end)}; sections: {name: [[first, end), ...]};
+    info: extra manifest fields (source file, transcriber, dictionary, ...).
+    """
+    if compression not in COMPRESSORS:
+        raise ValueError(f"Unknown compression '{compression}' (use one of {list(COMPRESSORS)}).")
+    compress = COMPRESSORS[compression][0]
+    os.makedirs(store_dir, exist_ok=True)
+    records = list(records)
+    chunk_offsets = array("Q", [0])
+    paragraph_offsets = array("Q")
+    with open(os.path.join(store_dir, "chunks.bin"), "wb") as f:
+        for first in range(0, max(len(records), 1), chunk_size):
+            payload = bytearray()
+            for original, translation in records[first:first + chunk_size]:
+                paragraph_offsets.append(len(payload))
+                payload += f"{original}\t{translation}\n".encode("utf-8")
+            # Pad the slots of a short last chunk so every chunk has chunk_size + 1 offsets
+            paragraph_offsets.extend([len(payload)] * (chunk_size + 1 - len(records[first:first + chunk_size])))
+            data = compress(bytes(payload))
+            f.write(data)
+            chunk_offsets.append(chunk_offsets[-1] + len(data))
+    with open(os.path.join(store_dir, "offsets.bin"), "wb") as f:
+        chunk_offsets.tofile(f)
+        paragraph_offsets.tofile(f)
+
+    manifest = dict(info or {})
+    manifest.update({
+        "version": STORE_VERSION, "paragraphs": len(records), "chunk_size": chunk_size,
+        "chunks": len(chunk_offsets) - 1, "compression": compression,
+        "folios": folios or {}, "sections": sections or {},
+    })
+    with open(os.path.join(store_dir, "manifest.json"), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=1)
+    return TranslationStore.load(store_dir)
+
+# --- READING ---
+
+class TranslationStore:
+    def __init__(self, store_dir, manifest, chunk_offsets, paragraph_offsets):
+        self.store_dir = store_dir
+        self.manifest = manifest
+        self.chunk_size = manifest["chunk_size"]
+        self.folios = manifest["folios"]
+        self.sections = manifest["sections"]
+        self.chunk_offsets = chunk_offsets
+        self.paragraph_offsets = paragraph_offsets
+        self._decompress = COMPRESSORS[manifest["compression"]][1]
+        self._chunk_cache = {}   # chunk number -> decompressed bytes (most recent few)
+        # Section lookup by paragraph: sorted range starts
+        runs = sorted((first, end, name) for name, ranges in self.sections.items() for first, end in ranges)
+        self._run_starts = [first for first, _, _ in runs]
+        self._runs = runs
+
+    @classmethod
+    def load(cls, store_dir):
+        """Opens a store. Raises FileNotFoundError if it is missing and ValueError if it is outdated."""
+        with open(os.path.join(store_dir, "manifest.json"), "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+        if manifest.get("version") != STORE_VERSION:
+            raise ValueError(f"Translation store '{store_dir}' has an outdated format. Re-run 10b_translate_all_improved.py.")
+        offsets = array("Q")
+        with open(os.path.join(store_dir, "offsets.bin"), "rb") as f:
+            offsets.frombytes(f.read())
+        n_chunk_offsets = manifest["chunks"] + 1
+        return cls(store_dir, manifest, offsets[:n_chunk_offsets], offsets[n_chunk_offsets:])
+
+    def __len__(self):
+        return self.manifest["paragraphs"]
+
+    def __iter__(self):
+        return iter(self.paragraphs(0, len(self)))
+
+    def _chunk(self, number):
+        data = self._chunk_cache.get(number)
+        if data is None:
+            with open(os.path.join(self.store_dir, "chunks.bin"), "rb") as f:
+                f.seek(self.chunk_offsets[number])
+                data = self._decompress(f.read(self.chunk_offsets[number + 1] - self.chunk_offsets[number]))
+            if len(self._chunk_cache) >= 8:
+                self._chunk_cache.pop(next(iter(self._chunk_cache)))
+            self._chunk_cache[number] = data
+        return data
+
+    def paragraph(self, index):
+        """One paragraph (0-based global index) as a TranslationRecord."""
+        if not 0 <= index < len(self):
+            raise IndexError(f"Paragraph {index} is outside the store (0-{len(self) - 1}).")
+        number, slot = divmod(index, self.chunk_size)
+        base = number * (self.chunk_size + 1) + slot
+        start, end = self.paragraph_offsets[base], self.paragraph_offsets[base + 1]
+        original, translation = self._chunk(number)[start:end - 1].decode("utf-8").split("\t", 1)
+        return TranslationRecord(index, original, translation)
+
+    def paragraphs(self, first, end):
+        """Paragraphs [first, end) in order."""
+        return [self.paragraph(i) for i in range(max(first, 0), min(end, len(self)))]
+
+    def folio(self, folio_id):
+        """The paragraphs of a folio, or None if the store has no such folio."""
+        span = self.folios.get(folio_id)
+        return None if span is None else self.paragraphs(*span)
+
+    def section(self, name):
+        """Every paragraph of a section (all its ranges, in order); empty if unknown."""
+        return [record for first, end in self.sections.get(name, []) for record in self.paragraphs(first, end)]
+
+    def section_of(self, index):
+        position = bisect.bisect_right(self._run_starts, index) - 1
+        if position >= 0 and index < self._runs[position][1]:
+            return self._runs[position][2]
+        return None
+
+# --- RENDERED VIEW ---
+
+def render_translation_text(store, output_file, header_lines):
+    """Writes the human-readable '--- Paragraph N ---' text view of a store."""
+    with open(output_file, "w", encoding="utf-8") as out_f:
+        for line in header_lines:
+            out_f.write(f"{line}\n")
+        out_f.write("\n")
+        for record in store:
+            out_f.write(f"--- Paragraph {record.index + 1} ---\n")  # 1-based paragraph number
+            out_f.write(f"Original Cleaned: {record.original}\n")
+            out_f.write(f"Translation:      {record.translation}\n")
+            out_f.write("-" * 80 + "\n")
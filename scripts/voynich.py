@@ -0,0 +1,272 @@
+import time
+_CLI_START = time.perf_counter()
+
+import argparse
+import importlib
+import os
+from script_loader import load_script
+import instrumentation
+
+# ==============================================================================
+#        VOYNICH CLI: one entry point for the Final Test pipeline scripts
+# ==============================================================================
+# Usage (from the data directory, or with --data-dir):
+#   python scripts/voynich.py [--timing] [--data-dir DIR] <command> [options]
+#
+# Each command loads only the script it needs, and heavy libraries (pandas,
+# seaborn, matplotlib, numpy, networkx) are imported only by the commands that
+# plot or build graphs. Numeric commands (clean, lift, entropy, syntax,
+# translate, signatures) start in well under 100 ms.
+
+# --- COMMAND TABLE ---
+# command: (help, [(script, entry)], heavy libraries)
+# 'entry' receives the loaded module and the parsed arguments.
+
+def run_lift(module, args):
+    module.analyze_thematic_lift(module.VOYNICH_TEXT_FILE, module.ANALYSIS_OUTPUT_FILE)
+
+def run_heatmap(module, args):
+    module.create_thematic_heatmap(module.INPUT_CSV_FILE, module.OUTPUT_IMAGE_FILE)
+
+def run_zipf(module, args):
+    module.report(module.render_charts(module.chart_jobs()))
+
+def run_translate_folio(module, args):
+    output_file = f"translation_{args.folio}_SYNTH_IMPROVED.txt"
+    module.translate_folio_refined(module.VOYNICH_SOURCE_FILE, module.VOYNICH_ORIG_FILE, output_file, args.folio)
+
+def run_translate_all(module, args):
+    module.translate_all_improved(module.VOYNICH_SOURCE_FILE, module.OUTPUT_TRANSLATION_FILE)
+
+def run_partition(module, args):
+    module.main(["--by", *args.by, "--kind", args.kind, "--top", str(args.top)])
+
+def run_clusters(module, args):
+    module.main(["--transcriber", args.transcriber, "--features", args.features])
+
+def run_sweep(module, args):
+    module.main(["--workers", str(args.workers)] + (["--grid", args.grid] if args.grid else []))
+
+def run_bootstrap(module, args):
+    module.main(["--bootstrap", str(args.bootstrap), "--permutations", str(args.permutations),
+                 "--workers", str(args.workers)])
+
+def run_figures(module, args):
+    module.main(["--workers", str(args.workers)] + (["--force"] if args.force else [])
+                + (["--svg"] if args.svg else []) + (["--dpi", str(args.dpi)] if args.dpi else []))
+
+def run_itemsets(module, args):
+    module.main(["--kind", args.kind, "--min-support", str(args.min_support), "--min-lift", str(args.min_lift),
+                 "--max-size", str(args.max_size)])
+
+def run_sequences(module, args):
+    module.main(["--kinds", *args.kinds, "--max-gap", str(args.max_gap), "--max-length", str(args.max_length),
+                 "--workers", str(args.workers)])
+
+def run_grammar(module, args):
+    module.main(["--states", *map(str, args.states), "--restarts", str(args.restarts), "--workers", str(args.workers)])
+
+def run_perplexity(module, args):
+    module.main(["--kinds", *args.kinds, "--order", str(args.order), "--folds", str(args.folds)])
+
+def run_glyphs(module, args):
+    module.main(["--inventory", args.inventory])
+
+def run_positions(module, args):
+    module.main(["--kinds", *args.kinds, "--min-lines", str(args.min_lines)])
+
+def run_lattice(module, args):
+    module.main(["--kinds", *args.kinds, "--samples", str(args.samples)])
+
+def run_align(module, args):
+    module.main(["--word-band", str(args.word_band), "--glyph-band", str(args.glyph_band)])
+
+def run_repeats(module, args):
+    module.main(["--window", str(args.window), "--min-length", str(args.min_length)])
+
+def run_duplicates(module, args):
+    module.main(["--transcriber", args.transcriber, "--units", *args.units])
+
+COMMANDS = {
+    "clean": ("Generate the clean corpus, section map and folio index (01)",
+              [("01_generate_clean_data", lambda m, a: m.main())], []),
+    "lift": ("Thematic lift scores per section (02a; --heatmap also runs 02b)",
+             [("02a_thematic_analysis_liftscore", run_lift)], []),
+    "entropy": ("Comparative second-order entropy (03)",
+                [("03_calculate_entropy_comparative", lambda m, a: m.main())], []),
+    "zipf": ("Comparative Zipf plots (04)",
+             [("04_plot_zipf_comparative", run_zipf)], ["numpy", "matplotlib.pyplot"]),
+    "syntax": ("Role bigram/trigram syntax report (06)",
+               [("06_analyze_syntax_patterns_v2", lambda m, a: m.syntax_pattern_test_v2())], []),
+    "translate": ("Translate one folio (10a) or, without a folio, the whole manuscript (10b)",
+                  [], []),
+    "signatures": ("Process signature hunt (08a; --plot also runs 08b)",
+                   [("08a_find_process_signatures_v5", lambda m, a: m.find_process_benchmarks())], []),
+    "graph": ("Build the knowledge graph GEXF (7)",
+              [("7_build_knowledge_graph", lambda m, a: m.main())], ["networkx"]),
+    "tokens": ("Build the columnar per-token table voynich_tokens.parquet (17)",
+               [("17_build_token_table", lambda m, a: m.main())], ["pyarrow", "pyarrow.parquet"]),
+    "cube": ("Build the folio x feature count cubes count_cube_H/ and count_cube_corpora/ (18)",
+             [("18_build_count_cube", lambda m, a: m.main())], ["numpy", "pyarrow", "pyarrow.parquet"]),
+    "partition": ("Partition by folio metadata: quire, hand, illustration, ... (19)",
+                  [("19_partition_by_folio_metadata", run_partition)], ["numpy"]),
+    "clusters": ("Folio TF-IDF similarity and clustering vs $L / DIALECT_MAP / $H (20)",
+                 [("20_cluster_folios", run_clusters)], ["numpy", "scipy.sparse", "scipy.cluster"]),
+    "sweep": ("Sensitivity sweep of lift/prefix/dialect/context findings over a parameter grid (21)",
+              [("21_sensitivity_sweep", run_sweep)], ["numpy"]),
+    "bootstrap": ("Folio bootstrap CIs and permutation p-values for the dialect fingerprint (22)",
+                  [("22_bootstrap_dialect_fingerprint", run_bootstrap)], ["numpy"]),
+    "figures": ("Render every chart headless, skipping unchanged ones (23)",
+                [("23_render_figures", run_figures)], []),
+    "itemsets": ("Frequent co-occurring concept sets per section from paragraph bitsets (24)",
+                 [("24_mine_concept_itemsets", run_itemsets)], ["numpy", "pyarrow", "pyarrow.parquet"]),
+    "sequences": ("Gapped sequential role/root patterns (PrefixSpan) by section and dialect (25)",
+                  [("25_mine_sequential_patterns", run_sequences)], ["numpy", "pyarrow", "pyarrow.parquet"]),
+    "grammar": ("Unsupervised HMM word classes compared with the rule-based roles (26)",
+                [("26_induce_hmm_grammar", run_grammar)], ["numpy", "pyarrow", "pyarrow.parquet"]),
+    "perplexity": ("Cross-validated Kneser-Ney perplexity by section, dialect and folio (27)",
+                   [("27_score_ngram_perplexity", run_perplexity)], ["numpy", "pyarrow", "pyarrow.parquet"]),
+    "glyphs": ("Glyph-level entropy and word-position profiles per transcriber and section (28)",
+               [("28_analyze_glyph_statistics", run_glyphs)], ["numpy", "pyarrow", "pyarrow.parquet"]),
+    "positions": ("Line- and paragraph-position preferences with chi-square tests (29)",
+                  [("29_analyze_line_positions", run_positions)], ["numpy", "scipy", "pyarrow", "pyarrow.parquet"]),
+    "lattice": ("Counts, lift and entropy bounds over alternative transcriber readings (30)",
+                [("30_analyze_reading_lattice", run_lattice)], ["numpy"]),
+    "align": ("Cross-transcriber alignment, token disagreement and glyph confusions (31)",
+              [("31_align_transcribers", run_align)], ["numpy", "pyarrow", "pyarrow.parquet"]),
+    "repeats": ("Exact and one-edit repeat index by family, position and section (32)",
+                [("32_build_repetition_index", run_repeats)], ["numpy"]),
+    "duplicates": ("MinHash/LSH near-duplicate lines and paragraphs (33)",
+                   [("33_find_near_duplicates", run_duplicates)], ["numpy", "pyarrow", "pyarrow.parquet"]),
+}
+
+def resolve_steps(args):
+    """Returns the (script, entry) steps and heavy libraries for the parsed command."""
+    _, steps, heavy = COMMANDS[args.command]
+    steps, heavy = list(steps), list(heavy)
+    if args.command == "translate":
+        if args.folio:
+            steps.append(("10a_translate_folio_advanced", run_translate_folio))
+        else:
+            steps.append(("10b_translate_all_improved", run_translate_all))
+    if args.command == "lift" and args.heatmap:
+        steps.append(("02b_plot_thematic_heatmap", run_heatmap))
+        heavy += ["pandas", "seaborn", "matplotlib.pyplot"]
+    if args.command == "signatures" and args.plot:
+        steps.append(("08b_plot_process_signatures_summary", lambda m, a: m.parse_summary_and_plot_v2()))
+        heavy += ["pandas", "seaborn", "matplotlib.pyplot"]
+    return steps, heavy
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="voynich", description="Voynich Final Test pipeline.")
+    parser.add_argument("--timing", action="store_true", help="Report import vs compute time.")
+    parser.add_argument("--data-dir", help="Directory holding the input files (default: current directory).")
+    parser.add_argument("--trace", metavar="FILE", help="Append per-stage timing/memory records to a JSON-lines trace.")
+    parser.add_argument("--profile", choices=instrumentation.PROFILERS, help="With --trace: also profile each stage.")
+    parser.add_argument("--no-trace-memory", action="store_true", help="With --trace: skip tracemalloc peaks (faster).")
+    subparsers = parser.add_subparsers(dest="command", metavar="command")
+    subparsers.required = True
+    for name, (help_text, _, _) in COMMANDS.items():
+        sub = subparsers.add_parser(name, help=help_text)
+        if name == "translate":
+            sub.add_argument("folio", nargs="?", help="Folio to translate, e.g. f57v (omit for all).")
+        if name == "lift":
+            sub.add_argument("--heatmap", action="store_true", help="Also render the lift heatmap.")
+        if name == "signatures":
+            sub.add_argument("--plot", action="store_true", help="Also render the signature bar chart.")
+        if name == "partition":
+            sub.add_argument("--by", nargs="+", default=["hand", "quire", "illustration_type"],
+                             help="Folio attributes; join with '+' to combine (e.g. quire+hand).")
+            sub.add_argument("--kind", default="lift_root", help="Count cube feature kind.")
+            sub.add_argument("--top", type=int, default=5, help="Top features by lift per group.")
+        if name == "clusters":
+            sub.add_argument("--transcriber", default="H", help="Transcriber whose count cube is used (built if missing).")
+            sub.add_argument("--features", default="word,root,glyph,affix", help="Comma-separated feature blocks.")
+        if name == "sweep":
+            sub.add_argument("--grid", help="JSON file overriding the parameter grid.")
+            sub.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Worker processes.")
+        if name == "bootstrap":
+            sub.add_argument("--bootstrap", type=int, default=10000, help="Folio resamples per dialect.")
+            sub.add_argument("--permutations", type=int, default=10000, help="A/B label permutations.")
+            sub.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Worker processes.")
+        if name == "figures":
+            sub.add_argument("--force", action="store_true", help="Re-render even unchanged charts.")
+            sub.add_argument("--svg", action="store_true", help="Also write SVG versions.")
+            sub.add_argument("--dpi", type=int, help="Override the DPI of every chart.")
+            sub.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Worker processes.")
+        if name == "itemsets":
+            sub.add_argument("--kind", choices=["concept", "root"], default="concept", help="Items: dictionary concepts or roots.")
+            sub.add_argument("--min-support", type=float, default=0.02, help="Minimum share of a section's paragraphs.")
+            sub.add_argument("--min-lift", type=float, default=1.5, help="Minimum lift over independence.")
+            sub.add_argument("--max-size", type=int, default=4, help="Largest item set.")
+        if name == "sequences":
+            sub.add_argument("--kinds", nargs="+", default=["role", "root"], help="Token columns to mine (role, root, ...).")
+            sub.add_argument("--max-gap", type=int, default=1, help="Tokens allowed between pattern elements.")
+            sub.add_argument("--max-length", type=int, default=5, help="Longest pattern.")
+            sub.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Worker processes.")
+        if name == "grammar":
+            sub.add_argument("--states", type=int, nargs="+", default=[5, 10, 20], help="HMM state counts to train.")
+            sub.add_argument("--restarts", type=int, default=4, help="Random restarts per state count.")
+            sub.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Worker processes.")
+        if name == "perplexity":
+            sub.add_argument("--kinds", nargs="+", default=["word", "root"], help="Token columns to model (word, root, ...).")
+            sub.add_argument("--order", type=int, default=3, help="Highest n-gram order.")
+            sub.add_argument("--folds", type=int, default=5, help="Cross-validation folds of folios.")
+        if name == "glyphs":
+            sub.add_argument("--inventory", choices=["characters", "basic", "extended"], default="basic",
+                             help="Multi-letter EVA glyphs kept together (see eva_glyphs.py).")
+        if name == "positions":
+            sub.add_argument("--kinds", nargs="+", default=["word", "root", "role", "first_glyph", "last_glyph"],
+                             help="Items to test (word, root, role, first_glyph, last_glyph).")
+            sub.add_argument("--min-lines", type=int, default=2, help="Skip paragraphs with fewer lines (labels).")
+        if name == "lattice":
+            sub.add_argument("--kinds", nargs="+", default=["word", "root"], help="Items to bound (word, root).")
+            sub.add_argument("--samples", type=int, default=200, help="Random full readings for the entropy range.")
+        if name == "align":
+            sub.add_argument("--word-band", type=int, default=3, help="Band of the word-level alignment.")
+            sub.add_argument("--glyph-band", type=int, default=3, help="Band of the glyph-level alignment.")
+        if name == "repeats":
+            sub.add_argument("--window", type=int, default=3, help="Tokens ahead searched for a repeat.")
+            sub.add_argument("--min-length", type=int, default=3, help="Shortest word with near repeats.")
+        if name == "duplicates":
+            sub.add_argument("--transcriber", default="H", help="Transcriber, or 'all'.")
+            sub.add_argument("--units", nargs="+", default=["line", "paragraph"], help="Documents (line, paragraph).")
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.command == "translate" and args.folio:
+        args.folio = args.folio.lower()
+    if args.data_dir:
+        os.chdir(args.data_dir)
+    steps, heavy = resolve_steps(args)
+    if args.trace:
+        instrumentation.configure(args.trace, memory=not args.no_trace_memory, profiler=args.profile)
+
+    # --- Import phase: heavy libraries first, then the pipeline scripts ---
+    import_start = time.perf_counter()
+    if "matplotlib.pyplot" in heavy:
+        import matplotlib
+        matplotlib.use("Agg")  # Batch runs never need an interactive window
+    for library in heavy:
+        importlib.import_module(library)
+    heavy_done = time.perf_counter()
+    modules = [(load_script(script), entry) for script, entry in steps]
+    import_done = time.perf_counter()
+
+    # --- Compute phase ---
+    for (script, _), (module, entry) in zip(steps, modules):
+        with instrumentation.stage(script):
+            entry(module, args)
+    compute_done = time.perf_counter()
+
+    if args.timing:
+        print("\n--- Timing ---")
+        print(f"  CLI startup:         {(import_start - _CLI_START) * 1000:8.1f} ms")
+        print(f"  Import (libraries):  {(heavy_done - import_start) * 1000:8.1f} ms  {', '.join(heavy) or '-'}")
+        print(f"  Import (scripts):    {(import_done - heavy_done) * 1000:8.1f} ms  {', '.join(s for s, _ in steps)}")
+        print(f"  Compute:             {(compute_done - import_done) * 1000:8.1f} ms")
+        print(f"  Total:               {(compute_done - _CLI_START) * 1000:8.1f} ms")
+
+if __name__ == "__main__":
+    main()